@@ -0,0 +1,38 @@
+"""
+Benchmark suite of the blackjack engine.
+
+Run it from the repository root:
+
+    python -m benchmarks run                 # time everything, print a table
+    python -m benchmarks baseline            # time and store this machine's baseline
+    python -m benchmarks compare             # time and compare against the baseline
+
+``compare`` exits with status 1 when a benchmark regressed significantly, so
+it can gate a change in CI. See ``runner`` for the statistics.
+"""
+
+from .runner import (
+    BENCHMARKS,
+    Benchmark,
+    Comparison,
+    benchmark,
+    compare,
+    load_results,
+    measure,
+    run_benchmarks,
+    save_baseline,
+    save_results,
+)
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "Comparison",
+    "benchmark",
+    "compare",
+    "load_results",
+    "measure",
+    "run_benchmarks",
+    "save_baseline",
+    "save_results",
+]
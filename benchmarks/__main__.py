@@ -0,0 +1,91 @@
+"""Command line of the benchmark suite, see ``python -m benchmarks --help``."""
+
+import argparse
+import sys
+
+from . import suite  # noqa: F401  (registers the benchmarks)
+from .runner import (
+    BASELINE_DIR,
+    BENCHMARKS,
+    baseline_path,
+    compare,
+    format_comparison,
+    format_result,
+    load_results,
+    run_benchmarks,
+    save_baseline,
+    save_results,
+)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, description in (
+        ("run", "Time the benchmarks and print the results."),
+        ("baseline", "Time the benchmarks and store them as this machine's baseline."),
+        ("compare", "Time the benchmarks and flag regressions against a baseline."),
+    ):
+        command = commands.add_parser(name, help=description, description=description)
+        command.add_argument("-k", "--filter", default="", help="only names containing this")
+        command.add_argument("--group", choices=("micro", "macro"), help="only this group")
+        command.add_argument("--samples", type=int, default=15, help="samples per benchmark")
+        command.add_argument("--min-time", type=float, default=0.02, help="seconds per sample")
+        command.add_argument("-o", "--output", help="also write the results to this JSON file")
+        command.add_argument("--baseline-dir", default=BASELINE_DIR, help="per-machine baselines")
+
+    compare_command = commands.choices["compare"]
+    compare_command.add_argument("--baseline", help="baseline file, this machine's if omitted")
+    compare_command.add_argument("--results", help="compare this result file instead of timing")
+    compare_command.add_argument("--threshold", type=float, default=0.05, help="relative slowdown")
+    compare_command.add_argument("--alpha", type=float, default=0.01, help="significance level")
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    names = [
+        name
+        for name, bench in BENCHMARKS.items()
+        if args.filter in name and (args.group is None or bench.group == args.group)
+    ]
+
+    if args.command == "compare":
+        path = args.baseline or baseline_path(args.baseline_dir)
+        try:
+            baseline = load_results(path)
+        except FileNotFoundError:
+            print(f"No baseline at {path}; create one with 'python -m benchmarks baseline'.")
+            return 2
+
+    if getattr(args, "results", None):
+        results = load_results(args.results)
+    else:
+        results = run_benchmarks(
+            names,
+            samples=args.samples,
+            min_time=args.min_time,
+            progress=lambda name, entry: print(format_result(name, entry), flush=True),
+        )
+    if args.output:
+        save_results(results, args.output)
+
+    if args.command == "baseline":
+        print(f"Baseline written to {save_baseline(results, args.baseline_dir)}")
+    elif args.command == "compare":
+        comparisons = compare(baseline, results, threshold=args.threshold, alpha=args.alpha)
+        print()
+        for comparison in comparisons:
+            print(format_comparison(comparison))
+        regressions = [c.name for c in comparisons if c.verdict == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""
+runner.py
+
+Timing, result files and regression checks of the benchmark suite.
+
+A ``Benchmark`` is a setup function that returns the callable to time, plus
+the number of operations one call performs. ``measure`` calibrates how many
+calls make up one sample (at least ``min_time`` seconds), then takes
+``samples`` samples with the garbage collector disabled, like ``timeit``.
+Timings are stored per operation.
+
+Results are JSON files. ``save_baseline`` writes them to a file per machine
+(host name, architecture and Python version), so baselines from different
+machines never get compared.
+
+``compare`` runs Welch's t-test on the logarithms of the per-operation
+timings: the log makes the test compare ratios, which is what a slowdown is,
+and tames the long right tail of timing noise. A benchmark regresses when it
+is slower by more than ``threshold`` and the one-sided p-value is below
+``alpha``; small but significant drifts and large but noisy ones pass.
+"""
+
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    ops: int = 1
+    group: str = "micro"
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, ops: int = 1, group: str = "micro"):
+    """Register ``setup`` as benchmark ``name``; the returned callable performs ``ops`` operations."""
+
+    def register(setup: Callable[[], Callable[[], object]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered")
+        BENCHMARKS[name] = Benchmark(name, setup, ops, group)
+        return setup
+
+    return register
+
+
+# ---------------------------------------------
+# Timing
+# ---------------------------------------------
+def _time(run: Callable[[], object], number: int) -> float:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure(bench: Benchmark, samples: int = 15, min_time: float = 0.02) -> dict:
+    """Time ``bench``; returns its result entry with per-operation ``samples`` in seconds."""
+    if samples < 2:
+        raise ValueError(f"At least two samples are required, got {samples}")
+
+    run = bench.setup()
+    number = 1
+    while True:
+        elapsed = _time(run, number)
+        if elapsed >= min_time:
+            break
+        # Aim a little above min_time so the next try usually suffices.
+        number = max(number * 2, int(number * 1.2 * min_time / max(elapsed, 1e-9)))
+
+    timings = [_time(run, number) / (number * bench.ops) for _ in range(samples)]
+    return {"group": bench.group, "ops": bench.ops, "number": number, "samples": timings}
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    samples: int = 15,
+    min_time: float = 0.02,
+    progress: Callable[[str, dict], None] | None = None,
+) -> dict:
+    """Run the registered benchmarks (all if ``names`` is omitted) into a result document."""
+    selected = list(BENCHMARKS) if names is None else names
+    results = {}
+    for name in selected:
+        results[name] = measure(BENCHMARKS[name], samples, min_time)
+        if progress is not None:
+            progress(name, results[name])
+
+    return {
+        "format": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "commit": _git_commit(),
+        "benchmarks": results,
+    }
+
+
+# ---------------------------------------------
+# Result files
+# ---------------------------------------------
+def machine_info() -> dict:
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "numpy": np.__version__,
+    }
+
+
+def machine_key(info: dict | None = None) -> str:
+    """File-name-safe key of the machine and Python version of ``info``."""
+    info = info if info is not None else machine_info()
+    major_minor = "".join(info["python"].split(".")[:2])
+    key = f"{info['node']}-{info['machine']}-{info['implementation']}{major_minor}"
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", key)
+
+
+def _git_commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def save_results(results: dict, path: str | Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+
+def load_results(path: str | Path) -> dict:
+    results = json.loads(Path(path).read_text())
+    if results.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported benchmark result format {results.get('format')}")
+    return results
+
+
+def baseline_path(directory: str | Path = BASELINE_DIR, info: dict | None = None) -> Path:
+    return Path(directory) / f"{machine_key(info)}.json"
+
+
+def save_baseline(results: dict, directory: str | Path = BASELINE_DIR) -> Path:
+    return save_results(results, baseline_path(directory, results["machine"]))
+
+
+# ---------------------------------------------
+# Statistics
+# ---------------------------------------------
+def _betacf(a: float, b: float, x: float) -> float:
+    # Continued fraction of the incomplete beta function (modified Lentz).
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            h *= c * d
+        if abs(c * d - 1) < 1e-14:
+            break
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1 - front * _betacf(b, a, 1 - x) / b
+
+
+def student_t_sf(t: float, dof: float) -> float:
+    """Upper tail probability of Student's t distribution."""
+    if dof <= 0:
+        raise ValueError(f"dof must be positive, got {dof}")
+    tail = 0.5 * _betainc(dof / 2, 0.5, dof / (dof + t * t))
+    return tail if t > 0 else 1 - tail
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+    ratio: float
+    p_slower: float
+    p_faster: float
+    verdict: str
+
+
+def welch(baseline: list[float], current: list[float]) -> tuple[float, float, float]:
+    """Ratio of geometric means, and one-sided p-values for "slower" and "faster"."""
+    x, y = np.log(baseline), np.log(current)
+    if len(x) < 2 or len(y) < 2:
+        raise ValueError("Welch's test needs at least two samples on each side")
+
+    var_x, var_y = x.var(ddof=1) / len(x), y.var(ddof=1) / len(y)
+    difference = float(y.mean() - x.mean())
+    se = math.sqrt(var_x + var_y)
+    if se == 0:
+        p = 0.0 if difference else 0.5
+        return math.exp(difference), p if difference > 0 else 1 - p, p if difference < 0 else 1 - p
+    dof = (var_x + var_y) ** 2 / (var_x**2 / (len(x) - 1) + var_y**2 / (len(y) - 1))
+    t = difference / se
+    return math.exp(difference), student_t_sf(t, dof), student_t_sf(-t, dof)
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.05, alpha: float = 0.01
+) -> list[Comparison]:
+    """
+    Compare every benchmark present in both result documents.
+
+    Verdicts are ``"regression"``, ``"improvement"`` and ``"unchanged"``.
+    """
+    comparisons = []
+    for name, entry in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        ratio, p_slower, p_faster = welch(reference["samples"], entry["samples"])
+        if ratio > 1 + threshold and p_slower < alpha:
+            verdict = "regression"
+        elif ratio < 1 - threshold and p_faster < alpha:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        comparisons.append(
+            Comparison(
+                name,
+                float(np.mean(reference["samples"])),
+                float(np.mean(entry["samples"])),
+                ratio,
+                p_slower,
+                p_faster,
+                verdict,
+            )
+        )
+    return comparisons
+
+
+# ---------------------------------------------
+# Reporting
+# ---------------------------------------------
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_result(name: str, entry: dict) -> str:
+    samples = np.asarray(entry["samples"])
+    spread = 100 * samples.std(ddof=1) / samples.mean()
+    return (
+        f"{name:<32} {format_time(float(samples.mean())):>10}/op  "
+        f"{1 / samples.mean():>14,.0f} op/s  ±{spread:.1f}%"
+    )
+
+
+def format_comparison(comparison: Comparison) -> str:
+    change = 100 * (comparison.ratio - 1)
+    return (
+        f"{comparison.name:<32} {format_time(comparison.baseline):>10} -> "
+        f"{format_time(comparison.current):>10}  {change:+6.1f}%  "
+        f"p={min(comparison.p_slower, comparison.p_faster):.2g}  {comparison.verdict}"
+    )
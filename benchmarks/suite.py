@@ -0,0 +1,162 @@
+"""
+suite.py
+
+The benchmarks of the engine's hot paths.
+
+Micro benchmarks time one operation of a core class; macro benchmarks time
+whole rounds. Every setup builds its objects once and returns the callable
+that is timed, so construction costs stay out of the measurement unless the
+construction is what is measured.
+"""
+
+from blackjack import Game, Player
+from blackjack.basic_strategy import basic_strategy
+from blackjack.card import Card, RANKS, SUITS
+from blackjack.deck import Deck
+from blackjack.discard_tray import DiscardTray
+from blackjack.hand import Hand
+from blackjack.rules import Rules
+from blackjack.vectorized import LockstepSimulator
+
+from .runner import benchmark
+
+DECKS = 6
+SHOE = DECKS * len(SUITS) * len(RANKS)
+TABLE_ROUNDS = 100
+LOCKSTEP_SHOES = 1000
+HAND_READS = 100
+
+
+# ---------------------------------------------
+# Micro benchmarks
+# ---------------------------------------------
+@benchmark("card_construction", ops=len(SUITS) * len(RANKS))
+def card_construction():
+    names = [(suit, rank) for suit in SUITS for rank in RANKS]
+
+    def run():
+        for suit, rank in names:
+            Card(suit, rank)
+
+    return run
+
+
+@benchmark("deck_generate")
+def deck_generate():
+    deck = Deck(deck_size=DECKS, rng=0)
+    return deck._generate_deck
+
+
+@benchmark("deck_draw_shoe", ops=SHOE)
+def deck_draw_shoe():
+    deck = Deck(deck_size=DECKS, rng=0)
+    deck.shuffle()
+    draw = deck.draw
+
+    def run():
+        for _ in range(SHOE):
+            draw()
+        # Refilling costs about as much as a few draws.
+        deck._generate_deck()
+
+    return run
+
+
+@benchmark("deck_shuffle")
+def deck_shuffle():
+    deck = Deck(deck_size=DECKS, rng=0)
+    return deck.shuffle
+
+
+@benchmark("set_cutcard[full]")
+def set_cutcard_full():
+    deck = Deck(deck_size=DECKS, rng=0)
+    deck.shuffle()
+    return lambda: deck.set_cutcard(pos=SHOE // 3)
+
+
+@benchmark("set_cutcard[dealt]")
+def set_cutcard_dealt():
+    deck = Deck(deck_size=DECKS, rng=0)
+    deck.shuffle()
+    for _ in range(SHOE // 4):
+        deck.draw()
+    # Deeper than the free slots, so the live cards are rotated in place.
+    return lambda: deck.set_cutcard(pos=SHOE // 2)
+
+
+def _five_cards(aces: int) -> list[Card]:
+    ace, two = Card("Spades", "Ace"), Card("Hearts", "2")
+    return [ace] * aces + [two] * (5 - aces)
+
+
+def _hand_score(aces: int):
+    # The hand is built once: only the reads of its score are timed.
+    hand = Hand(role="player", name="Bench")
+    for card in _five_cards(aces):
+        hand.add(card)
+
+    def run():
+        for _ in range(HAND_READS):
+            hand.score
+
+    return run
+
+
+for _aces in range(5):
+    benchmark(f"hand_score[aces={_aces}]", ops=HAND_READS)(
+        lambda aces=_aces: _hand_score(aces)
+    )
+
+
+@benchmark("hand_build", ops=5)
+def hand_build():
+    cards = _five_cards(2)
+
+    def run():
+        hand = Hand(role="player", name="Bench")
+        for card in cards:
+            hand.add(card)
+
+    return run
+
+
+@benchmark("discard_tray", ops=30)
+def discard_tray():
+    tray = DiscardTray()
+    round_cards = [Card.from_code(code) for code in range(0, 52, 5)]
+
+    def run():
+        for _ in range(30):
+            tray.discard(round_cards)
+        tray.reset()
+
+    return run
+
+
+# ---------------------------------------------
+# Macro benchmarks
+# ---------------------------------------------
+def _play(game: Game) -> None:
+    for _ in game.rounds(TABLE_ROUNDS):
+        pass
+
+
+@benchmark("table_rounds[seats=1]", ops=TABLE_ROUNDS, group="macro")
+def table_rounds_single():
+    game = Game(rng=0)
+    return lambda: _play(game)
+
+
+@benchmark("table_rounds[seats=7]", ops=TABLE_ROUNDS, group="macro")
+def table_rounds_full():
+    chart = basic_strategy(Rules())
+    players = [Player(name=f"Seat {seat}", strategy=chart) for seat in range(7)]
+    game = Game(players=players, rng=0)
+    return lambda: _play(game)
+
+
+@benchmark("lockstep_rounds", ops=LOCKSTEP_SHOES, group="macro")
+def lockstep_rounds():
+    simulator = LockstepSimulator(LOCKSTEP_SHOES, basic_strategy(Rules()), rng=0)
+    return simulator.play_round
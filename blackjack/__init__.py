@@ -8,6 +8,7 @@ Provides classes for simulating Blackjack games:
 - Dealer
 - Game
 - DiscardTray
+- Rules
 """
 
 # Expose main classes at the package level
@@ -18,5 +19,6 @@ from .player import Player
 from .dealer import Dealer
 from .game import Game
 from .discard_tray import DiscardTray
+from .rules import Rules
 
-__all__ = ["Card", "Deck", "Hand", "Player", "Dealer", "Game", "DiscardTray"]
+__all__ = ["Card", "Deck", "Hand", "Player", "Dealer", "Game", "DiscardTray", "Rules"]
@@ -0,0 +1,277 @@
+"""
+analysis.py
+
+Combinatorial expected values of the player's decisions.
+
+For a starting ``Hand``, the dealer's upcard and the composition of the unseen
+cards, ``PlayerAnalyzer`` computes the expected value (per initial bet) of
+standing, hitting, doubling, splitting and surrendering. Hitting recurses over
+every draw sequence without replacement and plays each resulting hand
+optimally; all subresults are stored in a ``TranspositionTable``.
+
+The values are conditioned on the dealer not holding a natural, i.e. they are
+the values of the decision the player actually faces after the peek. The
+following approximations keep the runtime bounded and are explicit:
+
+* The dealer's outcome distribution is computed once from the composition at
+  the decision. With ``depletion=True`` it is recomputed for every composition
+  the player's draws lead to, which is exact but much slower.
+* The effect of the dealer's (unknown, non-natural) hole card on the player's
+  draws is ignored.
+* Splits play every split hand with the composition after the pair was
+  removed. Resplits use a fixed probability of drawing another pair card:
+  every split hand either draws a non-pair card (and is worth the value of a
+  split hand that did not pair) or resplits while hands are left, and a hand
+  that pairs once no more splits are allowed is worth the unconditional split
+  hand value.
+"""
+
+from typing import Sequence
+
+from .card import Card
+from .hand import Hand
+from .probability import (
+    ACE,
+    BUST,
+    DealerProbabilities,
+    TranspositionTable,
+    remove_card,
+    value_class,
+    value_composition,
+)
+from .rules import Rules
+from .strategy import Action
+
+
+def stand_value(score: int, dealer: Sequence[float]) -> float:
+    """EV of standing on ``score`` against a dealer outcome distribution."""
+    if score > 21:
+        return -1.0
+
+    win = dealer[BUST]
+    lose = 0.0
+    for outcome, p in enumerate(dealer[:BUST]):
+        dealer_score = 17 + outcome
+        if dealer_score < score:
+            win += p
+        elif dealer_score > score:
+            lose += p
+    return win - lose
+
+
+def _normalize(hard: int, has_ace: bool) -> tuple[int, bool]:
+    # An ace only matters while it could still count as 11.
+    return hard, has_ace and hard <= 11
+
+
+def _score(hard: int, has_ace: bool) -> int:
+    return hard + 10 if has_ace and hard <= 11 else hard
+
+
+class PlayerAnalyzer:
+    """
+    Expected values of the player's decisions.
+
+    Args:
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        table (TranspositionTable | None): Cache for subresults, shared with
+            the dealer engine.
+        depletion (bool): Recompute the dealer's distribution for every
+            composition reached by the player's draws.
+    """
+
+    def __init__(
+        self,
+        rules: Rules | None = None,
+        table: TranspositionTable | None = None,
+        depletion: bool = False,
+    ):
+        self._rules = rules if rules is not None else Rules()
+        self._table = table if table is not None else TranspositionTable()
+        self._dealer = DealerProbabilities(self._table)
+        self._depletion = depletion
+
+    @property
+    def rules(self) -> Rules:
+        return self._rules
+
+    @property
+    def table(self) -> TranspositionTable:
+        return self._table
+
+    # ----------------------------------------------
+    # Public API
+    # ----------------------------------------------
+    def action_values(
+        self, hand: Hand, upcard: Card | int, composition: Sequence[int]
+    ) -> dict[Action, float]:
+        """
+        EV of every action available to ``hand``.
+
+        Args:
+            hand (Hand): The player's hand.
+            upcard (Card | int): Dealer's upcard, or its value (1 for an ace).
+            composition (Sequence[int]): Unseen cards, without the hand's cards
+                and the upcard; per rank or per value class.
+
+        Returns:
+            dict[Action, float]: EV per initial bet of every possible action.
+        """
+        up = value_class(upcard)
+        composition = value_composition(composition)
+        context = (up, self._dealer_composition(composition))
+
+        if hand.blackjack:
+            return {Action.STAND: self._rules.blackjack_payout}
+
+        hard = hand.score - 10 if hand.soft else hand.score
+        has_ace = hand.soft
+        values = {Action.STAND: self._stand(hand.score, composition, context)}
+        if hand.score < 21:
+            values[Action.HIT] = self._hit(hard, has_ace, composition, context)
+        if hand.doubling_possible:
+            values[Action.DOUBLE] = self._double(hard, has_ace, composition, context)
+        if hand.splitting_possible and self._rules.max_split_hands > 1:
+            pair = value_class(hand.hand[0])
+            values[Action.SPLIT] = self._split(pair, composition, context)
+        if self._rules.surrender and len(hand) == 2:
+            values[Action.SURRENDER] = -0.5
+
+        return values
+
+    def best_action(
+        self, hand: Hand, upcard: Card | int, composition: Sequence[int]
+    ) -> tuple[Action, float]:
+        values = self.action_values(hand, upcard, composition)
+        action = max(values, key=values.get)
+        return action, values[action]
+
+    # ----------------------------------------------
+    # Recursion
+    # ----------------------------------------------
+    def _dealer_composition(self, composition: tuple[int, ...]) -> tuple[int, ...] | None:
+        return None if self._depletion else composition
+
+    def _dealer_outcomes(self, composition: tuple[int, ...], context) -> tuple[float, ...]:
+        up, fixed = context
+        key = ("dealer-view", up, fixed or composition, self._rules.hit_soft_17)
+        outcomes = self._table.get(key)
+        if outcomes is None:
+            outcomes = tuple(
+                float(p)
+                for p in self._dealer.outcome_probabilities(
+                    up + 1, fixed or composition, self._rules, peek=True
+                )
+            )
+            self._table.put(key, outcomes)
+        return outcomes
+
+    def _stand(self, score: int, composition: tuple[int, ...], context) -> float:
+        return stand_value(score, self._dealer_outcomes(composition, context))
+
+    def _draws(self, composition: tuple[int, ...]):
+        total = sum(composition)
+        if total == 0:
+            raise ValueError("Cannot draw from an empty composition")
+        for value, count in enumerate(composition):
+            if count:
+                yield value, count / total, remove_card(composition, value)
+
+    def _best(self, hard: int, has_ace: bool, composition, context) -> float:
+        """EV of playing a hand optimally with stand and hit only."""
+        if hard > 21:
+            return -1.0
+        score = _score(hard, has_ace)
+        stand = self._stand(score, composition, context)
+        if score == 21:
+            return stand
+        return max(stand, self._hit(hard, has_ace, composition, context))
+
+    def _hit(self, hard: int, has_ace: bool, composition, context) -> float:
+        hard, has_ace = _normalize(hard, has_ace)
+        key = ("hit", hard, has_ace, composition, context, self._rules.hit_soft_17)
+        value = self._table.get(key)
+        if value is not None:
+            return value
+
+        value = 0.0
+        for card, p, rest in self._draws(composition):
+            value += p * self._best(hard + card + 1, has_ace or card == ACE, rest, context)
+
+        self._table.put(key, value)
+        return value
+
+    def _double(self, hard: int, has_ace: bool, composition, context) -> float:
+        value = 0.0
+        for card, p, rest in self._draws(composition):
+            new_hard = hard + card + 1
+            if new_hard > 21:
+                value -= p
+            else:
+                score = _score(new_hard, has_ace or card == ACE)
+                value += p * self._stand(score, rest, context)
+        return 2 * value
+
+    def _split_hand(self, pair: int, composition, context, exclude_pair: bool) -> float:
+        """EV of one split hand holding ``pair`` after its second card."""
+        rules = self._rules
+        aces = pair == ACE
+        value = 0.0
+        weight = 0.0
+        for card, p, rest in self._draws(composition):
+            if exclude_pair and card == pair:
+                continue
+            hard = pair + 1 + card + 1
+            has_ace = aces or card == ACE
+            if aces and not rules.hit_split_aces:
+                hand_value = self._stand(_score(hard, has_ace), rest, context)
+            else:
+                hand_value = self._best(hard, has_ace, rest, context)
+                if rules.double_after_split:
+                    hand_value = max(hand_value, self._double(hard, has_ace, rest, context))
+            value += p * hand_value
+            weight += p
+        return value / weight if weight else 0.0
+
+    def _split(self, pair: int, composition, context) -> float:
+        rules = self._rules
+        key = ("split", pair, composition, context, rules)
+        value = self._table.get(key)
+        if value is not None:
+            return value
+
+        any_card = self._split_hand(pair, composition, context, exclude_pair=False)
+        max_hands = rules.max_split_hands
+        can_resplit = max_hands > 2 and (pair != ACE or rules.resplit_aces)
+        p_pair = composition[pair] / sum(composition)
+        if not can_resplit or p_pair == 0:
+            value = 2 * any_card
+        else:
+            no_pair = self._split_hand(pair, composition, context, exclude_pair=True)
+            value = self._resplit_total(2, 2, max_hands, p_pair, no_pair, any_card, {})
+
+        self._table.put(key, value)
+        return value
+
+    def _resplit_total(self, hands, pending, max_hands, p_pair, no_pair, any_card, memo):
+        """Expected total value of ``pending`` split hands still to draw."""
+        if pending == 0:
+            return 0.0
+        key = (hands, pending)
+        if key in memo:
+            return memo[key]
+
+        if hands < max_hands:
+            value = p_pair * self._resplit_total(
+                hands + 1, pending + 1, max_hands, p_pair, no_pair, any_card, memo
+            ) + (1 - p_pair) * (
+                no_pair
+                + self._resplit_total(hands, pending - 1, max_hands, p_pair, no_pair, any_card, memo)
+            )
+        else:
+            value = any_card + self._resplit_total(
+                hands, pending - 1, max_hands, p_pair, no_pair, any_card, memo
+            )
+
+        memo[key] = value
+        return value
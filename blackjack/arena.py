@@ -0,0 +1,118 @@
+"""
+arena.py
+
+Preallocated per-table round state.
+
+A round used to build a ``Hand`` per seat and per split, a record per played
+hand and a fresh dealer hand, and copied every hand into the tray. The
+``RoundArena`` of a table instead holds ``max_split_hands`` ``HandSlot``
+records per seat, each with its own ``Hand``, built once. ``begin_round``
+rewinds the arena, ``take`` hands out the next slot of a seat, emptied in
+place, and a split moves the second card into the seat's next slot
+(``Hand.split_into``) instead of building two new hands.
+
+Cards still move as ``Card`` references: a hand's list is extended into the
+tray, and the tray hands its list to the shoe on a reshuffle without copying
+it. Lists of the shared ``Card`` flyweights are the cheapest buffer the
+Python-level round loop can write into; writing codes element by element
+into a NumPy array costs more per card than appending a reference.
+
+Slots are reused, so a ``Hand`` seen in a ``Decision`` is only valid until
+the next round starts. ``HandResult`` and ``RoundResult`` copy what they need.
+"""
+
+from .hand import Hand
+from .strategy import Action
+
+
+class HandSlot:
+    """Book-keeping for a hand while its seat is acting."""
+
+    __slots__ = ("hand", "wager", "actions", "split", "split_aces", "surrendered")
+
+    def __init__(self, hand: Hand):
+        self.hand = hand
+        self.actions: list[Action] = []
+        self.reset(0.0)
+
+    def reset(self, wager: float, split: bool = False) -> None:
+        self.wager = wager
+        self.actions.clear()
+        self.split = split
+        self.split_aces = False
+        self.surrendered = False
+
+        return None
+
+
+class RoundArena:
+    """
+    Reusable hands and hand records of one table.
+
+    Args:
+        names (list[str]): Name of the player of every seat.
+        max_hands (int): Slots per seat, i.e. the most hands a seat can play.
+    """
+
+    def __init__(self, names: list[str], max_hands: int):
+        if max_hands < 1:
+            raise ValueError(f"max_hands must be at least 1, got {max_hands}")
+
+        self._max_hands = max_hands
+        self._slots = [
+            [HandSlot(Hand(role="player", name=name)) for _ in range(max_hands)]
+            for name in names
+        ]
+        self._used = [0] * len(names)
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def seats(self) -> int:
+        return len(self._slots)
+
+    @property
+    def max_hands(self) -> int:
+        return self._max_hands
+
+    def used(self, seat: int) -> int:
+        """Slots of ``seat`` taken in the current round."""
+        return self._used[seat]
+
+    # -----------------------------------------------
+    # functions
+    # -----------------------------------------------
+    def begin_round(self) -> None:
+        used = self._used
+        for seat in range(len(used)):
+            used[seat] = 0
+
+        return None
+
+    def take(self, seat: int, wager: float) -> HandSlot:
+        """The next free slot of ``seat`` with an empty hand."""
+        index = self._used[seat]
+        if index == self._max_hands:
+            raise RuntimeError(f"Seat {seat} has no free hand slot left")
+
+        slot = self._slots[seat][index]
+        self._used[seat] = index + 1
+        slot.hand.clear()
+        slot.reset(wager)
+
+        return slot
+
+    def split(self, seat: int, slot: HandSlot) -> HandSlot:
+        """Split ``slot``'s pair: the second card moves into the seat's next slot."""
+        other = self.take(seat, slot.wager)
+        slot.hand.split_into(other.hand)
+        other.actions.extend(slot.actions)
+        for split_slot in (slot, other):
+            split_slot.split = True
+            split_slot.split_aces = split_slot.hand.hand[0].is_ace
+
+        return other
+
+    def __repr__(self) -> str:
+        return f"RoundArena(seats={self.seats}, max_hands={self._max_hands})"
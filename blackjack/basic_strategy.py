@@ -0,0 +1,255 @@
+"""
+basic_strategy.py
+
+Generates the basic-strategy chart of a rule set and compiles it into dense
+NumPy lookup tables.
+
+Every cell of the chart (hard totals, soft totals and pairs against every
+upcard) is decided by ``PlayerAnalyzer`` for a representative hand dealt from
+a full shoe of ``rules.decks`` decks. The chart is stored as two ``uint8``
+arrays of shape ``(3, 22, 10)``, indexed by kind (hard, soft, pair), total
+(or pair value class) and upcard value class:
+
+* ``decisions`` holds the best action of the cell. Pair rows hold ``SPLIT`` or
+  ``NO_DECISION``, in which case the hand is played by its total.
+* ``fallbacks`` holds the better of stand and hit, used when the best action
+  is not allowed (doubling or surrendering after the first decision).
+
+Generated charts are cached on disk as ``.npz`` files keyed by the rules the
+chart depends on (``CHART_FIELDS``); the shoe handling (``end_of_shoe``,
+``csm``) does not change the chart and shares its file.
+"""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from .card import Card, NUM_CODES
+from .hand import Hand
+from .analysis import PlayerAnalyzer
+from .logger import logger
+from .probability import remove_card, value_class, value_composition
+from .rules import Rules
+from .strategy import Action
+
+HARD = 0
+SOFT = 1
+PAIR = 2
+NO_DECISION = 255
+
+CACHE_VERSION = 1
+# Fields of ``Rules`` the chart depends on.
+CHART_FIELDS = (
+    "decks",
+    "hit_soft_17",
+    "blackjack_payout",
+    "double_after_split",
+    "surrender",
+    "resplit_aces",
+    "hit_split_aces",
+    "max_split_hands",
+)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "blackjack-engine"
+
+_ACTIONS = tuple(Action)
+# Upcard value class of every card code.
+_UPCARD_CLASS = tuple(value_class(Card.from_code(code)) for code in range(NUM_CODES))
+_RANK_OF_VALUE = ("Ace", "2", "3", "4", "5", "6", "7", "8", "9", "10")
+
+
+class StrategyTable:
+    """
+    A compiled strategy chart, usable directly as a player strategy.
+
+    Args:
+        decisions (np.ndarray): Best action per cell, shape ``(3, 22, 10)``.
+        fallbacks (np.ndarray): Best of stand and hit per cell, same shape.
+    """
+
+    def __init__(self, decisions: np.ndarray, fallbacks: np.ndarray):
+        if decisions.shape != (3, 22, 10) or fallbacks.shape != (3, 22, 10):
+            raise ValueError("Strategy tables must have the shape (3, 22, 10)")
+
+        self._decisions = np.ascontiguousarray(decisions, dtype=np.uint8)
+        self._fallbacks = np.ascontiguousarray(fallbacks, dtype=np.uint8)
+        self._decisions.flags.writeable = False
+        self._fallbacks.flags.writeable = False
+
+    @property
+    def decisions(self) -> np.ndarray:
+        return self._decisions
+
+    @property
+    def fallbacks(self) -> np.ndarray:
+        return self._fallbacks
+
+    def lookup(self, total: int, soft: bool, pair: int | None, upcard: int) -> tuple[Action, Action]:
+        """
+        Best action and fallback of a cell.
+
+        Args:
+            total (int): Hand total.
+            soft (bool): The total is soft.
+            pair (int | None): Value class of a splittable pair, else ``None``.
+            upcard (int): Value class of the dealer's upcard.
+        """
+        if pair is not None:
+            action = self._decisions[PAIR, pair, upcard]
+            if action != NO_DECISION:
+                return _ACTIONS[action], _ACTIONS[self._fallbacks[PAIR, pair, upcard]]
+
+        kind = SOFT if soft else HARD
+        return (
+            _ACTIONS[self._decisions[kind, total, upcard]],
+            _ACTIONS[self._fallbacks[kind, total, upcard]],
+        )
+
+    def __call__(self, hand: Hand, upcard: Card, allowed: frozenset[Action]) -> Action:
+        up = _UPCARD_CLASS[upcard.code]
+        if Action.SPLIT in allowed and hand.splitting_possible:
+            pair = _UPCARD_CLASS[hand.hand[0].code]
+            if self._decisions[PAIR, pair, up] == Action.SPLIT:
+                return Action.SPLIT
+
+        kind = SOFT if hand.soft else HARD
+        action = _ACTIONS[self._decisions[kind, hand.score, up]]
+        if action in allowed:
+            return action
+        return _ACTIONS[self._fallbacks[kind, hand.score, up]]
+
+    def save(self, path: str | Path | BinaryIO, rules: Rules | None = None) -> None:
+        np.savez(
+            path,
+            decisions=self._decisions,
+            fallbacks=self._fallbacks,
+            rules=np.array(repr(rules)),
+            version=np.array(CACHE_VERSION),
+        )
+
+        return None
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StrategyTable":
+        with np.load(path) as data:
+            return cls(data["decisions"], data["fallbacks"])
+
+    def __repr__(self) -> str:
+        return "StrategyTable(shape=(3, 22, 10))"
+
+
+def _hand(*values: int) -> Hand:
+    hand = Hand(role="player", name="basic strategy")
+    for value in values:
+        hand.add(Card("Spades", _RANK_OF_VALUE[value - 1]))
+    return hand
+
+
+def _representative_hands() -> list[tuple[int, int, Hand]]:
+    """A hand for every (kind, index) cell of the chart."""
+    hands = []
+    for total in range(4, 22):
+        if total <= 11:
+            values = (2, total - 2)
+        elif total <= 20:
+            values = (total - 10, 10)
+        else:
+            values = (10, 9, 2)
+        hands.append((HARD, total, _hand(*values)))
+    for total in range(12, 22):
+        values = (1, 1) if total == 12 else (1, total - 11)
+        if total == 21:
+            values = (1, 5, 5)
+        hands.append((SOFT, total, _hand(*values)))
+    for value in range(1, 11):
+        hands.append((PAIR, value - 1, _hand(value, value)))
+    return hands
+
+
+def generate(rules: Rules | None = None, analyzer: PlayerAnalyzer | None = None) -> StrategyTable:
+    """Derive the basic-strategy chart of ``rules`` with ``PlayerAnalyzer``."""
+    rules = rules if rules is not None else Rules()
+    analyzer = analyzer if analyzer is not None else PlayerAnalyzer(rules)
+    shoe = value_composition([4 * rules.decks] * 13)
+
+    decisions = np.full((3, 22, 10), Action.STAND, dtype=np.uint8)
+    fallbacks = np.full((3, 22, 10), Action.STAND, dtype=np.uint8)
+    decisions[PAIR] = NO_DECISION
+
+    for kind, index, hand in _representative_hands():
+        composition = shoe
+        for card in hand:
+            composition = remove_card(composition, value_class(card))
+        for up in range(10):
+            values = analyzer.action_values(hand, up + 1, remove_card(composition, up))
+            split = values.pop(Action.SPLIT, None)
+            best = max(values, key=values.get)
+            fallback = max((Action.STAND, Action.HIT), key=lambda a: values.get(a, -np.inf))
+
+            if kind == PAIR:
+                if split is not None and split > values[best]:
+                    decisions[kind, index, up] = Action.SPLIT
+                    fallbacks[kind, index, up] = fallback
+            else:
+                decisions[kind, index, up] = best
+                fallbacks[kind, index, up] = fallback
+
+    return StrategyTable(decisions, fallbacks)
+
+
+def cache_path(rules: Rules, cache_dir: str | Path | None = None) -> Path:
+    key = ",".join(f"{field}={getattr(rules, field)!r}" for field in CHART_FIELDS)
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{key}".encode()).hexdigest()[:16]
+    directory = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return directory / f"basic-strategy-{digest}.npz"
+
+
+def _write_cache(table: StrategyTable, path: Path, rules: Rules) -> None:
+    # Write a temporary file next to the cache and rename it over the cache
+    # file, so readers never see a partly written chart.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            table.save(file, rules)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+
+    return None
+
+
+def basic_strategy(
+    rules: Rules | None = None, cache_dir: str | Path | None = None, use_cache: bool = True
+) -> StrategyTable:
+    """
+    The basic-strategy chart of ``rules``, loaded from the disk cache if present.
+
+    Args:
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        cache_dir (str | Path | None): Cache directory, ``~/.cache/blackjack-engine``
+            if omitted.
+        use_cache (bool): Read and write the disk cache.
+    """
+    rules = rules if rules is not None else Rules()
+    path = cache_path(rules, cache_dir)
+
+    if use_cache and path.exists():
+        try:
+            return StrategyTable.load(path)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as error:
+            logger.warning(f"Ignoring unreadable strategy cache {path}: {error}")
+
+    table = generate(rules)
+    if use_cache:
+        try:
+            _write_cache(table, path, rules)
+        except OSError as error:
+            logger.warning(f"Could not write strategy cache {path}: {error}")
+
+    return table
@@ -4,6 +4,12 @@ card.py
 This module defines the Card class used in the Blackjack Simulator. It includes
 Informations about the card itself (color, value) and interprets also the value
 of picture cards.
+
+Cards are flyweights: there is exactly one ``Card`` object per suit and rank,
+built once at import time. ``Card("Hearts", "King")`` returns that shared
+object, and every card carries a small integer code
+(``suit_index * 13 + rank_index``) so that shoes, hands and logs can store
+plain integers and only turn them back into objects with ``Card.from_code``.
 """
 
 from typing import Union, Tuple
@@ -27,19 +33,45 @@ VALUE = {
     "Ace": (1, 11),
 }
 
+NUM_CODES = len(SUITS) * len(RANKS)
+ACE_RANK_INDEX = RANKS.index("Ace")
+
 
 class Card:
+    __slots__ = ("_suit", "_rank", "_code", "_value", "_hard_value", "_is_ace")
+
+    _by_name: dict[tuple[str, str], "Card"] = {}
+    _by_code: tuple["Card", ...] = ()
 
-    def __init__(self, suit: str, rank: str):
-        if suit not in SUITS:
-            logger.error(f'The provided suit "{suit}" does not exist.')
-            raise ValueError(f'The provided suit "{suit}" does not exist.')
-        if rank not in RANKS:
-            logger.error(f'The provided suit "{rank}" does not exist.')
+    def __new__(cls, suit: str, rank: str) -> "Card":
+        card = cls._by_name.get((suit, rank))
+        if card is None:
+            if suit not in SUITS:
+                logger.error(f'The provided suit "{suit}" does not exist.')
+                raise ValueError(f'The provided suit "{suit}" does not exist.')
+            logger.error(f'The provided rank "{rank}" does not exist.')
             raise ValueError(f'The provided rank "{rank}" does not exist.')
 
-        self._suit = suit
-        self._rank = rank
+        return card
+
+    @classmethod
+    def _build(cls, suit: str, rank: str) -> "Card":
+        card = object.__new__(cls)
+        card._suit = suit
+        card._rank = rank
+        card._code = SUITS.index(suit) * len(RANKS) + RANKS.index(rank)
+        card._value = VALUE[rank]
+        card._is_ace = rank == "Ace"
+        card._hard_value = 1 if card._is_ace else card._value
+
+        return card
+
+    @classmethod
+    def from_code(cls, code: int) -> "Card":
+        """Return the card for an integer code (``0 <= code < 52``)."""
+        if not 0 <= code < NUM_CODES:
+            raise ValueError(f'The provided card code "{code}" does not exist.')
+        return cls._by_code[code]
 
     @property
     def suit(self) -> str:
@@ -49,9 +81,26 @@ class Card:
     def rank(self) -> str:
         return self._rank
 
+    @property
+    def code(self) -> int:
+        return self._code
+
+    @property
+    def rank_index(self) -> int:
+        return self._code % len(RANKS)
+
     @property
     def value(self) -> Union[int, Tuple[int, int]]:
-        return VALUE.get(self._rank)
+        return self._value
+
+    @property
+    def hard_value(self) -> int:
+        """Value with an ace counted as 1."""
+        return self._hard_value
+
+    @property
+    def is_ace(self) -> bool:
+        return self._is_ace
 
     def __str__(self) -> str:
         return f"{self._rank} of {self._suit}"
@@ -62,4 +111,20 @@ class Card:
     def __eq__(self, other) -> bool:
         if not isinstance(other, Card):
             return False
-        return self._suit == other._suit and self._rank == other._rank
+        return self._code == other._code
+
+    def __hash__(self) -> int:
+        return self._code
+
+    def __reduce__(self):
+        return Card.from_code, (self._code,)
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo) -> "Card":
+        return self
+
+
+Card._by_code = tuple(Card._build(suit, rank) for suit in SUITS for rank in RANKS)
+Card._by_name = {(card.suit, card.rank): card for card in Card._by_code}
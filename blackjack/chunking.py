@@ -0,0 +1,100 @@
+"""
+chunking.py
+
+Chunked work shared by the Monte Carlo runners (``simulation``, ``sweep``).
+
+A run is split into chunks of a fixed size, each seeded from its own child
+of the run's ``SeedSequence``. ``chunk_sizes`` plans a fixed run.
+``run_adaptive`` merges chunks in order until a confidence interval is as
+narrow as requested and reports a ``Progress`` after every chunk.
+"""
+
+import math
+from collections import deque
+from concurrent.futures import Executor
+from statistics import NormalDist
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple
+
+
+def chunk_sizes(total: int, chunk: int) -> list[int]:
+    """Sizes of the chunks of a run of ``total`` units, ``chunk`` per chunk."""
+    full, rest = divmod(total, chunk)
+    return [chunk] * full + ([rest] if rest else [])
+
+
+class Progress(NamedTuple):
+    """
+    State of an adaptive run after a chunk.
+
+    ``done`` counts rounds (shoes for a sweep). ``eta`` is the estimated time
+    to the target in seconds, from the current variance and rate; NaN until
+    the variance is known.
+    """
+
+    done: int
+    half_width: float
+    target: float
+    elapsed: float
+    eta: float
+
+
+def z_score(confidence: float) -> float:
+    """Half-width of a two-sided normal ``confidence`` interval, in standard errors."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def _eta(done: int, half_width: float, target: float, elapsed: float) -> float:
+    # The half-width shrinks with the square root of the amount played.
+    if not done or not half_width > 0:
+        return math.nan
+    needed = done * (half_width / target) ** 2
+    return max(needed - done, 0.0) * elapsed / done
+
+
+def run_adaptive(
+    tasks: Iterator,
+    run: Callable,
+    report,
+    measure: Callable,
+    target: float,
+    min_done: int,
+    executor: Executor | None,
+    depth: int,
+    progress: Callable[[Progress], None] | None,
+) -> None:
+    """
+    Merge the chunks of ``tasks`` into ``report`` in order until ``measure``
+    (returning done and half-width) reaches ``target`` or the tasks run out.
+    ``depth`` chunks are kept in flight on ``executor``.
+    """
+    started = perf_counter()
+    pending = deque()
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < depth:
+            task = next(tasks, None)
+            if task is None:
+                exhausted = True
+            else:
+                pending.append(executor.submit(run, task) if executor is not None else task)
+        if not pending:
+            break
+
+        chunk = pending.popleft()
+        report.merge(chunk.result() if executor is not None else run(chunk))
+        done, half_width = measure(report)
+        elapsed = perf_counter() - started
+        reached = done >= min_done and half_width <= target
+        if progress is not None:
+            eta = 0.0 if reached else _eta(done, half_width, target, elapsed)
+            progress(Progress(done, half_width, target, elapsed, eta))
+        if reached:
+            break
+
+    for future in pending:
+        future.cancel()
+
+    return None
@@ -0,0 +1,192 @@
+"""
+concurrency.py
+
+Thread-safety support for running the engine on several threads, notably on
+the free-threaded (no-GIL) build of Python.
+
+The engine's objects are not synchronized: a ``Deck``, ``DiscardTray``,
+``Hand``, ``Game`` or ``CardCounter`` must only be used by one thread at a
+time. The threaded runner (``blackjack.simulation.simulate_threaded``) gives
+every chunk its own table, so nothing mutable is shared. Objects that are
+safe to share between threads as they are:
+
+* ``Card`` flyweights, ``Rules`` and the module-level lookup tables, which
+  are immutable;
+* ``StrategyTable`` charts (read-only arrays) and stateless strategy
+  functions such as ``mimic_dealer``;
+* the ``blackjack`` logger, since ``logging`` handlers lock internally.
+
+``TranspositionTable`` (and therefore ``DealerProbabilities`` and
+``PlayerAnalyzer``) is not safe to share; give every thread its own.
+
+When a shoe or a tray has to be shared, e.g. several threads dealing from
+one shoe, use ``SynchronizedDeck`` and ``SynchronizedDiscardTray``: every
+public operation takes the object's reentrant lock, so each call is atomic.
+Sequences of calls still need ``with deck.lock:`` to be atomic as a whole.
+"""
+
+import sys
+import threading
+
+import numpy as np
+
+from .card import Card
+from .deck import Deck, RandomSource
+from .discard_tray import DiscardTray
+from .shuffles import ShuffleProcedure
+
+
+def gil_enabled() -> bool:
+    """True unless running on a free-threaded build with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class SynchronizedDeck(Deck):
+    """
+    A ``Deck`` whose operations are serialized by a reentrant lock.
+
+    ``composition`` and ``suit_composition`` return read-only copies taken
+    under the lock instead of ``Deck``'s live read-only views, so they are
+    consistent snapshots that do not change while other threads draw.
+    """
+
+    def __init__(self, deck_size: int = 6, rng: RandomSource = None):
+        self._lock = threading.RLock()
+        super().__init__(deck_size=deck_size, rng=rng)
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    @property
+    def rng_state(self) -> dict:
+        with self._lock:
+            return self._rng.bit_generator.state
+
+    @rng_state.setter
+    def rng_state(self, state: dict) -> None:
+        with self._lock:
+            self._rng.bit_generator.state = state
+
+        return None
+
+    @property
+    def shuffled(self) -> bool:
+        with self._lock:
+            return self._shuffled
+
+    @property
+    def end_game(self) -> bool:
+        with self._lock:
+            return self._end_game
+
+    @property
+    def composition(self) -> np.ndarray:
+        with self._lock:
+            return _read_only(self._rank_counts.copy())
+
+    @property
+    def suit_composition(self) -> np.ndarray:
+        with self._lock:
+            return _read_only(self._suit_counts.copy())
+
+    @property
+    def rank_probabilities(self) -> np.ndarray:
+        with self._lock:
+            return super().rank_probabilities
+
+    @property
+    def penetration(self) -> float:
+        with self._lock:
+            return super().penetration
+
+    @property
+    def _deck(self) -> list[Card]:
+        with self._lock:
+            return super()._deck
+
+    def live_codes(self) -> np.ndarray:
+        with self._lock:
+            return super().live_codes()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return super().__len__()
+
+    def add_counter(self, counter) -> None:
+        with self._lock:
+            return super().add_counter(counter)
+
+    def remove_counter(self, counter) -> None:
+        with self._lock:
+            return super().remove_counter(counter)
+
+    def draw(self) -> Card:
+        with self._lock:
+            return super().draw()
+
+    def collect_discard_pile(self, discard: list[Card]) -> None:
+        with self._lock:
+            return super().collect_discard_pile(discard)
+
+    def restore_order(self, rng: RandomSource = None) -> None:
+        with self._lock:
+            return super().restore_order(rng)
+
+    def shuffle(self, procedure: ShuffleProcedure | None = None) -> str:
+        with self._lock:
+            return super().shuffle(procedure)
+
+    def set_cutcard(self, pos: int) -> str:
+        with self._lock:
+            return super().set_cutcard(pos)
+
+    def set_end_of_shoe(self, remaining_min: int = 50, remaining_max: int = 80) -> None:
+        with self._lock:
+            return super().set_end_of_shoe(remaining_min, remaining_max)
+
+    def jump(self) -> None:
+        with self._lock:
+            return super().jump()
+
+    def __repr__(self) -> str:
+        with self._lock:
+            return f"Synchronized{super().__repr__()}"
+
+
+class SynchronizedDiscardTray(DiscardTray):
+    """A ``DiscardTray`` whose operations are serialized by a reentrant lock."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        super().__init__()
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    def add_counter(self, counter) -> None:
+        with self._lock:
+            return super().add_counter(counter)
+
+    def remove_counter(self, counter) -> None:
+        with self._lock:
+            return super().remove_counter(counter)
+
+    def discard(self, cards: list[Card] | Card):
+        with self._lock:
+            return super().discard(cards)
+
+    def reset(self):
+        with self._lock:
+            return super().reset()
+
+    def __len__(self):
+        with self._lock:
+            return super().__len__()
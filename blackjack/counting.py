@@ -0,0 +1,188 @@
+"""
+counting.py
+
+This module provides card counting for the shoe. A ``CardCounter`` tracks the
+running count of several counting systems at once and updates in constant time
+per card: every card code maps to a precomputed row of weights, one per system,
+that is added to the running counts.
+
+A counter is attached either to a ``Deck`` (cards are counted as they are
+dealt) or to a ``DiscardTray`` (cards are counted when they are collected,
+e.g. to count the dealer's hole card only once it is exposed). It resets when
+its source is reshuffled: on ``Deck.collect_discard_pile`` for a deck and on
+``DiscardTray.reset`` for a tray. The true count always uses the cards left in
+the deck.
+"""
+
+import numpy as np
+
+from .card import Card, RANKS, NUM_CODES
+from .deck import Deck
+from .discard_tray import DiscardTray
+
+
+class CountingSystem:
+    """
+    A card counting system given by one weight per rank.
+
+    Args:
+        name (str): Name of the system.
+        weights (dict[str, int]): Weight of every rank in ``RANKS``.
+    """
+
+    __slots__ = ("_name", "_weights")
+
+    def __init__(self, name: str, weights: dict[str, int]):
+        if set(weights) != set(RANKS):
+            raise ValueError(f'Counting system "{name}" needs a weight for every rank')
+
+        self._name = name
+        self._weights = tuple(weights[rank] for rank in RANKS)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def weights(self) -> tuple[int, ...]:
+        """Weights in ``RANKS`` order."""
+        return self._weights
+
+    @property
+    def deck_sum(self) -> int:
+        """Count of a full 52-card deck, zero for balanced systems."""
+        return 4 * sum(self._weights)
+
+    @property
+    def balanced(self) -> bool:
+        return self.deck_sum == 0
+
+    def initial_running_count(self, decks: int) -> int:
+        """
+        Running count at the start of a shoe.
+
+        Balanced systems start at zero. Unbalanced systems start at
+        ``-deck_sum * (decks - 1)`` so that the key count is the same for
+        every shoe size (e.g. 4 - 4 * decks for KO).
+        """
+        return -self.deck_sum * (decks - 1)
+
+    def __repr__(self) -> str:
+        return f"CountingSystem(name={self._name}, balanced={self.balanced})"
+
+
+def _system(name: str, *weights: int) -> CountingSystem:
+    # Ranks 2-9, the four ten-valued ranks and the ace.
+    *low, ten, ace = weights
+    return CountingSystem(name, dict(zip(RANKS, [*low, ten, ten, ten, ten, ace])))
+
+
+HI_LO = _system("Hi-Lo", 1, 1, 1, 1, 1, 0, 0, 0, -1, -1)
+KO = _system("KO", 1, 1, 1, 1, 1, 1, 0, 0, -1, -1)
+HI_OPT_II = _system("Hi-Opt II", 1, 1, 2, 2, 1, 1, 0, 0, -2, 0)
+OMEGA_II = _system("Omega II", 1, 1, 2, 2, 2, 1, 0, -1, -2, 0)
+ZEN = _system("Zen", 1, 1, 2, 2, 2, 1, 0, 0, -2, -1)
+
+SYSTEMS = {system.name: system for system in (HI_LO, KO, HI_OPT_II, OMEGA_II, ZEN)}
+
+
+class CardCounter:
+    """
+    Running and true counts of several counting systems.
+
+    Args:
+        deck (Deck): The shoe; its remaining cards give the true count divisor.
+        systems (tuple[str | CountingSystem, ...]): Systems to track, all
+            built-in systems if omitted.
+        tray (DiscardTray | None): Count cards as they reach this tray instead
+            of when they are drawn from ``deck``.
+    """
+
+    def __init__(
+        self,
+        deck: Deck,
+        systems: tuple[str | CountingSystem, ...] = tuple(SYSTEMS),
+        tray: DiscardTray | None = None,
+    ):
+        self._systems = tuple(
+            SYSTEMS[system] if isinstance(system, str) else system for system in systems
+        )
+        if not self._systems:
+            raise ValueError("At least one counting system is required")
+
+        self._deck = deck
+        self._source = tray if tray is not None else deck
+        self._index = {system.name: i for i, system in enumerate(self._systems)}
+
+        # Row per card code, column per system.
+        self._weights = np.array(
+            [
+                [system.weights[Card.from_code(code).rank_index] for system in self._systems]
+                for code in range(NUM_CODES)
+            ],
+            dtype=np.int64,
+        )
+        self._initial = np.array(
+            [system.initial_running_count(deck.deck_size) for system in self._systems],
+            dtype=np.int64,
+        )
+        self._running = self._initial.copy()
+
+        self._source.add_counter(self)
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def systems(self) -> tuple[str, ...]:
+        return tuple(system.name for system in self._systems)
+
+    @property
+    def running(self) -> np.ndarray:
+        """Running counts in ``systems`` order."""
+        return self._running.copy()
+
+    @property
+    def decks_remaining(self) -> float:
+        # Never divide by less than half a deck at the very end of a shoe.
+        return max(len(self._deck) / NUM_CODES, 0.5)
+
+    @property
+    def true(self) -> np.ndarray:
+        """True counts (running count per remaining deck) in ``systems`` order."""
+        return self._running / self.decks_remaining
+
+    # ----------------------------------------------
+    # functions
+    # ----------------------------------------------
+    def running_count(self, system: str = "Hi-Lo") -> int:
+        return int(self._running[self._index[system]])
+
+    def true_count(self, system: str = "Hi-Lo") -> float:
+        return float(self._running[self._index[system]]) / self.decks_remaining
+
+    def add(self, code: int) -> None:
+        self._running += self._weights[code]
+
+        return None
+
+    def add_many(self, codes) -> None:
+        self._running += self._weights[np.asarray(codes, dtype=np.intp)].sum(axis=0)
+
+        return None
+
+    def reset(self) -> None:
+        self._running[:] = self._initial
+
+        return None
+
+    def detach(self) -> None:
+        self._source.remove_counter(self)
+
+        return None
+
+    def __repr__(self) -> str:
+        counts = ", ".join(
+            f"{name}={count}" for name, count in zip(self.systems, self._running)
+        )
+        return f"CardCounter({counts})"
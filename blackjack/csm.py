@@ -0,0 +1,128 @@
+"""
+csm.py
+
+Continuous shuffling machine (CSM) shoe.
+
+A CSM takes the discards back after every round and drops each card at a
+random position among the cards it holds; the dealer always takes the front
+card. Since every insertion position is equally likely, the order of the
+cards in the machine is uniformly random at all times, so taking the front
+card is the same as taking a uniformly random card of the pool.
+
+``ContinuousShuffler`` models the machine as an indexed pool sampler on the
+``Deck`` buffer: the live cards are the first ``len(self)`` slots; a draw
+picks a random slot, returns its card and moves the last card into the gap,
+and reinserted cards are appended. Both are O(1) per card, instead of the
+O(n) inserts into a list.
+
+The slot picks come from a buffer of uniform variates generated in batches.
+The buffer is dropped whenever ``rng_state`` is exported or restored, so the
+draws after either point depend on the generator state alone and replay
+exactly.
+
+The machine never reaches an end of shoe. ``collect_discard_pile`` returns
+cards to the pool without clearing the shuffled state; counters are reset,
+because once all cards of a round are back the machine holds the full set
+again.
+"""
+
+import numpy as np
+
+from .card import Card
+from .deck import Deck, RandomSource, _CARDS, _RANK_OF, _SUIT_OF
+from .events import EventType
+from .logger import logger
+from .shuffles import ShuffleProcedure
+
+# Uniform variates generated per refill of the draw buffer.
+_BATCH = 1024
+
+
+class ContinuousShuffler(Deck):
+    """
+    A shoe fed by a continuous shuffling machine.
+
+    Args:
+        deck_size (int): Number of 52-card decks in the machine.
+        rng (RandomSource): Generator or seed that picks the drawn cards.
+    """
+
+    def __init__(self, deck_size: int = 6, rng: RandomSource = None):
+        super().__init__(deck_size=deck_size, rng=rng)
+        self._shuffled = True
+        self._uniforms = np.empty(0)
+        self._next_uniform = 0
+
+    @property
+    def rng_state(self) -> dict:
+        self._drop_uniforms()
+        return self._rng.bit_generator.state
+
+    @rng_state.setter
+    def rng_state(self, state: dict) -> None:
+        self._rng.bit_generator.state = state
+        self._drop_uniforms()
+
+        return None
+
+    # ---------------------------------------------
+    # Core logic
+    # ---------------------------------------------
+    def _drop_uniforms(self) -> None:
+        # Unused variates were drawn from the generator before the state the
+        # caller sees; the next draw generates a new batch from that state.
+        self._next_uniform = len(self._uniforms)
+
+        return None
+
+    def _uniform(self) -> float:
+        if self._next_uniform == len(self._uniforms):
+            self._uniforms = self._rng.random(_BATCH)
+            self._next_uniform = 0
+        u = self._uniforms[self._next_uniform]
+        self._next_uniform += 1
+        return u
+
+    def draw(self) -> Card:
+        if not self._count:
+            logger.error("Cannot draw from an empty shuffling machine!")
+            raise RuntimeError("Deck is empty")
+
+        buffer = self._buffer
+        index = int(self._uniform() * self._count)
+        self._count -= 1
+        code = buffer[index]
+        buffer[index] = buffer[self._count]
+        self._rank_counts[_RANK_OF[code]] -= 1
+        self._suit_counts[_SUIT_OF[code]] -= 1
+
+        if self._counters:
+            for counter in self._counters:
+                counter.add(code)
+        if self._bus is not None:
+            self._bus.emit(EventType.DRAW, int(code))
+
+        return _CARDS[code]
+
+    def _reset(self) -> None:
+        # The machine stays shuffled and has no end-of-shoe marker.
+        self._cut_position = None
+        self._end_of_shoe_threshold = None
+        self._end_game = False
+
+        return None
+
+    def shuffle(self, procedure: ShuffleProcedure | None = None) -> str:
+        # Every draw is already a uniformly random card of the pool.
+        self._linearize()
+        self._shuffled = True
+        return "Deck shuffled."
+
+    def set_cutcard(self, pos: int) -> str:
+        raise ValueError("A continuous shuffling machine has no cut card")
+
+    def set_end_of_shoe(self, remaining_min: int = 50, remaining_max: int = 80) -> None:
+        raise ValueError("A continuous shuffling machine has no end of shoe")
+
+    def __repr__(self) -> str:
+        return f"ContinuousShuffler(Number_of_Cards={len(self)})"
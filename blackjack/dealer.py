@@ -1,2 +1,49 @@
+from typing import Callable
+
+from .card import Card
+from .hand import Hand
+
+
 class Dealer:
-    pass
+    """
+    The dealer's hand and drawing rules.
+
+    The dealer stands on hard 17 or more and on soft 18 or more. Soft 17 is hit
+    when ``hit_soft_17`` is set (H17) and stood on otherwise (S17).
+    """
+
+    def __init__(self, hit_soft_17: bool = False):
+        self._hit_soft_17 = hit_soft_17
+        self._hand = Hand(role="dealer")
+
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @property
+    def hit_soft_17(self) -> bool:
+        return self._hit_soft_17
+
+    @property
+    def upcard(self) -> Card:
+        return self._hand.hand[0]
+
+    def must_hit(self) -> bool:
+        score = self._hand.score
+        return score < 17 or (
+            self._hit_soft_17 and score == 17 and self._hand.soft
+        )
+
+    def play(self, draw: Callable[[], Card]) -> Hand:
+        self._hand.reveal()
+        while self.must_hit():
+            self._hand.add(draw())
+
+        return self._hand
+
+    def discard(self) -> list[Card]:
+        # The hand is emptied in place and hides its hole card again.
+        return self._hand.discard()
+
+    def __repr__(self) -> str:
+        return f"Dealer(hit_soft_17={self._hit_soft_17}, hand={self._hand.hand})"
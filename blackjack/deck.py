@@ -1,36 +1,102 @@
-from .card import Card, SUITS, RANKS
+from operator import attrgetter
+
+import numpy as np
+
+from .card import Card, NUM_CODES, RANKS, SUITS
 from .discard_tray import DiscardTray
-from random import shuffle, randint
+from .events import EventBus, EventType
 from .logger import logger
+from .shuffles import ShuffleProcedure
+
+RandomSource = np.random.Generator | np.random.SeedSequence | int | None
+
+# Code -> shared Card flyweight, indexed directly in the draw path.
+_CARDS: tuple[Card, ...] = tuple(Card.from_code(code) for code in range(NUM_CODES))
+_RANK_OF: tuple[int, ...] = tuple(code % len(RANKS) for code in range(NUM_CODES))
+_SUIT_OF: tuple[int, ...] = tuple(code // len(RANKS) for code in range(NUM_CODES))
+_CODE = attrgetter("_code")
 
 
 class Deck:
-    def __init__(self, deck_size: int = 6):
+    """
+    Multi-deck shoe backed by a ring buffer of card codes.
+
+    The shoe keeps its cards as a ``uint8`` NumPy array with one slot per
+    card of the full shoe. The live cards are the ``len(self)`` slots
+    starting at ``_head`` (wrapping around the end of the buffer), so
+    drawing only advances the head, cutting a full shoe only moves the
+    head, and collecting the discard pile writes the codes into the free
+    slots behind the last card. The buffer is never reallocated.
+
+    The codes are the ``Card.code`` values; cards only become ``Card``
+    objects again when they leave the shoe.
+
+    Shuffling and the end-of-shoe marker use the deck's own NumPy
+    ``Generator``. ``rng`` accepts a generator, a seed or a ``SeedSequence``;
+    a deck built from the same seed always produces the same shoes, and the
+    generator state can be exported and restored with ``rng_state``.
+
+    The deck also keeps the number of remaining cards per rank and per suit
+    up to date on every draw and collection, so composition queries
+    (``composition``, ``rank_probabilities``, ``penetration``) are lookups.
+    """
+
+    def __init__(self, deck_size: int = 6, rng: RandomSource = None):
         self._deck_size = deck_size
-        self._deck = self._generate_deck()
+        self._rng = np.random.default_rng(rng)
+        self._capacity = deck_size * NUM_CODES
+        self._buffer = np.empty(self._capacity, dtype=np.uint8)
+        self._head = 0
+        self._count = 0
+        self._rank_counts = np.zeros(len(RANKS), dtype=np.int32)
+        self._suit_counts = np.zeros(len(SUITS), dtype=np.int32)
+        self._rank_view = self._rank_counts.view()
+        self._rank_view.flags.writeable = False
+        self._suit_view = self._suit_counts.view()
+        self._suit_view.flags.writeable = False
+        self._generate_deck()
 
         self._shuffled = False
         self._cut_position = None
         self._end_of_shoe_threshold = None
         self._end_game = False
 
-        self._initial_cards = len(self._deck)
+        self._initial_cards = len(self)
+
+        # Set by an EventBus with subscribers, see blackjack.events.
+        self._bus: EventBus | None = None
+
+        # Card counters fed by draw, see blackjack.counting.
+        self._counters: list = []
 
     # ---------------------------------------------
     # Deck generation
     # ---------------------------------------------
-    def _generate_deck(self) -> list[Card]:
-        return [
-            Card(suit, rank)
-            for _ in range(self._deck_size)
-            for suit in SUITS
-            for rank in RANKS
-        ]
+    def _generate_deck(self) -> None:
+        self._buffer[:] = np.tile(
+            np.arange(NUM_CODES, dtype=np.uint8), self._deck_size
+        )
+        self._head = 0
+        self._count = self._capacity
+        self._rank_counts[:] = self._deck_size * len(SUITS)
+        self._suit_counts[:] = self._deck_size * len(RANKS)
+
+        return None
 
     # ---------------------------------------------
     # Properties
     # ---------------------------------------------
 
+    @property
+    def deck_size(self) -> int:
+        """Number of 52-card decks in the shoe."""
+        return self._deck_size
+
+    @property
+    def capacity(self) -> int:
+        """Number of cards of the full shoe."""
+        return self._capacity
+
     @property
     def shuffled(self) -> bool:
         return self._shuffled
@@ -39,29 +105,81 @@ class Deck:
     def end_game(self) -> bool:
         return self._end_game
 
+    @property
+    def rng(self) -> np.random.Generator:
+        return self._rng
+
+    @property
+    def rng_state(self) -> dict:
+        return self._rng.bit_generator.state
+
+    @rng_state.setter
+    def rng_state(self, state: dict) -> None:
+        self._rng.bit_generator.state = state
+
+        return None
+
+    @property
+    def composition(self) -> np.ndarray:
+        """Read-only view of the remaining cards per rank, in ``RANKS`` order."""
+        return self._rank_view
+
+    @property
+    def suit_composition(self) -> np.ndarray:
+        """Read-only view of the remaining cards per suit, in ``SUITS`` order."""
+        return self._suit_view
+
+    @property
+    def rank_probabilities(self) -> np.ndarray:
+        """Probability of every rank being the next card."""
+        if not self._count:
+            return np.zeros(len(RANKS))
+        return self._rank_counts / self._count
+
+    @property
+    def penetration(self) -> float:
+        """Share of the full shoe that has been dealt."""
+        return 1 - self._count / self._capacity
+
+    def live_codes(self) -> np.ndarray:
+        """Codes of the remaining cards in draw order, as a new array."""
+        return self._live_codes()
+
+    @property
+    def _deck(self) -> list[Card]:
+        """The live cards in draw order (materialized, for inspection only)."""
+        return [_CARDS[code] for code in self._live_codes()]
+
     # ---------------------------------------------
     # Core logic
     # ---------------------------------------------
     def draw(self) -> Card:
-        if not self._deck:
+        if not self._count:
             logger.error("Cannot draw from empty deck!")
             raise RuntimeError("Deck is empty")
 
-        if not self._shuffled:
-            logger.warning("Drawing from unshuffled deck!")
+        code = self._buffer[self._head]
+        self._head += 1
+        if self._head == self._capacity:
+            self._head = 0
+        self._count -= 1
+        self._rank_counts[_RANK_OF[code]] -= 1
+        self._suit_counts[_SUIT_OF[code]] -= 1
 
-        card = self._deck.pop(0)
+        if self._counters:
+            for counter in self._counters:
+                counter.add(code)
+        if self._bus is not None:
+            self._bus.emit(EventType.DRAW, int(code))
 
         # Check end of shoe
         if self._end_of_shoe_threshold is not None:
-            if len(self) <= self._end_of_shoe_threshold:
-                if not self._end_game:
-                    logger.warning(
-                        "End of shoe reached — reshuffle required after round."
-                    )
+            if self._count <= self._end_of_shoe_threshold and not self._end_game:
                 self._end_game = True
+                if self._bus is not None:
+                    self._bus.emit(EventType.END_OF_SHOE, self._count)
 
-        return card
+        return _CARDS[code]
 
     def _reset(self) -> None:
         self._shuffled = False
@@ -71,20 +189,66 @@ class Deck:
 
         return None
 
+    def restore_order(self, rng: RandomSource = None) -> None:
+        """
+        Put the full shoe back in new-deck order, as if freshly built, with a
+        new generator from ``rng``; e.g. to deal the same shoes to several
+        tables. Every card must be back in the shoe.
+        """
+        if self._count != self._capacity:
+            raise ValueError("Only a full shoe can be put back in new-deck order")
+
+        self._generate_deck()
+        self._rng = np.random.default_rng(rng)
+        self._reset()
+
+        return None
+
     def collect_discard_pile(self, discard: list[Card]) -> None:
-        self._deck.extend(discard)
+        codes = np.fromiter(map(_CODE, discard), dtype=np.uint8, count=len(discard))
+        if self._count + len(codes) > self._capacity:
+            logger.error("Discard pile does not fit into the shoe.")
+            raise ValueError("Discard pile exceeds shoe capacity.")
+
+        self._write(self._count, codes)
+        self._count += len(codes)
+        self._rank_counts += np.bincount(codes % len(RANKS), minlength=len(RANKS))
+        self._suit_counts += np.bincount(codes // len(RANKS), minlength=len(SUITS))
 
         self._reset()
+        for counter in self._counters:
+            counter.reset()
+
+        return None
+
+    def add_counter(self, counter) -> None:
+        """Feed every drawn card to ``counter`` (see ``blackjack.counting``)."""
+        self._counters.append(counter)
+
+        return None
+
+    def remove_counter(self, counter) -> None:
+        self._counters.remove(counter)
 
         return None
 
     # ---------------------------------------------
     # Shuffle mechanics
     # ---------------------------------------------
-    def shuffle(self) -> str:
-        shuffle(self._deck)
+    def shuffle(self, procedure: ShuffleProcedure | None = None) -> str:
+        """
+        Shuffle the remaining cards, uniformly by default or with a physical
+        ``procedure`` that starts from the current order of the cards.
+        """
+        self._linearize()
+        live = self._buffer[: self._count]
+        if procedure is None:
+            self._rng.shuffle(live)
+        else:
+            live[:] = procedure(live[None, :], self._rng)[0]
         self._shuffled = True
-        logger.debug("Deck shuffled.")
+        if self._bus is not None:
+            self._bus.emit(EventType.SHUFFLE, procedure.name if procedure is not None else None)
         return "Deck shuffled."
 
     def set_cutcard(self, pos: int) -> str:
@@ -93,19 +257,77 @@ class Deck:
 
         # Realistic casino cut:
         # slice top -> bottom
-        top = self._deck[:pos]
-        bottom = self._deck[pos:]
-        self._deck = bottom + top
+        free = self._capacity - self._count
+        if free == 0:
+            # The tail of a full ring is its head, so rotating is free.
+            self._head = (self._head + pos) % self._capacity
+        elif pos <= free:
+            self._write(self._count, self._read(0, pos))
+            self._head = (self._head + pos) % self._capacity
+        else:
+            self._linearize()
+            live = self._buffer[: self._count]
+            live[:] = np.roll(live, -pos)
 
         self._cut_position = pos
-        logger.debug(f"Deck cut at position {pos}.")
+        if self._bus is not None:
+            self._bus.emit(EventType.CUT, pos)
         return "Deck cut."
 
     def set_end_of_shoe(self, remaining_min: int = 50, remaining_max: int = 80) -> None:
-        self._end_of_shoe_threshold = randint(remaining_min, remaining_max)
-        logger.debug(
-            f"End-of-shoe marker set at last {self._end_of_shoe_threshold} cards."
+        self._end_of_shoe_threshold = int(
+            self._rng.integers(remaining_min, remaining_max, endpoint=True)
         )
+        logger.debug("End-of-shoe marker set at last %d cards.", self._end_of_shoe_threshold)
+        return None
+
+    def jump(self) -> None:
+        """
+        Advance the generator as if a huge number of draws had been made.
+
+        Jumping gives a stream that does not overlap with the previous one,
+        e.g. to derive independent shoes from one seeded deck. Only bit
+        generators with ``jumped`` (PCG64, Philox, MT19937) support this.
+        """
+        bit_generator = self._rng.bit_generator
+        if not hasattr(bit_generator, "jumped"):
+            raise TypeError(
+                f"{type(bit_generator).__name__} does not support jumping ahead"
+            )
+        self._rng = np.random.Generator(bit_generator.jumped())
+
+        return None
+
+    # ---------------------------------------------
+    # Ring buffer helpers
+    # ---------------------------------------------
+    def _ring_slices(self, start: int, count: int) -> tuple[slice, slice]:
+        """Buffer slices covering ``count`` slots from live offset ``start``."""
+        begin = (self._head + start) % self._capacity
+        first = min(count, self._capacity - begin)
+        return slice(begin, begin + first), slice(0, count - first)
+
+    def _read(self, start: int, count: int) -> np.ndarray:
+        first, second = self._ring_slices(start, count)
+        return np.concatenate((self._buffer[first], self._buffer[second]))
+
+    def _write(self, start: int, codes: np.ndarray) -> None:
+        first, second = self._ring_slices(start, len(codes))
+        split = first.stop - first.start
+        self._buffer[first] = codes[:split]
+        self._buffer[second] = codes[split:]
+
+        return None
+
+    def _live_codes(self) -> np.ndarray:
+        return self._read(0, self._count)
+
+    def _linearize(self) -> None:
+        """Move the live cards to the front of the buffer."""
+        if self._head:
+            self._buffer[: self._count] = self._live_codes()
+            self._head = 0
+
         return None
 
     # ----------------------------------------
@@ -113,7 +335,7 @@ class Deck:
     # -----------------------------------------
 
     def __len__(self) -> int:
-        return len(self._deck)
+        return self._count
 
     def __repr__(self) -> str:
         shoe_size = (
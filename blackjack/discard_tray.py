@@ -1,4 +1,5 @@
 from .card import Card
+from .events import EventBus, EventType
 from typing import Union
 
 
@@ -6,11 +7,26 @@ class DiscardTray:
     def __init__(self):
         self._discard_deck: list[Card] = []
 
+        # Card counters fed by discard, see blackjack.counting.
+        self._counters: list = []
+        # Set by an EventBus with subscribers, see blackjack.events.
+        self._bus: EventBus | None = None
+
     def discard(self, cards: list[Card] | Card):
         if isinstance(cards, list):
             self._discard_deck.extend(cards)
+            if self._counters:
+                codes = [card.code for card in cards]
+                for counter in self._counters:
+                    counter.add_many(codes)
+            if self._bus is not None:
+                self._bus.emit(EventType.DISCARD, tuple(card.code for card in cards))
         elif isinstance(cards, Card):
             self._discard_deck.append(cards)
+            for counter in self._counters:
+                counter.add(cards.code)
+            if self._bus is not None:
+                self._bus.emit(EventType.DISCARD, (cards.code,))
         else:
             raise ValueError(
                 f"Get type {type(cards)}, but expected is a list of Cards or a Card object"
@@ -18,9 +34,23 @@ class DiscardTray:
 
         return None
 
+    def add_counter(self, counter) -> None:
+        """Feed every discarded card to ``counter`` (see ``blackjack.counting``)."""
+        self._counters.append(counter)
+
+        return None
+
+    def remove_counter(self, counter) -> None:
+        self._counters.remove(counter)
+
+        return None
+
     def reset(self):
-        cards = self._discard_deck.copy()
-        self._discard_deck.clear()
+        # Hand the list over instead of copying it; the tray starts a new one.
+        cards = self._discard_deck
+        self._discard_deck = []
+        for counter in self._counters:
+            counter.reset()
 
         return cards
 
@@ -0,0 +1,260 @@
+"""
+events.py
+
+Typed events of the shoe, the discard tray and the game, delivered in batches.
+
+An ``EventBus`` is attached to the objects that emit events (``Deck``,
+``DiscardTray``, ``Game``); ``Game.events`` returns a bus attached to the
+game, its shoe and its tray. Every source holds a ``_bus`` attribute that is
+``None`` unless the bus has subscribers, so the hot paths pay a single
+attribute check when nobody listens:
+
+    if self._bus is not None:
+        self._bus.emit(EventType.DRAW, int(code))
+
+Emitted events are buffered and handed to the subscribers as a list once
+``batch_size`` events are pending, and on ``flush``. Read a subscriber's
+results after flushing the bus.
+
+A subscriber is any callable taking a ``list[Event]``. It is called only with
+the event types it subscribed to, given as ``types`` to ``subscribe`` or as a
+``types`` attribute of the subscriber. ``EventCounter`` and ``PhaseTimer``
+are built-in subscribers.
+
+Payloads:
+
+* ``DRAW``: card code;
+* ``DISCARD``: tuple of card codes;
+* ``SHUFFLE``: name of the ``ShuffleProcedure``, ``None`` for a uniform shuffle;
+* ``CUT``: cut position;
+* ``END_OF_SHOE``: cards left when the marker was passed;
+* ``RESHUFFLE``: cards collected from the tray;
+* ``SPLIT``: seat;
+* ``ROUND_RESOLVED``: the ``RoundResult``;
+* ``PHASE``: ``(Phase, seconds)`` of every phase of a round. The player phase
+  includes the time a caller of ``Game.round_steps`` takes to decide.
+"""
+
+from enum import IntEnum
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+
+from .card import RANKS
+
+
+class EventType(IntEnum):
+    DRAW = 0
+    DISCARD = 1
+    SHUFFLE = 2
+    CUT = 3
+    END_OF_SHOE = 4
+    RESHUFFLE = 5
+    SPLIT = 6
+    ROUND_RESOLVED = 7
+    PHASE = 8
+
+
+class Phase(IntEnum):
+    DEAL = 0
+    PLAYERS = 1
+    DEALER = 2
+    SETTLEMENT = 3
+
+
+class Event(NamedTuple):
+    type: EventType
+    payload: object
+
+
+Subscriber = Callable[[list[Event]], None]
+
+
+class EventBus:
+    """
+    Buffers events and delivers them to subscribers in batches.
+
+    Args:
+        batch_size (int): Pending events that trigger a delivery.
+    """
+
+    def __init__(self, batch_size: int = 1024):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+
+        self._batch_size = batch_size
+        self._pending: list[Event] = []
+        self._subscribers: list[tuple[Subscriber, frozenset[EventType] | None]] = []
+        self._sources: list = []
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def subscribers(self) -> list[Subscriber]:
+        return [subscriber for subscriber, _ in self._subscribers]
+
+    # -----------------------------------------------
+    # Wiring
+    # -----------------------------------------------
+    def subscribe(
+        self, subscriber: Subscriber, types: Iterable[EventType] | None = None
+    ) -> Subscriber:
+        """Deliver events of ``types`` (all if omitted) to ``subscriber``; returns it."""
+        if types is None:
+            types = getattr(subscriber, "types", None)
+        self._subscribers.append((subscriber, frozenset(types) if types is not None else None))
+        self._install()
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.flush()
+        for index, (candidate, _) in enumerate(self._subscribers):
+            if candidate is subscriber:
+                del self._subscribers[index]
+                break
+        else:
+            raise ValueError(f"{subscriber!r} is not subscribed")
+        self._install()
+
+        return None
+
+    def attach(self, *sources) -> None:
+        """Let ``sources`` emit into this bus while it has subscribers."""
+        for source in sources:
+            if source not in self._sources:
+                self._sources.append(source)
+        self._install()
+
+        return None
+
+    def detach(self, *sources) -> None:
+        for source in sources:
+            self._sources.remove(source)
+            source._bus = None
+
+        return None
+
+    def _install(self) -> None:
+        bus = self if self._subscribers else None
+        for source in self._sources:
+            source._bus = bus
+
+        return None
+
+    # -----------------------------------------------
+    # Delivery
+    # -----------------------------------------------
+    def emit(self, type: EventType, payload: object = None) -> None:
+        self._pending.append(Event(type, payload))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+        return None
+
+    def flush(self) -> None:
+        """Deliver all pending events."""
+        if not self._pending:
+            return None
+
+        events, self._pending = self._pending, []
+        for subscriber, types in self._subscribers:
+            if types is None:
+                subscriber(events)
+            else:
+                selected = [event for event in events if event.type in types]
+                if selected:
+                    subscriber(selected)
+
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"EventBus(subscribers={len(self._subscribers)}, sources={len(self._sources)}, "
+            f"pending={len(self._pending)})"
+        )
+
+
+# ---------------------------------------------
+# Built-in subscribers
+# ---------------------------------------------
+class EventCounter:
+    """Counts events per type and the cards drawn per rank."""
+
+    types = None
+
+    def __init__(self):
+        self._counts = np.zeros(len(EventType), dtype=np.int64)
+        self._ranks = np.zeros(len(RANKS), dtype=np.int64)
+
+    def __call__(self, events: list[Event]) -> None:
+        counts = self._counts
+        for event in events:
+            counts[event.type] += 1
+        drawn = [event.payload for event in events if event.type is EventType.DRAW]
+        if drawn:
+            self._ranks += np.bincount(np.array(drawn) % len(RANKS), minlength=len(RANKS))
+
+        return None
+
+    @property
+    def counts(self) -> dict[EventType, int]:
+        return {event_type: int(self._counts[event_type]) for event_type in EventType}
+
+    @property
+    def drawn_ranks(self) -> np.ndarray:
+        """Cards drawn per rank, in ``RANKS`` order."""
+        return self._ranks.copy()
+
+    def __getitem__(self, event_type: EventType) -> int:
+        return int(self._counts[event_type])
+
+    def __repr__(self) -> str:
+        return f"EventCounter(events={int(self._counts.sum())})"
+
+
+class PhaseTimer:
+    """Total and mean wall-clock time of every ``Phase`` of a round."""
+
+    types = (EventType.PHASE,)
+
+    def __init__(self):
+        self._seconds = [0.0] * len(Phase)
+        self._counts = [0] * len(Phase)
+
+    def __call__(self, events: list[Event]) -> None:
+        for event in events:
+            phase, seconds = event.payload
+            self._seconds[phase] += seconds
+            self._counts[phase] += 1
+
+        return None
+
+    def total(self, phase: Phase) -> float:
+        return self._seconds[phase]
+
+    def mean(self, phase: Phase) -> float:
+        count = self._counts[phase]
+        return self._seconds[phase] / count if count else 0.0
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {
+            phase.name.lower(): {
+                "count": self._counts[phase],
+                "total": self._seconds[phase],
+                "mean": self.mean(phase),
+            }
+            for phase in Phase
+        }
+
+    def __repr__(self) -> str:
+        return f"PhaseTimer(rounds={self._counts[Phase.DEAL]})"
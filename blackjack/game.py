@@ -1,2 +1,476 @@
+"""
+game.py
+
+This module runs the rounds of a blackjack table: dealing, player decisions,
+the dealer's play and the settlement of every hand.
+
+A round follows the usual casino flow. Every seat and then the dealer receive
+one card, twice. If the dealer has a natural, it is revealed right away and
+only player naturals push. Otherwise every seat plays its hands in order,
+the dealer draws if any hand is still live, and all hands are settled. The
+cards go to the discard tray, and once the end-of-shoe marker was passed the
+tray is collected and the shoe is shuffled and cut again. With ``Rules.csm``
+the cards come from a ``ContinuousShuffler`` instead, and the tray is returned
+to the machine after every round. A ``ShuffleProcedure`` replaces the uniform
+shuffle of the shoe with a model of a dealer's physical shuffle.
+"""
+
+from time import perf_counter
+from typing import Generator, Iterator
+
+from .arena import HandSlot, RoundArena
+from .card import Card
+from .csm import ContinuousShuffler
+from .dealer import Dealer
+from .deck import Deck, RandomSource
+from .discard_tray import DiscardTray
+from .events import EventBus, EventType, Phase
+from .hand import Hand
+from .logger import logger
+from .outcome import Outcome
+from .player import Player
+from .rules import Rules
+from .shuffles import ShuffleProcedure
+from .statistics import RoundStatistics
+from .strategy import Action
+
+
+class HandResult:
+    """Settled hand of one seat; cards are stored as ``Card.code`` values."""
+
+    __slots__ = ("seat", "cards", "actions", "wager", "net", "outcome")
+
+    def __init__(
+        self,
+        seat: int,
+        cards: tuple[int, ...],
+        actions: tuple[Action, ...],
+        wager: float,
+        net: float,
+        outcome: Outcome,
+    ):
+        self.seat = seat
+        self.cards = cards
+        self.actions = actions
+        self.wager = wager
+        self.net = net
+        self.outcome = outcome
+
+    def __repr__(self) -> str:
+        return (
+            f"HandResult(seat={self.seat}, cards={self.cards}, "
+            f"outcome={self.outcome.name}, net={self.net})"
+        )
+
+
+class RoundResult:
+    """Result of one round: the dealer's cards and every settled hand."""
+
+    __slots__ = ("number", "dealer_cards", "hands")
+
+    def __init__(
+        self, number: int, dealer_cards: tuple[int, ...], hands: tuple[HandResult, ...]
+    ):
+        self.number = number
+        self.dealer_cards = dealer_cards
+        self.hands = hands
+
+    @property
+    def net(self) -> float:
+        return sum(hand.net for hand in self.hands)
+
+    @property
+    def wager(self) -> float:
+        return sum(hand.wager for hand in self.hands)
+
+    def __repr__(self) -> str:
+        return (
+            f"RoundResult(number={self.number}, dealer_cards={self.dealer_cards}, "
+            f"hands={len(self.hands)}, net={self.net})"
+        )
+
+
+class Decision:
+    """A pending player decision of ``Game.round_steps``."""
+
+    __slots__ = ("seat", "hand", "upcard", "allowed")
+
+    def __init__(self, seat: int, hand: Hand, upcard: Card, allowed: frozenset[Action]):
+        self.seat = seat
+        self.hand = hand
+        self.upcard = upcard
+        self.allowed = allowed
+
+    def __repr__(self) -> str:
+        return (
+            f"Decision(seat={self.seat}, hand={self.hand.score}, "
+            f"upcard={self.upcard}, allowed={sorted(self.allowed)})"
+        )
+
+
+def _emit_phase(bus: EventBus, phase: Phase, started: float) -> float:
+    now = perf_counter()
+    bus.emit(EventType.PHASE, (phase, now - started))
+    return now
+
+
 class Game:
-    pass
+    """
+    A blackjack table with one shoe, one discard tray, a dealer and its seats.
+
+    Args:
+        players (list[Player] | None): Seats in dealing order, one default player if omitted.
+        rules (Rules | None): Table rules, the default ``Rules()`` if omitted.
+        rng (RandomSource): Generator or seed of the shoe, which also places
+            the cut card. A seeded game replays the same shoes.
+        shuffle_procedure (ShuffleProcedure | None): Physical shuffle of the
+            collected shoe, a uniform shuffle if omitted.
+        record_statistics (bool): Keep the table's and the players'
+            ``statistics``. Runners that accumulate their own report turn
+            this off to save the per-round update.
+    """
+
+    def __init__(
+        self,
+        players: list[Player] | None = None,
+        rules: Rules | None = None,
+        rng: RandomSource = None,
+        shuffle_procedure: ShuffleProcedure | None = None,
+        record_statistics: bool = True,
+    ):
+        self._rules = rules if rules is not None else Rules()
+        if self._rules.csm and shuffle_procedure is not None:
+            raise ValueError("A continuous shuffling machine takes no shuffle procedure")
+        self._shuffle_procedure = shuffle_procedure
+        self._players = list(players) if players else [Player(name="Player")]
+        shoe = ContinuousShuffler if self._rules.csm else Deck
+        self._deck = shoe(deck_size=self._rules.decks, rng=rng)
+        self._discard_tray = DiscardTray()
+        self._dealer = Dealer(hit_soft_17=self._rules.hit_soft_17)
+        self._rounds_played = 0
+        self._statistics = RoundStatistics()
+        self._record = record_statistics
+        self._arena: RoundArena | None = None
+        # Set by the EventBus of ``events`` while it has subscribers.
+        self._bus: EventBus | None = None
+        self._events: EventBus | None = None
+
+        self._prepare_shoe()
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def rules(self) -> Rules:
+        return self._rules
+
+    @property
+    def players(self) -> list[Player]:
+        return self._players
+
+    @property
+    def dealer(self) -> Dealer:
+        return self._dealer
+
+    @property
+    def deck(self) -> Deck:
+        return self._deck
+
+    @property
+    def discard_tray(self) -> DiscardTray:
+        return self._discard_tray
+
+    @property
+    def events(self) -> EventBus:
+        """Event bus of the game, its shoe and its tray, created on first use."""
+        if self._events is None:
+            self._events = EventBus()
+            self._events.attach(self, self._deck, self._discard_tray)
+        return self._events
+
+    @property
+    def rounds_played(self) -> int:
+        return self._rounds_played
+
+    @property
+    def statistics(self) -> RoundStatistics:
+        """Results of the whole table, every seat of a round combined."""
+        return self._statistics
+
+    # -----------------------------------------------
+    # Round flow
+    # -----------------------------------------------
+    def play_round(self) -> RoundResult:
+        """Play one round, asking every player for their decisions."""
+        steps = self.round_steps()
+        try:
+            decision = next(steps)
+            while True:
+                player = self._players[decision.seat]
+                decision = steps.send(
+                    player.decide(decision.hand, decision.upcard, decision.allowed)
+                )
+        except StopIteration as stop:
+            return stop.value
+
+    def round_steps(self) -> Generator["Decision", Action, RoundResult]:
+        """
+        Play one round as a generator that pauses at every player decision.
+
+        Every yielded ``Decision`` expects the chosen action to be sent back;
+        the generator returns the ``RoundResult``. This lets a caller decide
+        asynchronously, e.g. wait for a remote player (see
+        ``blackjack.server``).
+        """
+        bus = self._bus
+        if bus is not None:
+            started = perf_counter()
+        dealer = self._dealer
+        arena = self._round_arena()
+        seats = [arena.take(seat, player.bet) for seat, player in enumerate(self._players)]
+
+        # Deal first to the players, then to the dealer, twice.
+        for _ in range(2):
+            for slot in seats:
+                slot.hand.add(self._draw())
+            dealer.hand.add(self._draw())
+
+        if bus is not None:
+            started = _emit_phase(bus, Phase.DEAL, started)
+
+        upcard = dealer.upcard
+        played: list[tuple[int, HandSlot]] = []
+        if dealer.hand.blackjack:
+            dealer.hand.reveal()
+            played.extend(enumerate(seats))
+        else:
+            for seat, (player, slot) in enumerate(zip(self._players, seats)):
+                for played_hand in (yield from self._play_seat(seat, player, slot, upcard)):
+                    played.append((seat, played_hand))
+            if bus is not None:
+                started = _emit_phase(bus, Phase.PLAYERS, started)
+
+            if any(self._is_live(played_hand) for _, played_hand in played):
+                dealer.play(self._draw)
+            else:
+                dealer.hand.reveal()
+            if bus is not None:
+                started = _emit_phase(bus, Phase.DEALER, started)
+
+        results = []
+        for seat, played_hand in played:
+            result = self._settle(seat, played_hand)
+            self._players[seat].settle(result.net)
+            results.append(result)
+            # The slot's hand is emptied when the arena hands it out again.
+            self._discard_tray.discard(played_hand.hand.hand)
+        if self._record:
+            self._record_statistics(results)
+
+        dealer_cards = tuple(card.code for card in dealer.hand)
+        self._discard_tray.discard(dealer.hand.hand)
+        dealer.hand.clear()
+
+        self._rounds_played += 1
+        if self._rules.csm:
+            self._deck.collect_discard_pile(self._discard_tray.reset())
+        elif self._deck.end_game:
+            self._reshuffle()
+
+        result = RoundResult(self._rounds_played, dealer_cards, tuple(results))
+        if bus is not None:
+            _emit_phase(bus, Phase.SETTLEMENT, started)
+            bus.emit(EventType.ROUND_RESOLVED, result)
+        return result
+
+    def rounds(self, limit: int | None = None) -> Iterator[RoundResult]:
+        """
+        Play rounds lazily: a round is dealt only when the next result is requested.
+
+        Args:
+            limit (int | None): Number of rounds to play, unbounded if omitted.
+        """
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must be >= 0, got {limit}")
+
+        played = 0
+        while limit is None or played < limit:
+            yield self.play_round()
+            played += 1
+
+    def _record_statistics(self, results: list[HandResult]) -> None:
+        # Results come in seat order, so one pass hands every seat its results.
+        table_net = table_wager = table_bet = 0.0
+        index, n_results = 0, len(results)
+        for seat, player in enumerate(self._players):
+            net = wager = 0.0
+            outcomes = []
+            while index < n_results and results[index].seat == seat:
+                result = results[index]
+                net += result.net
+                wager += result.wager
+                outcomes.append(result.outcome)
+                index += 1
+            player.statistics.add(net, player.bet, wager, outcomes)
+            table_net += net
+            table_wager += wager
+            table_bet += player.bet
+
+        self._statistics.add(
+            table_net, table_bet, table_wager, [result.outcome for result in results]
+        )
+
+        return None
+
+    def _round_arena(self) -> RoundArena:
+        arena = self._arena
+        if arena is None or arena.seats != len(self._players):
+            # Seats were added or removed since the last round.
+            arena = self._arena = RoundArena(
+                [player.name for player in self._players], self._rules.max_split_hands
+            )
+        arena.begin_round()
+        return arena
+
+    def _play_seat(
+        self, seat: int, player: Player, slot: HandSlot, upcard: Card
+    ) -> Generator["Decision", Action, list[HandSlot]]:
+        pending = [slot]
+        finished = []
+        n_hands = 1
+
+        while pending:
+            current = pending.pop(0)
+            hand = current.hand
+            if len(hand) == 1:
+                hand.add(self._draw())
+
+            while hand.score < 21:
+                allowed = self._allowed_actions(current, n_hands)
+                if allowed == {Action.STAND}:
+                    break
+
+                action = yield Decision(seat, hand, upcard, allowed)
+                if action not in allowed:
+                    raise ValueError(
+                        f"Action {action!r} is not allowed, expected one of {sorted(allowed)}"
+                    )
+                current.actions.append(action)
+
+                if action is Action.STAND:
+                    break
+                elif action is Action.HIT:
+                    hand.add(self._draw())
+                elif action is Action.DOUBLE:
+                    current.wager *= 2
+                    hand.double(self._draw())
+                    break
+                elif action is Action.SURRENDER:
+                    current.surrendered = True
+                    break
+                elif action is Action.SPLIT:
+                    if self._bus is not None:
+                        self._bus.emit(EventType.SPLIT, seat)
+                    n_hands += 1
+                    pending[:0] = (current, self._arena.split(seat, current))
+                    current = None
+                    break
+
+            if current is not None:
+                finished.append(current)
+
+        return finished
+
+    def _allowed_actions(self, current: HandSlot, n_hands: int) -> frozenset[Action]:
+        rules = self._rules
+        hand = current.hand
+        can_split = hand.splitting_possible and n_hands < rules.max_split_hands
+        if hand.hand[0].is_ace and current.split:
+            can_split = can_split and rules.resplit_aces
+
+        if current.split_aces and not rules.hit_split_aces:
+            return frozenset({Action.STAND, Action.SPLIT} if can_split else {Action.STAND})
+
+        allowed = {Action.STAND, Action.HIT}
+        if hand.doubling_possible and (not current.split or rules.double_after_split):
+            allowed.add(Action.DOUBLE)
+        if len(hand) == 2:
+            if can_split:
+                allowed.add(Action.SPLIT)
+            if rules.surrender and not current.split and not current.actions:
+                allowed.add(Action.SURRENDER)
+
+        return frozenset(allowed)
+
+    @staticmethod
+    def _is_live(played_hand: HandSlot) -> bool:
+        hand = played_hand.hand
+        natural = hand.blackjack and not played_hand.split
+        return not (played_hand.surrendered or hand.bust or natural)
+
+    def _settle(self, seat: int, played_hand: HandSlot) -> HandResult:
+        hand = played_hand.hand
+        dealer_hand = self._dealer.hand
+        wager = played_hand.wager
+        natural = hand.blackjack and not played_hand.split
+
+        if played_hand.surrendered:
+            net, outcome = -wager / 2, Outcome.SURRENDER
+        elif hand.bust:
+            net, outcome = -wager, Outcome.LOSS
+        elif dealer_hand.blackjack:
+            net, outcome = (0.0, Outcome.PUSH) if natural else (-wager, Outcome.LOSS)
+        elif natural:
+            net, outcome = wager * self._rules.blackjack_payout, Outcome.BLACKJACK
+        elif dealer_hand.bust or hand.score > dealer_hand.score:
+            net, outcome = wager, Outcome.WIN
+        elif hand.score == dealer_hand.score:
+            net, outcome = 0.0, Outcome.PUSH
+        else:
+            net, outcome = -wager, Outcome.LOSS
+
+        return HandResult(
+            seat=seat,
+            cards=tuple(card.code for card in hand),
+            actions=tuple(played_hand.actions),
+            wager=wager,
+            net=net,
+            outcome=outcome,
+        )
+
+    # -----------------------------------------------
+    # Shoe handling
+    # -----------------------------------------------
+    def _draw(self) -> Card:
+        if not len(self._deck):
+            # Shoe ran dry mid-round: reshuffle the tray, cards in play stay out.
+            logger.warning("Shoe exhausted mid-round — reshuffling discard tray.")
+            self._reshuffle()
+
+        return self._deck.draw()
+
+    def _prepare_shoe(self) -> None:
+        self._deck.shuffle(self._shuffle_procedure)
+        if self._rules.csm:
+            return None
+
+        self._deck.set_cutcard(pos=int(self._deck.rng.integers(len(self._deck))))
+        remaining_min, remaining_max = self._rules.end_of_shoe_range
+        self._deck.set_end_of_shoe(remaining_min=remaining_min, remaining_max=remaining_max)
+
+        return None
+
+    def _reshuffle(self) -> None:
+        cards = self._discard_tray.reset()
+        self._deck.collect_discard_pile(cards)
+        if self._bus is not None:
+            self._bus.emit(EventType.RESHUFFLE, len(cards))
+        self._prepare_shoe()
+
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"Game(seats={len(self._players)}, rounds_played={self._rounds_played}, "
+            f"deck={self._deck!r})"
+        )
@@ -1,6 +1,5 @@
 from blackjack import Card
 from .logger import logger
-from itertools import product
 
 
 class Hand:
@@ -17,17 +16,23 @@ class Hand:
         _role (str): Role of the hand, either "player" or "dealer".
         _hand (list[Card]): List of current cards in the hand.
         _revealed (bool): Indicates whether the dealer's hand has been revealed.
+        _hard_total (int): Sum of the card values with every ace counted as 1.
+        _aces (int): Number of aces in the hand.
+        _doubled (bool): Indicates whether the hand was doubled down.
 
     Properties:
         role (str): Role of the hand ("player" or "dealer").
         name (str): Name of the hand owner.
         score (int): Current blackjack score of the hand.
+        soft (bool): True if an ace is currently counted as 11.
         visible_score (int | None): Score visible to the player (accounts for dealer's hidden card).
         hand (list[Card]): All cards in the hand.
         visible_hand (list[Card | None]): Cards visible to the player.
         blackjack (bool): True if the hand is a blackjack (21 with two cards).
         bust (bool): True if the score exceeds 21.
         splitting_possible (bool): True if the hand can be split (two cards of the same value).
+        doubling_possible (bool): True if the hand can be doubled down (two cards, not doubled).
+        doubled (bool): True if the hand was doubled down.
 
     Methods:
         add(card: Card) -> None:
@@ -39,6 +44,9 @@ class Hand:
         split() -> tuple[Hand, Hand]:
             Splits the hand into two new hands, if possible.
 
+        double(card: Card) -> None:
+            Doubles down: adds the one final card to the hand.
+
         reveal() -> None:
             Reveals the dealer's hand.
 
@@ -58,9 +66,11 @@ class Hand:
         __iter__():
             Iterates over the cards in the hand.
 
-    Internal Methods:
-        _calculate_score() -> int:
-            Calculates the blackjack score of the hand, accounting for aces.
+    Scoring is incremental: ``add`` and ``split`` keep a running hard total and
+    ace count, so ``score``, ``soft``, ``bust`` and ``blackjack`` are constant
+    time reads. At most one ace can ever count as 11 without busting, so the
+    score is the hard total plus 10 whenever that still fits into 21.
+    The cards in ``hand`` must therefore only be changed through these methods.
     """
 
     def __init__(self, role: str, name: str = None):
@@ -78,6 +88,9 @@ class Hand:
         self._role = role
         self._hand: list[Card] = []
         self._revealed: bool = False
+        self._hard_total: int = 0
+        self._aces: int = 0
+        self._doubled: bool = False
 
     # -----------------------------------------------
     # properties
@@ -98,18 +111,21 @@ class Hand:
 
     @property
     def score(self) -> int:
-        if not self._hand:
-            return 0
+        if self._aces and self._hard_total <= 11:
+            return self._hard_total + 10
+
+        return self._hard_total
 
-        return self._calculate_score()
+    @property
+    def soft(self) -> bool:
+        return self._aces > 0 and self._hard_total <= 11
 
     @property
     def visible_score(self) -> int | None:
         if self.role == "dealer" and not self._revealed:
             if not self._hand:
                 return 0
-            value = self._hand[0].value
-            return min(value) if isinstance(value, tuple) else value
+            return self._hand[0].hard_value
 
         return self.score
 
@@ -128,11 +144,11 @@ class Hand:
 
     @property
     def blackjack(self):
-        return len(self.hand) == 2 and self.score == 21
+        return len(self._hand) == 2 and self._aces > 0 and self._hard_total == 11
 
     @property
     def bust(self):
-        return self.score > 21
+        return self._hard_total > 21
 
     @property
     def splitting_possible(self) -> bool:
@@ -142,20 +158,43 @@ class Hand:
             and self.role == "player"
         )
 
+    @property
+    def doubling_possible(self) -> bool:
+        return len(self._hand) == 2 and not self._doubled and self.role == "player"
+
+    @property
+    def doubled(self) -> bool:
+        return self._doubled
+
     # ----------------------------------------------
     # functions
     # ----------------------------------------------
     def add(self, card: Card) -> None:
         self._hand.append(card)
+        self._hard_total += card.hard_value
+        self._aces += card.is_ace
 
         return None
 
-    def discard(self) -> None:
+    def discard(self) -> list[Card]:
         cards = self._hand.copy()
-        self._hand.clear()
+        self.clear()
 
         return cards
 
+    def clear(self) -> None:
+        """
+        Empty the hand in place, e.g. to reuse it in the next round. The hand
+        is then like a new one: a dealer's hole card is hidden again.
+        """
+        self._hand.clear()
+        self._hard_total = 0
+        self._aces = 0
+        self._doubled = False
+        self._revealed = False
+
+        return None
+
     def split(self) -> tuple["Hand", "Hand"]:
         if not self.splitting_possible:
             raise ValueError(f"Splitting with hand {self.hand} not possible")
@@ -167,21 +206,35 @@ class Hand:
         hand_2.add(self._hand[1])
 
         self._hand.clear()
+        self._hard_total = 0
+        self._aces = 0
 
         return hand_1, hand_2
 
-    def reveal(self) -> None:
-        self._revealed = True
+    def split_into(self, other: "Hand") -> "Hand":
+        """Split by moving the second card into ``other``; this hand keeps the first."""
+        if not self.splitting_possible:
+            raise ValueError(f"Splitting with hand {self.hand} not possible")
+
+        card = self._hand.pop()
+        self._hard_total -= card.hard_value
+        self._aces -= card.is_ace
+        other.clear()
+        other.add(card)
+
+        return other
 
-    def _calculate_score(self) -> int:
-        values = [
-            list(card.value) if isinstance(card.value, tuple) else [card.value]
-            for card in self._hand
-        ]
-        possible_scores = {sum(combo) for combo in product(*values)}
-        valid_scores = [s for s in possible_scores if s <= 21]
+    def double(self, card: Card) -> None:
+        if not self.doubling_possible:
+            raise ValueError(f"Doubling with hand {self.hand} not possible")
 
-        return max(valid_scores) if valid_scores else min(possible_scores)
+        self.add(card)
+        self._doubled = True
+
+        return None
+
+    def reveal(self) -> None:
+        self._revealed = True
 
     # ----------------------------------------------
     # Magic Methods
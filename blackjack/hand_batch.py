@@ -0,0 +1,135 @@
+"""
+hand_batch.py
+
+Vectorized counterpart to ``blackjack.hand`` for scoring many hands at once.
+
+Hands are given as a 2D array of card codes (``Card.code``) with one hand per
+row, padded on the right with ``PAD_CODE``. In signed arrays ``-1`` can be used
+as padding too, because the codes are reinterpreted as ``uint8``. All results
+are computed with NumPy reductions over the whole matrix, the rules are the
+same as for ``Hand``: aces count as 1, and one ace counts as 11 whenever the
+hand does not bust with it.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .card import Card, NUM_CODES
+
+PAD_CODE = 255
+
+# Lookup tables indexed by uint8 code; padding and unused codes count as nothing.
+HARD_VALUES = np.zeros(256, dtype=np.int16)
+HARD_VALUES[:NUM_CODES] = [Card.from_code(code).hard_value for code in range(NUM_CODES)]
+ACE_FLAGS = np.zeros(256, dtype=bool)
+ACE_FLAGS[:NUM_CODES] = [Card.from_code(code).is_ace for code in range(NUM_CODES)]
+CARD_FLAGS = np.zeros(256, dtype=bool)
+CARD_FLAGS[:NUM_CODES] = True
+
+
+class HandBatch(NamedTuple):
+    """Per-hand results of a batch evaluation, one entry per row."""
+
+    totals: np.ndarray
+    soft: np.ndarray
+    bust: np.ndarray
+    blackjack: np.ndarray
+
+
+def _as_codes(codes) -> np.ndarray:
+    codes = np.asarray(codes)
+    if codes.ndim != 2:
+        raise ValueError(f"Expected a 2D array of card codes, got {codes.ndim}D")
+    if codes.dtype != np.uint8:
+        codes = codes.astype(np.uint8)
+
+    return codes
+
+
+def _scores(hard: np.ndarray, has_ace: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    soft = has_ace & (hard <= 11)
+    return np.where(soft, hard + 10, hard), soft
+
+
+def evaluate_hands(codes) -> HandBatch:
+    """
+    Score every hand (row) of a padded card-code matrix.
+
+    Args:
+        codes: ``(hands, max_cards)`` array of card codes padded with ``PAD_CODE``.
+
+    Returns:
+        HandBatch: totals, soft flags, bust flags and blackjack flags.
+    """
+    codes = _as_codes(codes)
+
+    hard = HARD_VALUES[codes].sum(axis=1)
+    has_ace = ACE_FLAGS[codes].any(axis=1)
+    n_cards = CARD_FLAGS[codes].sum(axis=1)
+    totals, soft = _scores(hard, has_ace)
+
+    return HandBatch(
+        totals=totals,
+        soft=soft,
+        bust=hard > 21,
+        blackjack=(n_cards == 2) & (totals == 21),
+    )
+
+
+def draw_to_policy(
+    codes, stand_hard: int = 17, stand_soft: int = 17
+) -> tuple[HandBatch, np.ndarray]:
+    """
+    Play every row with a fixed draw policy and score the final hands.
+
+    Each row holds the cards the hand would receive in order (its first two
+    cards followed by the cards it would draw). A hand keeps drawing until its
+    hard total reaches ``stand_hard``, its soft total reaches ``stand_soft``,
+    or it busts; a row that runs out of cards stops at its last card. The
+    dealer standing on all 17s uses ``stand_soft=17``, hitting soft 17 uses
+    ``stand_soft=18``.
+
+    Args:
+        codes: ``(hands, max_cards)`` array of card codes padded with ``PAD_CODE``.
+        stand_hard: Smallest hard total the hand stands on.
+        stand_soft: Smallest soft total the hand stands on.
+
+    Returns:
+        tuple[HandBatch, np.ndarray]: The final hands and the number of cards
+        each hand used.
+    """
+    codes = _as_codes(codes)
+    if codes.shape[1] < 2:
+        raise ValueError("Hands need at least two card columns")
+
+    hard = np.cumsum(HARD_VALUES[codes], axis=1)
+    has_ace = np.logical_or.accumulate(ACE_FLAGS[codes], axis=1)
+    is_card = CARD_FLAGS[codes]
+    totals, soft = _scores(hard, has_ace)
+
+    standing = np.where(soft, totals >= stand_soft, totals >= stand_hard)
+    # A hand stops after the first card that makes it stand, or before padding.
+    last_card = np.append(is_card[:, 1:] < is_card[:, :-1], is_card[:, -1:], axis=1)
+    stop = (standing | last_card) & is_card
+    stop[:, 0] = False
+    has_stop = stop.any(axis=1)
+    stop_index = np.where(has_stop, stop.argmax(axis=1), 1)
+
+    rows = np.arange(len(codes))
+    final_hard = hard[rows, stop_index]
+    final_totals = totals[rows, stop_index]
+    n_cards = stop_index + 1
+
+    batch = HandBatch(
+        totals=final_totals,
+        soft=soft[rows, stop_index],
+        bust=final_hard > 21,
+        blackjack=(n_cards == 2) & (final_totals == 21),
+    )
+    return batch, n_cards
+
+
+def dealer_final_totals(codes, hit_soft_17: bool = False) -> tuple[HandBatch, np.ndarray]:
+    """Play every row as a dealer hand, see ``draw_to_policy``."""
+    return draw_to_policy(codes, stand_hard=17, stand_soft=18 if hit_soft_17 else 17)
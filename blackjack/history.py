@@ -0,0 +1,295 @@
+"""
+history.py
+
+Append-only binary hand history that can be memory-mapped for analysis.
+
+A history file holds one fixed-width record per settled hand, see
+``RECORD_DTYPE``: the round number, the seat and the hand's index within the
+seat (split hands count up), the bet and net result, the outcome, the true
+count before the deal, the player's cards, the decisions and the dealer's
+cards. Cards are ``Card.code`` values and decisions ``Action`` values, both
+padded on the right with ``PAD_CODE``.
+
+The file starts with a small header: the magic bytes, the length of a JSON
+document (format version, record size, the rules' ``repr`` and free-form
+metadata) and the document itself, padded to a multiple of 64 bytes. The
+records follow back to back, so a file is read by memory-mapping everything
+after the header as an array of records. A column is then a strided view into
+the mapping; filtering and aggregating it never builds Python objects.
+
+``HistoryWriter`` fills a preallocated block of records and writes it out once
+``chunk_rows`` records are buffered, so a simulation loop only touches NumPy
+memory per hand. A partly written last record (e.g. after a crash) is ignored
+by the reader.
+"""
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from .game import HandResult, RoundResult
+from .hand_batch import PAD_CODE
+from .rules import Rules
+
+MAGIC = b"BJHIST\x00\x01"
+FORMAT_VERSION = 1
+HEADER_ALIGNMENT = 64
+
+# A hand can hold at most 21 aces and one more card before it is over 21.
+MAX_CARDS = 22
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("round", "<u8"),
+        ("seat", "u1"),
+        ("hand", "u1"),
+        ("outcome", "u1"),
+        ("n_cards", "u1"),
+        ("true_count", "<f4"),
+        ("bet", "<f8"),
+        ("net", "<f8"),
+        ("cards", "u1", (MAX_CARDS,)),
+        ("decisions", "u1", (MAX_CARDS,)),
+        ("dealer_cards", "u1", (MAX_CARDS,)),
+    ]
+)
+
+
+def _header(rules: Rules | None, metadata: dict | None) -> bytes:
+    document = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "record_size": RECORD_DTYPE.itemsize,
+            "rules": repr(rules) if rules is not None else None,
+            "metadata": metadata or {},
+        }
+    ).encode()
+    size = len(MAGIC) + 4 + len(document)
+    padding = -size % HEADER_ALIGNMENT
+    return MAGIC + struct.pack("<I", len(document) + padding) + document + b" " * padding
+
+
+def read_header(path: str | Path) -> tuple[dict, int]:
+    """The header document of a history file and the offset of its records."""
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a hand history file")
+        (length,) = struct.unpack("<I", file.read(4))
+        document = json.loads(file.read(length))
+
+    if document["version"] != FORMAT_VERSION or document["record_size"] != RECORD_DTYPE.itemsize:
+        raise ValueError(
+            f"Unsupported hand history version {document['version']} in {path}"
+        )
+    return document, len(MAGIC) + 4 + length
+
+
+class HistoryWriter:
+    """
+    Streams hand records to a history file.
+
+    Args:
+        path (str | Path): File to write.
+        rules (Rules | None): Rules stored in the header.
+        chunk_rows (int): Records buffered before they are written.
+        metadata (dict | None): JSON-serializable data stored in the header.
+        append (bool): Add to an existing file instead of replacing it.
+        round_offset (int): Added to the round numbers of appended results,
+            e.g. to number the rounds of a chunk of a larger run.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        rules: Rules | None = None,
+        chunk_rows: int = 65_536,
+        metadata: dict | None = None,
+        append: bool = False,
+        round_offset: int = 0,
+    ):
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be at least 1, got {chunk_rows}")
+
+        self._path = Path(path)
+        self._round_offset = round_offset
+        self._buffer = np.zeros(chunk_rows, dtype=RECORD_DTYPE)
+        self._pending = 0
+        self._written = 0
+
+        if append and self._path.exists():
+            _, offset = read_header(self._path)
+            self._file = open(self._path, "r+b")
+            # Drop a partly written record so the file stays aligned.
+            records = (self._path.stat().st_size - offset) // RECORD_DTYPE.itemsize
+            self._file.truncate(offset + records * RECORD_DTYPE.itemsize)
+            self._file.seek(0, 2)
+            self._written = records
+        else:
+            self._file = open(self._path, "wb")
+            self._file.write(_header(rules, metadata))
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def rows(self) -> int:
+        """Records written or buffered so far."""
+        return self._written + self._pending
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    # -----------------------------------------------
+    # Writing
+    # -----------------------------------------------
+    def append_round(self, result: RoundResult, true_count: float = np.nan) -> None:
+        """Buffer one record per hand of a settled round."""
+        hand_index: dict[int, int] = {}
+        for hand in result.hands:
+            index = hand_index.get(hand.seat, 0)
+            hand_index[hand.seat] = index + 1
+            self._append_hand(result, hand, index, true_count)
+
+        return None
+
+    def _append_hand(
+        self, result: RoundResult, hand: HandResult, index: int, true_count: float
+    ) -> None:
+        if self._pending == len(self._buffer):
+            self.flush()
+
+        record = self._buffer[self._pending]
+        record["round"] = self._round_offset + result.number
+        record["seat"] = hand.seat
+        record["hand"] = index
+        record["outcome"] = hand.outcome
+        record["n_cards"] = len(hand.cards)
+        record["true_count"] = true_count
+        record["bet"] = hand.wager
+        record["net"] = hand.net
+        _fill(record["cards"], hand.cards)
+        _fill(record["decisions"], hand.actions)
+        _fill(record["dealer_cards"], result.dealer_cards)
+        self._pending += 1
+
+        return None
+
+    def append_records(self, records: np.ndarray) -> None:
+        """Write already built records, e.g. from a vectorized simulator."""
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        self.flush()
+        self._file.write(records.tobytes())
+        self._written += len(records)
+
+        return None
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(self._buffer[: self._pending].tobytes())
+            self._written += self._pending
+            self._pending = 0
+        self._file.flush()
+
+        return None
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+        return None
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"HistoryWriter(path={self._path}, rows={self.rows})"
+
+
+def _fill(field: np.ndarray, values) -> None:
+    n = len(values)
+    field[:n] = values
+    field[n:] = PAD_CODE
+
+
+class HistoryReader:
+    """
+    Read-only, memory-mapped view of a history file.
+
+    ``reader["net"]`` and ``reader.column("net")`` return zero-copy views of a
+    column; ``reader.records`` is the whole mapped record array.
+
+    Args:
+        path (str | Path): File to read.
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._header, offset = read_header(self._path)
+        rows = (self._path.stat().st_size - offset) // RECORD_DTYPE.itemsize
+        if rows:
+            self._records = np.memmap(
+                self._path, dtype=RECORD_DTYPE, mode="r", offset=offset, shape=(rows,)
+            )
+        else:
+            self._records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def header(self) -> dict:
+        return self._header
+
+    @property
+    def rules(self) -> str | None:
+        """``repr`` of the rules the history was recorded with."""
+        return self._header["rules"]
+
+    @property
+    def metadata(self) -> dict:
+        return self._header["metadata"]
+
+    @property
+    def records(self) -> np.ndarray:
+        return self._records
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return RECORD_DTYPE.names
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in RECORD_DTYPE.names:
+            raise ValueError(f'Unknown column "{name}", expected one of {RECORD_DTYPE.names}')
+        return self._records[name]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.column(name)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __repr__(self) -> str:
+        return f"HistoryReader(path={self._path}, rows={len(self)})"
+
+
+def part_path(directory: str | Path, index: int) -> Path:
+    """File of chunk ``index`` of a simulation written to ``directory``."""
+    return Path(directory) / f"part-{index:05d}.bjh"
+
+
+def open_parts(directory: str | Path) -> list[HistoryReader]:
+    """Readers for every chunk file of a simulation, in chunk order."""
+    return [HistoryReader(path) for path in sorted(Path(directory).glob("part-*.bjh"))]
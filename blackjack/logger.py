@@ -1,18 +1,29 @@
 import logging
 
-# configure base logger
+# configure base logger; the application decides where records go
 logger = logging.getLogger("blackjack")
-logger.setLevel(logging.INFO)
-
-# Console Handler
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
+logger.addHandler(logging.NullHandler())
 
 # Format for logs
 formatter = logging.Formatter(
     "[%(asctime)s.%(msecs)03d]      [%(levelname)-8s]      %(filename)-24s| %(funcName)-27s:  %(lineno)-5d|   %(message)s"
 )
-ch.setFormatter(formatter)
 
-# Handler zum Logger hinzufügen
-logger.addHandler(ch)
+
+def enable_console_logging(level: int = logging.INFO) -> logging.Handler:
+    """Print the package's records at ``level`` and above to stderr; returns the handler."""
+    for handler in logger.handlers:
+        if getattr(handler, "_blackjack_console", False):
+            handler.setLevel(level)
+            logger.setLevel(level)
+            return handler
+
+    # Console Handler
+    ch = logging.StreamHandler()
+    ch.setLevel(level)
+    ch.setFormatter(formatter)
+    ch._blackjack_console = True
+    logger.addHandler(ch)
+    logger.setLevel(level)
+
+    return ch
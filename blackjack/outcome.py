@@ -0,0 +1,11 @@
+from enum import IntEnum
+
+
+class Outcome(IntEnum):
+    """Settlement of a hand, as recorded in results, histories and statistics."""
+
+    LOSS = 0
+    PUSH = 1
+    WIN = 2
+    BLACKJACK = 3
+    SURRENDER = 4
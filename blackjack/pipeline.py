@@ -0,0 +1,119 @@
+"""
+pipeline.py
+
+Composable stages for streams of round results, e.g. from ``Game.rounds``.
+
+A stage is a generator function that takes a stream as its first argument and
+yields the items it lets through, so stages chain without buffering:
+
+    stream = game.rounds()
+    stream = record(stream, writer, counter)
+    stream = tap(stream, stats.add)
+    for result in take(stream, 1_000_000):
+        ...
+
+``pipe`` applies a sequence of one-argument stages (use ``functools.partial``
+for the extra arguments). Since every stage is lazy, a round is only played
+when the end of the pipeline asks for it; stopping the consumer stops the
+simulation. ``itertools.tee`` splits a stream into several independent ones.
+"""
+
+import itertools
+import math
+import time
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from .counting import CardCounter
+from .game import RoundResult
+from .history import HistoryWriter
+
+T = TypeVar("T")
+
+
+def pipe(source: Iterable[T], *stages: Callable[[Iterable], Iterable]) -> Iterator:
+    """Chain ``stages`` onto ``source``, first stage first."""
+    stream = iter(source)
+    for stage in stages:
+        stream = iter(stage(stream))
+    return stream
+
+
+def tap(stream: Iterable[T], callback: Callable[[T], object]) -> Iterator[T]:
+    """Call ``callback`` on every item and pass the item on unchanged."""
+    for item in stream:
+        callback(item)
+        yield item
+
+
+def take(stream: Iterable[T], n: int) -> Iterator[T]:
+    """The first ``n`` items; the source is not advanced any further."""
+    if n < 0:
+        raise ValueError(f"n must be >= 0, got {n}")
+    return itertools.islice(stream, n)
+
+
+def every(stream: Iterable[T], n: int) -> Iterator[T]:
+    """Every ``n``-th item, e.g. to sample a progress display."""
+    if n < 1:
+        raise ValueError(f"n must be >= 1, got {n}")
+    return itertools.islice(stream, n - 1, None, n)
+
+
+def throttle(
+    stream: Iterable[T],
+    rate: float,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], object] = time.sleep,
+) -> Iterator[T]:
+    """Pass on at most ``rate`` items per second, sleeping as needed."""
+    if rate <= 0:
+        raise ValueError(f"rate must be positive, got {rate}")
+
+    interval = 1.0 / rate
+    next_time = clock()
+    for item in stream:
+        delay = next_time - clock()
+        if delay > 0:
+            sleep(delay)
+        next_time = max(next_time, clock()) + interval
+        yield item
+
+
+def counted(
+    stream: Iterable[RoundResult],
+    counter: CardCounter,
+    system: str = "Hi-Lo",
+) -> Iterator[tuple[RoundResult, float]]:
+    """
+    Pair every round with the true count of ``system`` before its deal.
+
+    The count is read before the next round is requested, i.e. before it is
+    dealt.
+    """
+    true_count = counter.true_count(system)
+    for result in stream:
+        yield result, true_count
+        true_count = counter.true_count(system)
+
+
+def record(
+    stream: Iterable[RoundResult],
+    writer: HistoryWriter,
+    counter: CardCounter | None = None,
+    system: str = "Hi-Lo",
+) -> Iterator[RoundResult]:
+    """
+    Append every round to a hand history.
+
+    With ``counter`` the true count of ``system`` before each deal is
+    recorded (see ``counted``).
+    """
+    if counter is None:
+        for result in stream:
+            writer.append_round(result, math.nan)
+            yield result
+        return
+
+    for result, true_count in counted(stream, counter, system):
+        writer.append_round(result, true_count)
+        yield result
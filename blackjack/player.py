@@ -1,2 +1,75 @@
+from .card import Card
+from .hand import Hand
+from .statistics import RoundStatistics
+from .strategy import Action, Strategy, mimic_dealer
+
+
 class Player:
-    pass
+    """
+    A seat at the table with a bankroll, a flat bet and a playing strategy.
+
+    The game asks the player for every decision through ``decide`` and books
+    the result of every hand through ``settle``. After every round it adds the
+    seat's result to ``statistics``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_bankroll: float = 0.0,
+        bet: float = 1.0,
+        strategy: Strategy = mimic_dealer,
+    ):
+        if bet <= 0:
+            raise ValueError(f"Bet must be positive, got {bet}")
+
+        self._name = name
+        self._bankroll = initial_bankroll
+        self._bet = bet
+        self._strategy = strategy
+        self._statistics = RoundStatistics()
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def bankroll(self) -> float:
+        return self._bankroll
+
+    @property
+    def bet(self) -> float:
+        return self._bet
+
+    @bet.setter
+    def bet(self, bet: float) -> None:
+        if bet <= 0:
+            raise ValueError(f"Bet must be positive, got {bet}")
+        self._bet = bet
+
+        return None
+
+    @property
+    def strategy(self) -> Strategy:
+        return self._strategy
+
+    @property
+    def statistics(self) -> RoundStatistics:
+        return self._statistics
+
+    # ----------------------------------------------
+    # functions
+    # ----------------------------------------------
+    def decide(self, hand: Hand, upcard: Card, allowed: frozenset[Action]) -> Action:
+        return self._strategy(hand, upcard, allowed)
+
+    def settle(self, amount: float) -> None:
+        self._bankroll += amount
+
+        return None
+
+    def __repr__(self) -> str:
+        return f"Player(name={self._name}, bankroll={self._bankroll}, bet={self._bet})"
@@ -0,0 +1,259 @@
+"""
+probability.py
+
+Exact probabilities of the dealer's final outcome for a given upcard, rule set
+and shoe composition, computed by recursing over the cards the dealer can draw
+without replacement.
+
+Compositions are handled per value class rather than per rank, because only
+the value matters for the dealer: index 0 holds the aces and index ``v - 1``
+the cards worth ``v`` (so index 9 holds all ten-valued cards). A 13-entry rank
+composition such as ``Deck.composition`` is converted automatically.
+
+Every intermediate dealer state is stored in a bounded LRU
+``TranspositionTable``. The same table can be shared between engines (and the
+player analyzer), so states reached from different upcards or compositions are
+computed only once.
+"""
+
+from collections import OrderedDict
+from typing import Sequence
+
+import numpy as np
+
+from .card import Card, RANKS
+from .rules import Rules
+
+# Index of the final outcomes in the probability vectors.
+OUTCOMES = ("17", "18", "19", "20", "21", "bust", "blackjack")
+BUST = 5
+BLACKJACK = 6
+
+ACE = 0
+TEN = 9
+# Value class of every rank in RANKS order.
+_VALUE_CLASS = tuple(
+    ACE if rank == "Ace" else min(Card("Hearts", rank).hard_value, 10) - 1 for rank in RANKS
+)
+
+_MISSING = object()
+
+
+class TranspositionTable:
+    """
+    Bounded least-recently-used cache for recursion results.
+
+    Args:
+        maxsize (int): Maximum number of stored entries.
+    """
+
+    def __init__(self, maxsize: int = 1_000_000):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+
+        self._maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def get(self, key, default=None):
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+        return None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+        return None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return (
+            f"TranspositionTable(len={len(self)}, maxsize={self._maxsize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+def value_composition(composition: Sequence[int]) -> tuple[int, ...]:
+    """Convert a rank composition (13 entries) to value classes (10 entries)."""
+    if len(composition) == 10:
+        return tuple(int(count) for count in composition)
+    if len(composition) != len(RANKS):
+        raise ValueError(
+            f"Expected 10 value classes or {len(RANKS)} ranks, got {len(composition)} entries"
+        )
+
+    values = [0] * 10
+    for rank_index, count in enumerate(composition):
+        values[_VALUE_CLASS[rank_index]] += int(count)
+    return tuple(values)
+
+
+def value_class(card: Card | int) -> int:
+    """Value class of a card, or of a value between 1 (ace) and 10."""
+    if isinstance(card, Card):
+        return _VALUE_CLASS[card.rank_index]
+    if not 1 <= card <= 10:
+        raise ValueError(f"Card value must be between 1 and 10, got {card}")
+    return card - 1
+
+
+def remove_card(composition: tuple[int, ...], value: int) -> tuple[int, ...]:
+    """Composition with one card of the value class removed."""
+    if composition[value] <= 0:
+        raise ValueError(f"No card of value class {value} left in the composition")
+    return composition[:value] + (composition[value] - 1,) + composition[value + 1 :]
+
+
+class DealerProbabilities:
+    """
+    Exact dealer outcome probabilities for a shoe composition.
+
+    Args:
+        table (TranspositionTable | None): Cache for the dealer states, shared
+            with other engines if given.
+    """
+
+    def __init__(self, table: TranspositionTable | None = None):
+        self._table = table if table is not None else TranspositionTable()
+
+    @property
+    def table(self) -> TranspositionTable:
+        return self._table
+
+    def outcome_probabilities(
+        self,
+        upcard: Card | int,
+        composition: Sequence[int],
+        rules: Rules | None = None,
+        peek: bool = True,
+    ) -> np.ndarray:
+        """
+        Probability of every final dealer outcome, in ``OUTCOMES`` order.
+
+        Args:
+            upcard (Card | int): Dealer's upcard, or its value (1 for an ace).
+            composition (Sequence[int]): Unseen cards, the upcard already
+                removed; per rank or per value class.
+            rules (Rules | None): Table rules, only ``hit_soft_17`` is used.
+            peek (bool): Condition on the dealer not having a natural, as
+                after a peek for blackjack (the blackjack entry is then 0).
+
+        Returns:
+            np.ndarray: Seven probabilities summing to 1.
+        """
+        up = value_class(upcard)
+        composition = value_composition(composition)
+        hit_soft_17 = rules.hit_soft_17 if rules is not None else False
+
+        key = ("upcard", up, composition, hit_soft_17, peek)
+        probabilities = self._table.get(key)
+        if probabilities is None:
+            probabilities = self._upcard(up, composition, hit_soft_17, peek)
+            self._table.put(key, probabilities)
+
+        return np.array(probabilities)
+
+    def _upcard(
+        self, up: int, composition: tuple[int, ...], hit_soft_17: bool, peek: bool
+    ) -> tuple[float, ...]:
+        total = sum(composition)
+        if total == 0:
+            raise ValueError("Cannot deal a hole card from an empty composition")
+
+        result = [0.0] * len(OUTCOMES)
+        natural = 0.0
+        for hole, count in enumerate(composition):
+            if not count:
+                continue
+            p = count / total
+            if {up, hole} == {ACE, TEN}:
+                natural += p
+                continue
+
+            final = self._final(
+                (up + 1) + (hole + 1),
+                up == ACE or hole == ACE,
+                remove_card(composition, hole),
+                hit_soft_17,
+            )
+            for outcome, q in enumerate(final):
+                result[outcome] += p * q
+
+        if peek:
+            if natural >= 1.0:
+                raise ValueError("The dealer always has blackjack with this composition")
+            result = [p / (1.0 - natural) for p in result]
+        else:
+            result[BLACKJACK] = natural
+
+        return tuple(result)
+
+    def _final(
+        self, hard: int, has_ace: bool, composition: tuple[int, ...], hit_soft_17: bool
+    ) -> tuple[float, ...]:
+        """Distribution of the final outcome of a dealer hand that is not a natural."""
+        if hard > 21:
+            return _ONE_HOT[BUST]
+
+        soft = has_ace and hard <= 11
+        score = hard + 10 if soft else hard
+        if score > 17 or (score == 17 and not (soft and hit_soft_17)):
+            return _ONE_HOT[score - 17]
+
+        key = ("dealer", hard, has_ace, composition, hit_soft_17)
+        cached = self._table.get(key)
+        if cached is not None:
+            return cached
+
+        total = sum(composition)
+        result = [0.0] * len(OUTCOMES)
+        if total == 0:
+            # Out of cards: the hand stays as it is, below 17 counts as bust.
+            result[BUST] = 1.0
+        for value, count in enumerate(composition):
+            if not count:
+                continue
+            p = count / total
+            final = self._final(
+                hard + value + 1,
+                has_ace or value == ACE,
+                remove_card(composition, value),
+                hit_soft_17,
+            )
+            for outcome, q in enumerate(final):
+                result[outcome] += p * q
+
+        result = tuple(result)
+        self._table.put(key, result)
+        return result
+
+
+_ONE_HOT = tuple(
+    tuple(1.0 if i == outcome else 0.0 for i in range(len(OUTCOMES)))
+    for outcome in range(len(OUTCOMES))
+)
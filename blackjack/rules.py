@@ -0,0 +1,74 @@
+"""
+rules.py
+
+This module defines the table rules shared by the game, the dealer and the
+simulation tools. A ``Rules`` object is immutable and hashable, so it can be
+passed to worker processes and used as a cache key.
+"""
+
+from dataclasses import dataclass
+
+DEFAULT_END_OF_SHOE = (50, 80)
+
+
+@dataclass(frozen=True)
+class Rules:
+    """
+    Table rules of a blackjack game.
+
+    Attributes:
+        decks (int): Number of 52-card decks in the shoe.
+        hit_soft_17 (bool): Dealer hits soft 17 (H17) instead of standing (S17).
+        blackjack_payout (float): Payout of a natural, 1.5 for 3:2 and 1.2 for 6:5.
+        double_after_split (bool): Doubling is allowed on split hands.
+        surrender (bool): Late surrender is offered on the first two cards.
+        resplit_aces (bool): Split aces may be split again.
+        hit_split_aces (bool): Split aces may be played on instead of receiving one card.
+        max_split_hands (int): Maximum number of hands a seat can split into.
+        end_of_shoe (tuple[int, int] | None): Range of remaining cards at which
+            the end-of-shoe marker is placed (see ``Deck.set_end_of_shoe``).
+            ``None`` derives it from the shoe size (see ``end_of_shoe_range``).
+        csm (bool): Cards are dealt from a continuous shuffling machine that
+            takes the discards back after every round (``end_of_shoe`` is
+            then unused).
+    """
+
+    decks: int = 6
+    hit_soft_17: bool = False
+    blackjack_payout: float = 1.5
+    double_after_split: bool = True
+    surrender: bool = False
+    resplit_aces: bool = False
+    hit_split_aces: bool = False
+    max_split_hands: int = 4
+    end_of_shoe: tuple[int, int] | None = None
+    csm: bool = False
+
+    def __post_init__(self):
+        if self.decks < 1:
+            raise ValueError(f"A shoe needs at least one deck, got {self.decks}")
+        if self.max_split_hands < 1:
+            raise ValueError(
+                f"max_split_hands must be at least 1, got {self.max_split_hands}"
+            )
+        remaining_min, remaining_max = self.end_of_shoe_range
+        if not 0 <= remaining_min <= remaining_max < self.decks * 52:
+            raise ValueError(f"Invalid end of shoe range {self.end_of_shoe}")
+
+    @property
+    def end_of_shoe_range(self) -> tuple[int, int]:
+        """
+        Range of remaining cards at which the end-of-shoe marker is placed.
+
+        Returns ``end_of_shoe`` when it is set. Otherwise the marker goes 50 to
+        80 cards from the end, scaled down to the same share of the shoe when
+        the shoe holds no more than 80 cards (8 to 13 cards for a single deck).
+        """
+        if self.end_of_shoe is not None:
+            return self.end_of_shoe
+
+        cards = self.decks * 52
+        if cards > DEFAULT_END_OF_SHOE[1]:
+            return DEFAULT_END_OF_SHOE
+
+        return tuple(cards * remaining // 312 for remaining in DEFAULT_END_OF_SHOE)
@@ -0,0 +1,441 @@
+"""
+server.py
+
+Asyncio host for many interactive tables over local TCP or Unix sockets.
+
+Every connection is one table: a ``Game`` with a single remote seat. All
+tables share one event loop; a table only holds its game and its stream, and
+the game runs through ``Game.round_steps``, so no table ever blocks a thread
+while it waits for its player.
+
+The protocol is line based: ASCII messages of space-separated fields, one per
+line. Cards are ``Card.code`` values and actions single letters (``ACTIONS``).
+
+    server  HELLO <table> <deadline_ms>             after connecting
+    client  ROUND                                   deal a round
+    server  DECIDE <seq> <cards> <upcard> <allowed> for every decision
+    client  ACT <seq> <action>
+    server  RESULT <round> <net> <outcomes>         after the round
+    client  QUIT
+    server  BYE
+
+``<cards>`` and ``<outcomes>`` are comma-separated, ``<allowed>`` is a string of
+action letters. A decision not answered within the table's deadline is played
+as ``STAND`` (always allowed); answers carrying an old ``<seq>`` are ignored.
+Malformed or illegal messages are answered with ``ERROR <reason>``.
+
+The server measures the latency of every action, from sending ``DECIDE`` to
+receiving the matching ``ACT``, in a log-bucketed ``LatencyHistogram`` per
+action. ``BotClient`` and ``run_bots`` are a stand-in client that plays with a
+local strategy, e.g. to generate load in tests.
+"""
+
+import asyncio
+import itertools
+import math
+import time
+
+import numpy as np
+
+from .card import Card
+from .game import Decision, Game
+from .hand import Hand
+from .logger import logger
+from .player import Player
+from .rules import Rules
+from .strategy import Action, Strategy, mimic_dealer
+
+ACTIONS = {
+    Action.STAND: "S",
+    Action.HIT: "H",
+    Action.DOUBLE: "D",
+    Action.SPLIT: "P",
+    Action.SURRENDER: "R",
+}
+_ACTION_OF = {letter: action for action, letter in ACTIONS.items()}
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies with logarithmic buckets.
+
+    Bucket ``i`` holds latencies up to ``min_latency * 10 ** (i / per_decade)``;
+    quantiles are reported as bucket upper bounds, so they overestimate by at
+    most one bucket width (about 15% with the default resolution).
+
+    Args:
+        min_latency (float): Upper bound of the first bucket, in seconds.
+        decades (int): Number of decades covered above ``min_latency``.
+        per_decade (int): Buckets per decade.
+    """
+
+    def __init__(self, min_latency: float = 1e-6, decades: int = 7, per_decade: int = 16):
+        self._min = min_latency
+        self._per_decade = per_decade
+        self._counts = np.zeros(decades * per_decade + 1, dtype=np.int64)
+        self._total = 0.0
+        self._max = 0.0
+
+    @property
+    def count(self) -> int:
+        return int(self._counts.sum())
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+        return self._total / count if count else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max
+
+    def add(self, latency: float) -> None:
+        if latency <= self._min:
+            index = 0
+        else:
+            index = math.ceil(math.log10(latency / self._min) * self._per_decade)
+        self._counts[min(index, len(self._counts) - 1)] += 1
+        self._total += latency
+        self._max = max(self._max, latency)
+
+        return None
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q``-quantile, in seconds."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        count = self.count
+        if not count:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self._counts), q * count))
+        return min(self._min * 10 ** (index / self._per_decade), self._max)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other._counts.shape != self._counts.shape or other._min != self._min:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self._counts += other._counts
+        self._total += other._total
+        self._max = max(self._max, other._max)
+
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self.count}, p50={self.quantile(0.5):.2e}, "
+            f"p99={self.quantile(0.99):.2e}, max={self._max:.2e})"
+        )
+
+
+class TableServer:
+    """
+    Hosts one table per connection on a single event loop.
+
+    Args:
+        rules (Rules | None): Rules of every table, ``Rules()`` if omitted.
+        deadline (float): Seconds a player has for every decision.
+        seed (int | None): Master seed; every table gets its own child seed.
+    """
+
+    def __init__(
+        self, rules: Rules | None = None, deadline: float = 1.0, seed: int | None = None
+    ):
+        if deadline <= 0:
+            raise ValueError(f"Deadline must be positive, got {deadline}")
+
+        self._rules = rules if rules is not None else Rules()
+        self._deadline = deadline
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._table_ids = itertools.count(1)
+        self._tables: dict[int, Game] = {}
+        self._latency = {action: LatencyHistogram() for action in Action}
+        self._timeouts = 0
+        self._rounds = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def rules(self) -> Rules:
+        return self._rules
+
+    @property
+    def tables(self) -> int:
+        """Number of connected tables."""
+        return len(self._tables)
+
+    @property
+    def rounds(self) -> int:
+        """Rounds played on all tables."""
+        return self._rounds
+
+    @property
+    def timeouts(self) -> int:
+        """Decisions played as ``STAND`` because the deadline passed."""
+        return self._timeouts
+
+    @property
+    def latency(self) -> dict[Action, LatencyHistogram]:
+        return self._latency
+
+    def total_latency(self) -> LatencyHistogram:
+        histogram = LatencyHistogram()
+        for action_histogram in self._latency.values():
+            histogram.merge(action_histogram)
+        return histogram
+
+    @property
+    def sockets(self) -> list:
+        return list(self._server.sockets) if self._server is not None else []
+
+    # -----------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 0, backlog: int = 4096
+    ) -> asyncio.AbstractServer:
+        """
+        Listen on TCP; port 0 picks a free port, see ``sockets``.
+
+        The backlog is large so that thousands of tables can connect at once
+        without their connection attempts being dropped and retried.
+        """
+        self._server = await asyncio.start_server(self._serve, host, port, backlog=backlog)
+        return self._server
+
+    async def start_unix(self, path: str, backlog: int = 4096) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_unix_server(self._serve, path, backlog=backlog)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        return None
+
+    async def __aenter__(self) -> "TableServer":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # -----------------------------------------------
+    # Tables
+    # -----------------------------------------------
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        table = next(self._table_ids)
+        game = Game(
+            players=[Player(name=f"Table {table}")],
+            rules=self._rules,
+            rng=self._seed_sequence.spawn(1)[0],
+        )
+        self._tables[table] = game
+        writer.write(f"HELLO {table} {round(self._deadline * 1000)}\n".encode())
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.split()
+                if command == [b"ROUND"]:
+                    await self._play_round(game, reader, writer)
+                elif command == [b"QUIT"]:
+                    writer.write(b"BYE\n")
+                    break
+                elif command and command[0] == b"ACT":
+                    # A late answer to a decision that already timed out.
+                    continue
+                else:
+                    writer.write(b"ERROR unknown command\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError) as error:
+            logger.debug(f"Table {table} disconnected: {error}")
+        finally:
+            del self._tables[table]
+            writer.close()
+
+        return None
+
+    async def _play_round(
+        self, game: Game, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        steps = game.round_steps()
+        try:
+            decision = next(steps)
+            for seq in itertools.count():
+                action = await self._decide(seq, decision, reader, writer)
+                decision = steps.send(action)
+        except StopIteration as stop:
+            result = stop.value
+
+        self._rounds += 1
+        outcomes = ",".join(str(int(hand.outcome)) for hand in result.hands)
+        writer.write(f"RESULT {result.number} {result.net:g} {outcomes}\n".encode())
+
+        return None
+
+    async def _decide(
+        self,
+        seq: int,
+        decision: Decision,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> Action:
+        cards = ",".join(str(card.code) for card in decision.hand)
+        allowed = "".join(ACTIONS[action] for action in sorted(decision.allowed))
+        writer.write(f"DECIDE {seq} {cards} {decision.upcard.code} {allowed}\n".encode())
+        await writer.drain()
+
+        sent = time.perf_counter()
+        deadline = sent + self._deadline
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError
+                line = await asyncio.wait_for(reader.readline(), remaining)
+            except TimeoutError:
+                self._timeouts += 1
+                return Action.STAND
+            if not line:
+                raise ConnectionError("Player left during a decision")
+
+            action = self._parse_act(line, seq, decision.allowed)
+            if isinstance(action, str):
+                if action:
+                    writer.write(f"ERROR {action}\n".encode())
+                continue
+
+            self._latency[action].add(time.perf_counter() - sent)
+            return action
+
+    @staticmethod
+    def _parse_act(line: bytes, seq: int, allowed: frozenset[Action]) -> Action | str:
+        """The action of an ``ACT`` line, or an error message ('' to ignore it)."""
+        fields = line.decode(errors="replace").split()
+        if len(fields) != 3 or fields[0] != "ACT" or not fields[1].isdigit():
+            return "expected ACT <seq> <action>"
+        if int(fields[1]) != seq:
+            return ""
+        action = _ACTION_OF.get(fields[2])
+        if action not in allowed:
+            return f"action {fields[2]} is not allowed"
+        return action
+
+    def __repr__(self) -> str:
+        return (
+            f"TableServer(tables={self.tables}, rounds={self._rounds}, "
+            f"timeouts={self._timeouts})"
+        )
+
+
+class BotClient:
+    """
+    A stand-in player that answers every decision with a local strategy.
+
+    Create it with ``connect`` or ``connect_unix``.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        strategy: Strategy = mimic_dealer,
+    ):
+        self._reader = reader
+        self._writer = writer
+        self._strategy = strategy
+        self.table: int | None = None
+        self.deadline: float | None = None
+
+    @classmethod
+    async def connect(
+        cls, host: str, port: int, strategy: Strategy = mimic_dealer
+    ) -> "BotClient":
+        client = cls(*await asyncio.open_connection(host, port), strategy=strategy)
+        await client._hello()
+        return client
+
+    @classmethod
+    async def connect_unix(cls, path: str, strategy: Strategy = mimic_dealer) -> "BotClient":
+        client = cls(*await asyncio.open_unix_connection(path), strategy=strategy)
+        await client._hello()
+        return client
+
+    async def _hello(self) -> None:
+        fields = (await self._reader.readline()).split()
+        if len(fields) != 3 or fields[0] != b"HELLO":
+            raise ConnectionError(f"Unexpected greeting {fields!r}")
+        self.table = int(fields[1])
+        self.deadline = int(fields[2]) / 1000
+
+        return None
+
+    async def play_round(self) -> float:
+        """Play one round and return its net result."""
+        self._writer.write(b"ROUND\n")
+        while True:
+            fields = (await self._reader.readline()).decode().split()
+            if not fields:
+                raise ConnectionError("Server closed the connection")
+            if fields[0] == "DECIDE":
+                _, seq, cards, upcard, allowed = fields
+                action = self._choose(cards, int(upcard), allowed)
+                self._writer.write(f"ACT {seq} {ACTIONS[action]}\n".encode())
+            elif fields[0] == "RESULT":
+                return float(fields[2])
+            elif fields[0] == "ERROR":
+                raise RuntimeError(" ".join(fields[1:]))
+
+    def _choose(self, cards: str, upcard: int, allowed: str) -> Action:
+        hand = Hand(role="player", name="bot")
+        for code in cards.split(","):
+            hand.add(Card.from_code(int(code)))
+        return self._strategy(
+            hand,
+            Card.from_code(upcard),
+            frozenset(_ACTION_OF[letter] for letter in allowed),
+        )
+
+    async def play(self, rounds: int) -> list[float]:
+        return [await self.play_round() for _ in range(rounds)]
+
+    async def close(self) -> None:
+        self._writer.write(b"QUIT\n")
+        try:
+            await self._writer.drain()
+            await self._reader.readline()
+        except ConnectionError:
+            pass
+        self._writer.close()
+        await self._writer.wait_closed()
+
+        return None
+
+
+async def run_bots(
+    tables: int,
+    rounds: int,
+    host: str = "127.0.0.1",
+    port: int | None = None,
+    path: str | None = None,
+    strategy: Strategy = mimic_dealer,
+) -> list[list[float]]:
+    """Play ``rounds`` rounds on ``tables`` concurrent bot connections."""
+    if (port is None) == (path is None):
+        raise ValueError("Give either a TCP port or a Unix socket path")
+
+    async def bot() -> list[float]:
+        if path is not None:
+            client = await BotClient.connect_unix(path, strategy)
+        else:
+            client = await BotClient.connect(host, port, strategy)
+        try:
+            return await client.play(rounds)
+        finally:
+            await client.close()
+
+    return list(await asyncio.gather(*(bot() for _ in range(tables))))
@@ -0,0 +1,352 @@
+"""
+shuffle_statistics.py
+
+Streaming statistics of the card distribution of shuffled shoes.
+
+``ShuffleStatistics`` takes batches of shoes as ``(shoes, cards)`` arrays of
+card codes and keeps only fixed-size count arrays, so millions of shoes can be
+streamed through it with bounded memory:
+
+* position by rank: how often every rank lies at every position of the shoe;
+* adjacency: how often a rank directly follows another rank;
+* successors and rising sequences, if the shoes come with card identities
+  (the position of every card before the shuffle): per shoe, the number of
+  cards still directly followed by their original successor, and the number
+  of rising sequences, i.e. the runs of cards that kept their relative order.
+  One riffle of an ordered deck leaves at most two rising sequences, a
+  uniform shuffle leaves (cards + 1) / 2 on average;
+* penetration: how many cards of a shoe were dealt before the reshuffle.
+
+For a uniform shuffle the position-by-rank and adjacency counts have known
+expectations; ``position_chi_square`` and ``adjacency_chi_square`` compare
+against them. The p-values use the Wilson-Hilferty approximation of the
+chi-square distribution, which is accurate for the large degrees of freedom
+of these tables. Pairs of neighbouring cards are not independent, so the
+adjacency test is approximate.
+
+The sources ``procedure_shoes``, ``deck_shoes`` and ``game_penetrations``
+produce the inputs from a ``ShuffleProcedure``, a ``Deck`` and a ``Game``.
+Accumulators from several workers are combined with ``merge``.
+"""
+
+import math
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from .card import NUM_CODES, RANKS
+from .deck import Deck
+from .game import Game
+from .shuffles import ShuffleProcedure, new_shoes
+
+_N_RANKS = len(RANKS)
+
+
+class ChiSquare(NamedTuple):
+    statistic: float
+    dof: int
+    p_value: float
+
+
+def chi_square_sf(statistic: float, dof: int) -> float:
+    """Upper tail probability of a chi-square variate (Wilson-Hilferty)."""
+    if dof < 1:
+        raise ValueError(f"dof must be at least 1, got {dof}")
+    scale = 2 / (9 * dof)
+    z = ((statistic / dof) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _chi_square(observed: np.ndarray, expected: np.ndarray, dof: int) -> ChiSquare:
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    return ChiSquare(statistic, dof, chi_square_sf(statistic, dof))
+
+
+class ShuffleStatistics:
+    """
+    Streaming card-distribution statistics of shoes of ``decks`` decks.
+
+    Args:
+        decks (int): Decks per shoe.
+    """
+
+    def __init__(self, decks: int = 6):
+        if decks < 1:
+            raise ValueError(f"decks must be at least 1, got {decks}")
+
+        self._decks = decks
+        self._cards = decks * NUM_CODES
+        self._shoes = 0
+        self._tracked = 0
+        self._position_rank = np.zeros((self._cards, _N_RANKS), dtype=np.int64)
+        self._adjacency = np.zeros((_N_RANKS, _N_RANKS), dtype=np.int64)
+        self._successors = np.zeros(self._cards, dtype=np.int64)
+        self._rising = np.zeros(self._cards + 1, dtype=np.int64)
+        self._penetration = np.zeros(self._cards + 1, dtype=np.int64)
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def decks(self) -> int:
+        return self._decks
+
+    @property
+    def cards(self) -> int:
+        return self._cards
+
+    @property
+    def shoes(self) -> int:
+        return self._shoes
+
+    @property
+    def tracked_shoes(self) -> int:
+        """Shoes added with card identities."""
+        return self._tracked
+
+    @property
+    def position_rank(self) -> np.ndarray:
+        """``(cards, 13)`` counts of every rank at every position, ``RANKS`` order."""
+        return self._position_rank.copy()
+
+    @property
+    def adjacency(self) -> np.ndarray:
+        """``(13, 13)`` counts of a rank (row) directly followed by a rank (column)."""
+        return self._adjacency.copy()
+
+    @property
+    def successors(self) -> np.ndarray:
+        """Histogram of the number of original successor pairs per tracked shoe."""
+        return self._successors.copy()
+
+    @property
+    def rising_sequences(self) -> np.ndarray:
+        """Histogram of the number of rising sequences per tracked shoe."""
+        return self._rising.copy()
+
+    @property
+    def penetration(self) -> np.ndarray:
+        """Histogram of the cards dealt per shoe before the reshuffle."""
+        return self._penetration.copy()
+
+    @property
+    def mean_rising_sequences(self) -> float:
+        return _histogram_mean(self._rising)
+
+    @property
+    def mean_successors(self) -> float:
+        return _histogram_mean(self._successors)
+
+    @property
+    def mean_penetration(self) -> float:
+        """Mean fraction of the shoe dealt before the reshuffle."""
+        return _histogram_mean(self._penetration) / self._cards
+
+    # -----------------------------------------------
+    # Accumulation
+    # -----------------------------------------------
+    def add(self, shoes: np.ndarray, identities: np.ndarray | None = None) -> None:
+        """
+        Add a batch of shoes.
+
+        Args:
+            shoes (np.ndarray): ``(shoes, cards)`` card codes.
+            identities (np.ndarray | None): ``(shoes, cards)`` position of
+                every card before the shuffle, each row a permutation of
+                ``range(cards)``. Enables the successor and rising sequence
+                counts.
+        """
+        shoes = np.asarray(shoes)
+        if shoes.ndim != 2 or shoes.shape[1] != self._cards:
+            raise ValueError(f"Expected (shoes, {self._cards}) card codes, got {shoes.shape}")
+
+        n_shoes = len(shoes)
+        ranks = (shoes % _N_RANKS).astype(np.intp)
+        cells = np.arange(self._cards) * _N_RANKS + ranks
+        self._position_rank += np.bincount(
+            cells.ravel(), minlength=self._cards * _N_RANKS
+        ).reshape(self._cards, _N_RANKS)
+        pairs = ranks[:, :-1] * _N_RANKS + ranks[:, 1:]
+        self._adjacency += np.bincount(
+            pairs.ravel(), minlength=_N_RANKS * _N_RANKS
+        ).reshape(_N_RANKS, _N_RANKS)
+        self._shoes += n_shoes
+
+        if identities is not None:
+            self._add_identities(np.asarray(identities))
+
+        return None
+
+    def _add_identities(self, identities: np.ndarray) -> None:
+        if identities.shape[1] != self._cards:
+            raise ValueError(f"Expected (shoes, {self._cards}) identities, got {identities.shape}")
+
+        identities = identities.astype(np.intp)
+        successors = (np.diff(identities, axis=1) == 1).sum(axis=1)
+        self._successors += np.bincount(successors, minlength=self._cards)
+
+        # Card v + 1 lying above card v starts a new rising sequence.
+        positions = np.empty_like(identities)
+        np.put_along_axis(positions, identities, np.arange(self._cards), axis=1)
+        rising = 1 + (positions[:, 1:] < positions[:, :-1]).sum(axis=1)
+        self._rising += np.bincount(rising, minlength=self._cards + 1)
+        self._tracked += len(identities)
+
+        return None
+
+    def add_penetrations(self, dealt: Iterable[int] | np.ndarray) -> None:
+        """Add the number of cards dealt from each of a batch of shoes."""
+        dealt = np.asarray(dealt, dtype=np.intp).ravel()
+        if ((dealt < 0) | (dealt > self._cards)).any():
+            raise ValueError(f"Cards dealt must lie in [0, {self._cards}]")
+        self._penetration += np.bincount(dealt, minlength=self._cards + 1)
+
+        return None
+
+    def add_stream(self, batches: Iterable[np.ndarray | tuple[np.ndarray, np.ndarray]]) -> None:
+        """Add every batch of a stream of card codes or ``(codes, identities)`` pairs."""
+        for batch in batches:
+            if isinstance(batch, tuple):
+                self.add(*batch)
+            else:
+                self.add(batch)
+
+        return None
+
+    def merge(self, other: "ShuffleStatistics") -> "ShuffleStatistics":
+        """Add the counts of ``other``."""
+        if other._decks != self._decks:
+            raise ValueError(f"Cannot merge {other._decks}-deck into {self._decks}-deck counts")
+
+        self._shoes += other._shoes
+        self._tracked += other._tracked
+        self._position_rank += other._position_rank
+        self._adjacency += other._adjacency
+        self._successors += other._successors
+        self._rising += other._rising
+        self._penetration += other._penetration
+
+        return self
+
+    # -----------------------------------------------
+    # Tests against a uniform shuffle
+    # -----------------------------------------------
+    def expected_position_rank(self) -> np.ndarray:
+        """Expected position-by-rank counts of uniformly shuffled shoes."""
+        per_rank = 4 * self._decks
+        return np.full(self._position_rank.shape, self._shoes * per_rank / self._cards)
+
+    def position_chi_squares(self) -> np.ndarray:
+        """Chi-square statistic (12 dof) of the rank distribution at every position."""
+        expected = self.expected_position_rank()
+        return ((self._position_rank - expected) ** 2 / expected).sum(axis=1)
+
+    def position_chi_square(self) -> ChiSquare:
+        """Test that every rank is equally likely at every position."""
+        self._require_shoes()
+        dof = (self._cards - 1) * (_N_RANKS - 1)
+        return _chi_square(self._position_rank, self.expected_position_rank(), dof)
+
+    def expected_adjacency(self) -> np.ndarray:
+        """Expected rank-pair counts of uniformly shuffled shoes."""
+        per_rank = 4 * self._decks
+        expected = np.full((_N_RANKS, _N_RANKS), float(per_rank * per_rank))
+        np.fill_diagonal(expected, per_rank * (per_rank - 1))
+        # Over the cards - 1 neighbouring pairs of a shoe.
+        return expected * self._shoes / self._cards
+
+    def adjacency_chi_square(self) -> ChiSquare:
+        """Test that rank pairs of neighbouring cards appear as often as expected."""
+        self._require_shoes()
+        return _chi_square(self._adjacency, self.expected_adjacency(), _N_RANKS * _N_RANKS - 1)
+
+    def _require_shoes(self) -> None:
+        if not self._shoes:
+            raise ValueError("No shoes added")
+
+    def summary(self) -> dict:
+        """Test results and means, e.g. for a certification log."""
+        return {
+            "shoes": self._shoes,
+            "position": self.position_chi_square()._asdict(),
+            "adjacency": self.adjacency_chi_square()._asdict(),
+            "worst_position": int(np.argmax(self.position_chi_squares())),
+            "mean_rising_sequences": self.mean_rising_sequences,
+            "mean_successors": self.mean_successors,
+            "mean_penetration": self.mean_penetration,
+        }
+
+    def __repr__(self) -> str:
+        return f"ShuffleStatistics(decks={self._decks}, shoes={self._shoes})"
+
+
+def _histogram_mean(histogram: np.ndarray) -> float:
+    total = histogram.sum()
+    if not total:
+        return math.nan
+    return float((np.arange(len(histogram)) * histogram).sum() / total)
+
+
+# ---------------------------------------------
+# Sources
+# ---------------------------------------------
+def procedure_shoes(
+    procedure: ShuffleProcedure,
+    count: int,
+    decks: int = 6,
+    batch: int = 10_000,
+    rng: np.random.Generator | int | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield ``(codes, identities)`` batches of ``count`` shoes in new-deck order
+    shuffled and cut by ``procedure``.
+    """
+    n_cards = decks * NUM_CODES
+    ordered = new_shoes(1, decks)[0]
+    start = np.arange(n_cards, dtype=np.uint16)
+    for identities in procedure.batches(count, decks, batch, rng=rng, start=start):
+        yield ordered[identities], identities
+
+
+def deck_shoes(deck: Deck, count: int, batch: int = 10_000) -> Iterator[np.ndarray]:
+    """
+    Yield batches of ``count`` shoes shuffled and cut by ``deck``, like a
+    ``Game`` prepares them. Every shuffle starts from the previous shoe.
+    """
+    if len(deck) != deck.capacity:
+        raise ValueError("The deck must hold a full shoe")
+
+    codes = np.empty((min(batch, count), len(deck)), dtype=np.uint8)
+    filled = 0
+    for _ in range(count):
+        deck.shuffle()
+        deck.set_cutcard(pos=int(deck.rng.integers(len(deck))))
+        codes[filled] = deck.live_codes()
+        filled += 1
+        if filled == len(codes):
+            yield codes.copy()
+            filled = 0
+    if filled:
+        yield codes[:filled].copy()
+
+
+def game_penetrations(game: Game, shoes: int) -> np.ndarray:
+    """
+    Play ``game`` until ``shoes`` shoes were reshuffled; cards dealt from each.
+
+    A shoe that ran dry mid-round and was refilled from the tray is
+    approximate: the count is capped at the shoe size and the discards dealt
+    again after the refill are not counted.
+    """
+    if game.rules.csm:
+        raise ValueError("A continuous shuffling machine has no penetration")
+
+    dealt = []
+    n_cards = game.rules.decks * NUM_CODES
+    while len(dealt) < shoes:
+        remaining = len(game.deck)
+        result = game.play_round()
+        if len(game.deck) == n_cards:
+            used = len(result.dealer_cards) + sum(len(hand.cards) for hand in result.hands)
+            dealt.append(min(n_cards - remaining + used, n_cards))
+    return np.array(dealt, dtype=np.intp)
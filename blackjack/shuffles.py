@@ -0,0 +1,311 @@
+"""
+shuffles.py
+
+Models of physical shuffles, applied to whole batches of shoes at once.
+
+Every shuffle takes a ``(shoes, cards)`` array of card codes, one shoe per row,
+and a NumPy ``Generator``, and returns the shuffled batch. The permutations are
+built with array operations over the whole batch, so generating millions of
+shoes costs a few array passes per shuffle step rather than a Python loop per
+card.
+
+* ``riffle``: Gilbert-Shannon-Reeds riffle. Every output position comes from
+  the left or the right packet with probability 1/2; the left packet is the
+  top ``k`` cards where ``k`` is the number of positions drawn for it, so the
+  cut is binomial and, given the cut, every interleaving is equally likely.
+* ``grab_riffle``: the multi-deck casino riffle. The shoe is split into two
+  halves, and grabs of a fixed size from both halves are riffled pairwise and
+  stacked.
+* ``strip``: small packets are pulled off the top and piled, which reverses
+  the order of the packets but not of the cards within a packet.
+* ``box``: like ``strip`` with a few large packets of about equal size.
+* ``wash``: the cards are spread and washed on the table, modeled as a
+  uniformly random permutation.
+* ``cut``: the top ``pos`` cards go to the bottom, like ``Deck.set_cutcard``.
+
+``ShuffleProcedure`` chains steps into a dealer's routine; it can shuffle a
+batch, a ``Deck`` (see ``Deck.shuffle``) or produce batches of cut shoes.
+"""
+
+from functools import partial
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+
+from .card import NUM_CODES
+
+ShuffleStep = Callable[[np.ndarray, np.random.Generator], np.ndarray]
+
+
+def _check(shoes: np.ndarray) -> np.ndarray:
+    shoes = np.asarray(shoes)
+    if shoes.ndim != 2:
+        raise ValueError(f"Expected a (shoes, cards) array, got shape {shoes.shape}")
+    return shoes
+
+
+def _index_dtype(n_cards: int) -> type:
+    # Narrow positions halve the memory traffic of the cumulative sums.
+    return np.int16 if n_cards <= np.iinfo(np.int16).max else np.intp
+
+
+def _coin_flips(rng: np.random.Generator, shape: tuple[int, int]) -> np.ndarray:
+    """Fair coin flips, one bit of randomness each."""
+    rows, columns = shape
+    raw = np.frombuffer(rng.bytes(rows * ((columns + 7) // 8)), dtype=np.uint8)
+    return np.unpackbits(raw.reshape(rows, -1), axis=1, count=columns).view(bool)
+
+
+def _random_interleaving(
+    rng: np.random.Generator, rows: int, n_left: int, n_right: int
+) -> np.ndarray:
+    """
+    Uniformly random interleavings of packets of ``n_left`` and ``n_right``
+    cards: every position comes from the right packet with probability
+    (right cards left) / (cards left).
+    """
+    total = n_left + n_right
+    uniforms = rng.random((total, rows), dtype=np.float32)
+    from_right = np.empty((total, rows), dtype=bool)
+    remaining = np.full(rows, n_right, dtype=np.float32)
+    for position in range(total):
+        np.less(uniforms[position] * (total - position), remaining, out=from_right[position])
+        remaining -= from_right[position]
+    return from_right.T
+
+
+def _interleave(
+    left: np.ndarray, right: np.ndarray, from_right: np.ndarray
+) -> np.ndarray:
+    """Merge two packets per row; ``from_right`` marks the positions taken from ``right``."""
+    n_left = left.shape[1]
+    dtype = _index_dtype(from_right.shape[1])
+    left_index = np.cumsum(~from_right, axis=1, dtype=dtype) - 1
+    right_index = np.cumsum(from_right, axis=1, dtype=dtype) + (n_left - 1)
+    packets = np.concatenate((left, right), axis=1)
+    source = np.where(from_right, right_index, left_index)
+    return np.take_along_axis(packets, source, axis=1)
+
+
+def riffle(shoes: np.ndarray, rng: np.random.Generator, passes: int = 1) -> np.ndarray:
+    """Gilbert-Shannon-Reeds riffle shuffles of every shoe."""
+    shoes = _check(shoes)
+    dtype = _index_dtype(shoes.shape[1])
+    for _ in range(passes):
+        from_right = _coin_flips(rng, shoes.shape)
+        left_index = np.cumsum(~from_right, axis=1, dtype=dtype)
+        # The top packet holds as many cards as positions were drawn for it.
+        right_index = np.cumsum(from_right, axis=1, dtype=dtype) + left_index[:, -1:]
+        source = np.where(from_right, right_index, left_index) - 1
+        shoes = np.take_along_axis(shoes, source, axis=1)
+    return shoes
+
+
+def grab_riffle(
+    shoes: np.ndarray,
+    rng: np.random.Generator,
+    grab: int = 52,
+    passes: int = 1,
+) -> np.ndarray:
+    """
+    Casino riffle of a multi-deck shoe in grabs.
+
+    The shoe is split in two halves; the ``i``-th grabs of both halves are
+    riffled together (every interleaving equally likely) and stacked in order.
+    A last, smaller grab takes the remaining cards.
+    """
+    shoes = _check(shoes)
+    if grab < 1:
+        raise ValueError(f"grab must be at least 1, got {grab}")
+
+    n_shoes, n_cards = shoes.shape
+    half = n_cards // 2
+    pairs = half // grab
+    for _ in range(passes):
+        top, bottom = shoes[:, :half], shoes[:, half:]
+        # Riffle all full grab pairs of the batch as one batch of packets.
+        left = top[:, : pairs * grab].reshape(-1, grab)
+        right = bottom[:, : pairs * grab].reshape(-1, grab)
+        piles = [
+            _interleave(left, right, _random_interleaving(rng, len(left), grab, grab))
+            .reshape(n_shoes, -1)
+        ]
+        left, right = top[:, pairs * grab :], bottom[:, pairs * grab :]
+        if left.shape[1] + right.shape[1]:
+            sides = _random_interleaving(rng, n_shoes, left.shape[1], right.shape[1])
+            piles.append(_interleave(left, right, sides))
+        shoes = np.concatenate(piles, axis=1)
+    return shoes
+
+
+def _reverse_packets(shoes: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Restack packets in reverse order; ``starts`` marks the first card of a packet."""
+    n_shoes, n_cards = shoes.shape
+    starts = starts.copy()
+    starts[:, 0] = True
+    position = np.arange(n_cards, dtype=_index_dtype(n_cards))
+
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=1)
+    # The last card of a packet is followed by the start of the next one.
+    ends = np.zeros_like(starts)
+    ends[:, :-1] = starts[:, 1:]
+    ends[:, -1] = True
+    last = np.minimum.accumulate(
+        np.where(ends, position, n_cards - 1)[:, ::-1], axis=1
+    )[:, ::-1]
+
+    target = (n_cards - 1 - last) + (position - first)
+    out = np.empty_like(shoes)
+    np.put_along_axis(out, target, shoes, axis=1)
+    return out
+
+
+def strip(
+    shoes: np.ndarray,
+    rng: np.random.Generator,
+    packet: float = 8.0,
+    passes: int = 1,
+) -> np.ndarray:
+    """Strip shuffles with packets of ``packet`` cards on average."""
+    shoes = _check(shoes)
+    if packet < 1:
+        raise ValueError(f"packet must be at least 1, got {packet}")
+    for _ in range(passes):
+        starts = rng.random(shoes.shape, dtype=np.float32) < 1 / packet
+        shoes = _reverse_packets(shoes, starts)
+    return shoes
+
+
+def box(
+    shoes: np.ndarray,
+    rng: np.random.Generator,
+    packets: int = 4,
+    jitter: float = 0.1,
+) -> np.ndarray:
+    """
+    Box shuffle: cut into ``packets`` piles of about equal size and restack
+    them in reverse order. Cut points vary by ``jitter`` of a pile's size.
+    """
+    shoes = _check(shoes)
+    if packets < 1:
+        raise ValueError(f"packets must be at least 1, got {packets}")
+
+    n_shoes, n_cards = shoes.shape
+    size = n_cards / packets
+    cuts = np.arange(1, packets) * size
+    cuts = cuts + rng.normal(0, jitter * size, (n_shoes, packets - 1))
+    cuts = np.clip(np.rint(cuts), 1, n_cards - 1).astype(np.intp)
+    starts = np.zeros(shoes.shape, dtype=bool)
+    np.put_along_axis(starts, cuts, True, axis=1)
+    return _reverse_packets(shoes, starts)
+
+
+def wash(shoes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """A uniformly random permutation of every shoe."""
+    return rng.permuted(_check(shoes), axis=1)
+
+
+def cut(shoes: np.ndarray, positions: np.ndarray | int) -> np.ndarray:
+    """Move the top ``positions`` cards of every shoe to the bottom."""
+    shoes = _check(shoes)
+    n_cards = shoes.shape[1]
+    positions = np.broadcast_to(np.asarray(positions, dtype=np.intp), (len(shoes),))
+    if ((positions < 0) | (positions >= n_cards)).any():
+        raise ValueError("Cut position out of bounds.")
+    source = (np.arange(n_cards) + positions[:, None]) % n_cards
+    return np.take_along_axis(shoes, source, axis=1)
+
+
+def new_shoes(n: int, decks: int) -> np.ndarray:
+    """``n`` shoes in new-deck order, suits and ranks in code order."""
+    return np.tile(np.arange(NUM_CODES, dtype=np.uint8), (n, decks))
+
+
+class ShuffleProcedure:
+    """
+    A dealer's shuffle routine: steps applied in order.
+
+    Args:
+        steps (Sequence[ShuffleStep]): Shuffles taking ``(shoes, rng)``, e.g.
+            ``partial(riffle, passes=2)``.
+        name (str): Label of the procedure.
+    """
+
+    def __init__(self, steps: Sequence[ShuffleStep], name: str = "custom"):
+        if not steps:
+            raise ValueError("A shuffle procedure needs at least one step")
+        self._steps = tuple(steps)
+        self._name = name
+
+    @property
+    def steps(self) -> tuple[ShuffleStep, ...]:
+        return self._steps
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __call__(self, shoes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        shoes = _check(shoes)
+        for step in self._steps:
+            shoes = step(shoes, rng)
+        return shoes
+
+    def batches(
+        self,
+        count: int,
+        decks: int = 6,
+        batch: int = 10_000,
+        rng: np.random.Generator | int | None = None,
+        start: np.ndarray | None = None,
+        cut_cards: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield ``count`` shuffled shoes in batches of at most ``batch`` rows.
+
+        Args:
+            count (int): Number of shoes.
+            decks (int): Decks per shoe.
+            batch (int): Rows per yielded array.
+            rng (np.random.Generator | int | None): Generator or seed.
+            start (np.ndarray | None): Order before shuffling, new-deck order
+                if omitted.
+            cut_cards (bool): Cut every shoe at a uniformly random position,
+                as ``Game`` does after shuffling.
+        """
+        rng = np.random.default_rng(rng)
+        n_cards = decks * NUM_CODES
+        if start is not None and len(start) != n_cards:
+            raise ValueError(f"start must hold {n_cards} cards, got {len(start)}")
+
+        for offset in range(0, count, batch):
+            n = min(batch, count - offset)
+            shoes = new_shoes(n, decks) if start is None else np.tile(start, (n, 1))
+            shoes = self(shoes, rng)
+            if cut_cards:
+                shoes = cut(shoes, rng.integers(n_cards, size=n))
+            yield shoes
+
+    def __repr__(self) -> str:
+        return f"ShuffleProcedure(name={self._name}, steps={len(self._steps)})"
+
+
+UNIFORM = ShuffleProcedure([wash], name="uniform")
+
+
+def casino_procedure(
+    riffles: int = 2, strips: int = 1, grab: int = 52, box_packets: int = 4
+) -> ShuffleProcedure:
+    """
+    A typical multi-deck routine: grab riffles, a strip, grab riffles again
+    and a box shuffle.
+    """
+    return ShuffleProcedure(
+        [
+            partial(grab_riffle, grab=grab, passes=riffles),
+            partial(strip, passes=strips),
+            partial(grab_riffle, grab=grab, passes=riffles),
+            partial(box, packets=box_packets),
+        ],
+        name="casino",
+    )
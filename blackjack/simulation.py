@@ -0,0 +1,328 @@
+"""
+simulation.py
+
+Monte Carlo runner that plays many rounds of a configured table across a
+process pool.
+
+The requested rounds are split into fixed-size chunks, and every chunk gets
+its own child of one master ``numpy.random.SeedSequence``. A chunk always
+plays on a fresh table seeded from its child, and the per-chunk reports are
+merged in chunk order, so a run is reproducible from the master seed alone,
+independent of the number of workers.
+
+``simulate_threaded`` runs the same chunks on a thread pool instead, which
+avoids pickling and per-process memory and scales across cores on a
+free-threaded Python build. Every chunk still builds its own table (shoe,
+tray, hands and generator) and fills its own report, so the threads share
+no mutable state and the merged report equals the one of ``simulate``.
+
+With ``history_dir`` every chunk also records its hands (with the Hi-Lo true
+count before each deal) to its own ``blackjack.history`` file in that
+directory; rounds are numbered across the whole run. The report is a
+``RoundStatistics``, so the chunks merge exactly, and with ``track_count``
+(or a history) it also holds the EV per true count.
+
+``simulate_until`` runs chunks until the confidence interval of the EV is as
+narrow as requested. Chunk ``i`` is seeded from the ``i``-th child of the
+master seed, exactly as in ``simulate``, and the stopping rule looks at the
+chunks in order. A run that stops after ``k`` chunks therefore equals
+``simulate`` of ``k`` chunks with the same seed, whatever the number of
+workers; chunks still in flight when the target is reached are discarded.
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from .chunking import Progress, chunk_sizes, run_adaptive, z_score
+from .concurrency import gil_enabled
+from .counting import CardCounter
+from .game import Game
+from .history import HistoryWriter, part_path
+from .pipeline import counted, tap
+from .player import Player
+from .rules import Rules
+from .statistics import RoundStatistics
+from .strategy import Strategy, mimic_dealer
+
+
+class SimulationReport(RoundStatistics):
+    """
+    Aggregated results of simulated rounds, with the master seed of the run.
+
+    All amounts are in units of the players' bets. ``merge`` adds another
+    report to this one, which is how per-chunk reports are combined.
+    """
+
+    __slots__ = ("seed",)
+
+    def __init__(self, seed: int | None = None):
+        super().__init__()
+        self.seed = seed
+
+    def state(self) -> dict[str, np.ndarray]:
+        """The state as arrays, with the seed as a decimal string ("" if unknown)."""
+        state = super().state()
+        state["seed"] = np.array("" if self.seed is None else str(self.seed))
+        return state
+
+    def _restore(self, state: dict[str, np.ndarray]) -> None:
+        super()._restore(state)
+        seed = str(state["seed"]) if "seed" in state else ""
+        self.seed = int(seed) if seed else None
+
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"SimulationReport(rounds={self.rounds}, hands={self.hands}, "
+            f"ev={self.ev:.5f}, std={self.std:.4f})"
+        )
+
+
+def _run_chunk(
+    task: tuple[Rules, Strategy, int, int, np.random.SeedSequence, tuple | None, bool],
+) -> SimulationReport:
+    rules, strategy, seats, rounds, seed_sequence, history, track_count = task
+
+    players = [
+        Player(name=f"Seat {seat + 1}", strategy=strategy) for seat in range(seats)
+    ]
+    # The chunk fills its own report, so the table keeps no statistics.
+    game = Game(players=players, rules=rules, rng=seed_sequence, record_statistics=False)
+    initial_bet = sum(player.bet for player in players)
+
+    report = SimulationReport()
+    if history is None and not track_count:
+        for result in game.rounds(rounds):
+            report.add_round(result, initial_bet)
+        return report
+
+    counter = CardCounter(game.deck, systems=("Hi-Lo",))
+    stream = counted(game.rounds(rounds), counter)
+    writer = None
+    if history is not None:
+        path, round_offset = history
+        writer = HistoryWriter(path, rules=rules, round_offset=round_offset)
+        stream = tap(stream, lambda item: writer.append_round(*item))
+    try:
+        for result, true_count in stream:
+            report.add_round(result, initial_bet, true_count)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return report
+
+
+def _plan(
+    rounds: int,
+    rules: Rules | None,
+    strategy: Strategy,
+    seats: int,
+    seed: int | None,
+    chunk_rounds: int,
+    history_dir: str | Path | None = None,
+    track_count: bool = False,
+) -> tuple[np.random.SeedSequence, list]:
+    if rounds < 0 or chunk_rounds < 1 or seats < 1:
+        raise ValueError("rounds must be >= 0, chunk_rounds and seats >= 1")
+
+    rules = rules if rules is not None else Rules()
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = chunk_sizes(rounds, chunk_rounds)
+    histories = [None] * len(sizes)
+    if history_dir is not None:
+        Path(history_dir).mkdir(parents=True, exist_ok=True)
+        histories = [
+            (part_path(history_dir, index), index * chunk_rounds)
+            for index in range(len(sizes))
+        ]
+    tasks = [
+        (rules, strategy, seats, size, child, history, track_count)
+        for size, child, history in zip(sizes, seed_sequence.spawn(len(sizes)), histories)
+    ]
+    return seed_sequence, tasks
+
+
+def _merge(seed_sequence: np.random.SeedSequence, reports) -> SimulationReport:
+    report = SimulationReport(seed=seed_sequence.entropy)
+    for chunk_report in reports:
+        report.merge(chunk_report)
+    return report
+
+
+def simulate(
+    rounds: int,
+    rules: Rules | None = None,
+    strategy: Strategy = mimic_dealer,
+    seats: int = 1,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_rounds: int = 50_000,
+    history_dir: str | Path | None = None,
+    track_count: bool = False,
+) -> SimulationReport:
+    """
+    Simulate ``rounds`` rounds of a table and return the merged report.
+
+    Args:
+        rounds (int): Number of rounds to play.
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        strategy (Strategy): Picklable playing strategy used by every seat.
+        seats (int): Number of seats at the table.
+        seed (int | None): Master seed; a fresh one is drawn if omitted and
+            stored on the report.
+        workers (int | None): Worker processes, ``None`` uses every core and
+            ``1`` runs in the calling process.
+        chunk_rounds (int): Rounds per chunk, the unit of work and seeding.
+        history_dir (str | Path | None): Record every hand to one history
+            file per chunk in this directory.
+        track_count (bool): Keep the Hi-Lo true count to fill the report's
+            per-count buckets; implied by ``history_dir``.
+
+    Returns:
+        SimulationReport: The results of all rounds.
+    """
+    seed_sequence, tasks = _plan(
+        rounds, rules, strategy, seats, seed, chunk_rounds, history_dir, track_count
+    )
+
+    if workers == 1 or len(tasks) <= 1:
+        reports = list(map(_run_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_run_chunk, tasks))
+
+    return _merge(seed_sequence, reports)
+
+
+def simulate_threaded(
+    rounds: int,
+    rules: Rules | None = None,
+    strategy: Strategy = mimic_dealer,
+    seats: int = 1,
+    seed: int | None = None,
+    threads: int | None = None,
+    chunk_rounds: int = 50_000,
+    history_dir: str | Path | None = None,
+    track_count: bool = False,
+) -> SimulationReport:
+    """
+    Simulate ``rounds`` rounds on a thread pool; same results as ``simulate``.
+
+    The strategy is shared by all threads and must be thread-safe, which
+    charts and stateless functions are (see ``blackjack.concurrency``).
+
+    Args:
+        rounds (int): Number of rounds to play.
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        strategy (Strategy): Thread-safe playing strategy used by every seat.
+        seats (int): Number of seats at the table.
+        seed (int | None): Master seed; a fresh one is drawn if omitted and
+            stored on the report.
+        threads (int | None): Worker threads. ``None`` uses every core when
+            the GIL is disabled and the calling thread otherwise, since
+            threads cannot speed up the simulation while the GIL is held.
+        chunk_rounds (int): Rounds per chunk, the unit of work and seeding.
+        history_dir (str | Path | None): Record every hand to one history
+            file per chunk in this directory.
+        track_count (bool): Keep the Hi-Lo true count to fill the report's
+            per-count buckets; implied by ``history_dir``.
+
+    Returns:
+        SimulationReport: The results of all rounds.
+    """
+    seed_sequence, tasks = _plan(
+        rounds, rules, strategy, seats, seed, chunk_rounds, history_dir, track_count
+    )
+
+    if threads is None:
+        threads = (os.cpu_count() or 1) if not gil_enabled() else 1
+
+    if threads == 1 or len(tasks) <= 1:
+        reports = list(map(_run_chunk, tasks))
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            reports = list(pool.map(_run_chunk, tasks))
+
+    return _merge(seed_sequence, reports)
+
+
+def simulate_until(
+    target: float,
+    confidence: float = 0.95,
+    rules: Rules | None = None,
+    strategy: Strategy = mimic_dealer,
+    seats: int = 1,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_rounds: int = 50_000,
+    min_rounds: int = 100_000,
+    max_rounds: int | None = None,
+    progress: Callable[[Progress], None] | None = None,
+) -> SimulationReport:
+    """
+    Simulate chunks until the EV is known to within ``target``.
+
+    Args:
+        target (float): Half-width of the EV confidence interval to reach,
+            e.g. ``0.0001`` for +-0.01% of the initial bet.
+        confidence (float): Confidence level of the interval.
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        strategy (Strategy): Picklable playing strategy used by every seat.
+        seats (int): Number of seats at the table.
+        seed (int | None): Master seed; a fresh one is drawn if omitted and
+            stored on the report.
+        workers (int | None): Worker processes, ``None`` uses every core and
+            ``1`` runs in the calling process.
+        chunk_rounds (int): Rounds per chunk, the unit of work, seeding and
+            stopping.
+        min_rounds (int): Rounds to play before the variance is trusted.
+        max_rounds (int | None): Stop here even if the target is not reached.
+        progress (Callable[[Progress], None] | None): Called after every
+            chunk with the half-width reached so far and the time to target.
+
+    Returns:
+        SimulationReport: The results of all rounds played.
+    """
+    if target <= 0:
+        raise ValueError(f"target must be positive, got {target}")
+    if chunk_rounds < 1 or seats < 1 or (max_rounds is not None and max_rounds < 0):
+        raise ValueError("chunk_rounds and seats must be >= 1, max_rounds >= 0")
+
+    z = z_score(confidence)
+    rules = rules if rules is not None else Rules()
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = (
+        chunk_sizes(max_rounds, chunk_rounds)
+        if max_rounds is not None
+        else itertools.repeat(chunk_rounds)
+    )
+    # Spawning one child at a time yields the same children as ``_plan``.
+    tasks = (
+        (rules, strategy, seats, size, seed_sequence.spawn(1)[0], None, False)
+        for size in sizes
+    )
+    report = SimulationReport(seed=seed_sequence.entropy)
+
+    def measure(report: SimulationReport) -> tuple[int, float]:
+        if report.rounds < 2:
+            return report.rounds, math.inf
+        return report.rounds, z * report.ev_standard_error
+
+    if workers == 1:
+        run_adaptive(tasks, _run_chunk, report, measure, target, min_rounds, None, 1, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            depth = workers or os.cpu_count() or 1
+            run_adaptive(
+                tasks, _run_chunk, report, measure, target, min_rounds, pool, depth, progress
+            )
+
+    return report
@@ -0,0 +1,425 @@
+"""
+statistics.py
+
+Streaming, mergeable statistics of round results.
+
+``RoundStatistics`` updates in constant time per round. Its state is a fixed
+set of numbers, exported by ``state`` as four small arrays:
+
+* counts: rounds, hands and the number of hands per ``Outcome``;
+* moments: the mean and the sum of squared deviations (Welford) of the net
+  result per round, plus the initial bets, the amount wagered and the net;
+* drawdown: the highest and lowest cumulative net result (both starting at
+  zero) and the largest drop from a high to a later low;
+* buckets: rounds, mean, squared deviations and initial bets of the rounds
+  dealt at every (floored, clamped) true count.
+
+``merge`` combines two accumulators exactly (Chan et al. for the moments), so
+per-thread, per-process or checkpointed results can be added up without any
+per-round data. The drawdown depends on the order of the rounds: ``a.merge(b)``
+treats ``b``'s rounds as played after ``a``'s.
+
+The per-round scalars are plain slotted attributes rather than array
+elements, since indexing NumPy scalars costs more than the update itself;
+only the count buckets live in an array.
+"""
+
+import math
+from typing import Iterable
+
+import numpy as np
+
+from .outcome import Outcome
+
+# Columns of the buckets array.
+BUCKET_ROUNDS = 0
+BUCKET_MEAN = 1
+BUCKET_M2 = 2
+BUCKET_BETS = 3
+
+
+def _combine(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """Chan's parallel update of (n, mean, M2); works on scalars and arrays."""
+    n = n_a + n_b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta = mean_b - mean_a
+        weight = np.where(n > 0, n_b / np.where(n > 0, n, 1), 0.0)
+        mean = mean_a + delta * weight
+        m2 = m2_a + m2_b + delta * delta * n_a * weight
+    return n, mean, m2
+
+
+class RoundStatistics:
+    """
+    Mergeable accumulator of round results.
+
+    Args:
+        count_range (tuple[int, int]): Lowest and highest true count bucket;
+            true counts are floored and clamped into this range.
+    """
+
+    __slots__ = (
+        "_count_range",
+        "_rounds",
+        "_hands",
+        "_outcomes",
+        "_mean",
+        "_m2",
+        "_initial_bets",
+        "_wagered",
+        "_net",
+        "_peak",
+        "_trough",
+        "_max_drawdown",
+        "_buckets",
+    )
+
+    def __init__(self, count_range: tuple[int, int] = (-10, 10)):
+        low, high = count_range
+        if low > high:
+            raise ValueError(f"Invalid count range {count_range}")
+
+        self._count_range = (int(low), int(high))
+        self._rounds = 0
+        self._hands = 0
+        self._outcomes = [0] * len(Outcome)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._initial_bets = 0.0
+        self._wagered = 0.0
+        self._net = 0.0
+        self._peak = 0.0
+        self._trough = 0.0
+        self._max_drawdown = 0.0
+        self._buckets = np.zeros((high - low + 1, 4))
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def count_range(self) -> tuple[int, int]:
+        return self._count_range
+
+    @property
+    def rounds(self) -> int:
+        return self._rounds
+
+    @property
+    def hands(self) -> int:
+        return self._hands
+
+    @property
+    def outcomes(self) -> list[int]:
+        """Number of hands per ``Outcome``."""
+        return list(self._outcomes)
+
+    @property
+    def wins(self) -> int:
+        return self._outcomes[Outcome.WIN] + self._outcomes[Outcome.BLACKJACK]
+
+    @property
+    def losses(self) -> int:
+        return self._outcomes[Outcome.LOSS] + self._outcomes[Outcome.SURRENDER]
+
+    @property
+    def pushes(self) -> int:
+        return self._outcomes[Outcome.PUSH]
+
+    @property
+    def initial_bets(self) -> float:
+        return self._initial_bets
+
+    @property
+    def wagered(self) -> float:
+        return self._wagered
+
+    @property
+    def net(self) -> float:
+        return self._net
+
+    @property
+    def ev(self) -> float:
+        """Expected net result per initial bet."""
+        return self._net / self._initial_bets if self._initial_bets else 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean net result per round."""
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the net result of a round."""
+        return self._m2 / (self._rounds - 1) if self._rounds > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def standard_error(self) -> float:
+        """Standard error of the mean net result per round."""
+        return self.std / math.sqrt(self._rounds) if self._rounds > 1 else 0.0
+
+    @property
+    def ev_standard_error(self) -> float:
+        """Standard error of ``ev`` (exact for flat bets)."""
+        if not self._initial_bets:
+            return 0.0
+        return self.standard_error * self._rounds / self._initial_bets
+
+    @property
+    def peak(self) -> float:
+        return self._peak
+
+    @property
+    def trough(self) -> float:
+        return self._trough
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest drop of the cumulative net result from a high to a later low."""
+        return self._max_drawdown
+
+    @property
+    def true_counts(self) -> np.ndarray:
+        """The true count of every bucket, lowest first."""
+        low, high = self._count_range
+        return np.arange(low, high + 1)
+
+    @property
+    def bucket_rounds(self) -> np.ndarray:
+        return self._buckets[:, BUCKET_ROUNDS].astype(np.int64)
+
+    @property
+    def bucket_ev(self) -> np.ndarray:
+        """EV per initial bet of the rounds dealt at every true count (NaN if none)."""
+        buckets = self._buckets
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return buckets[:, BUCKET_MEAN] * buckets[:, BUCKET_ROUNDS] / buckets[:, BUCKET_BETS]
+
+    @property
+    def bucket_std(self) -> np.ndarray:
+        """Standard deviation of the round net result at every true count."""
+        n = self._buckets[:, BUCKET_ROUNDS]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(np.where(n > 1, self._buckets[:, BUCKET_M2] / (n - 1), np.nan))
+
+    # ----------------------------------------------
+    # Updates
+    # ----------------------------------------------
+    def add(
+        self,
+        net: float,
+        initial_bet: float = 1.0,
+        wager: float | None = None,
+        outcomes: Iterable[int] = (),
+        true_count: float = math.nan,
+    ) -> None:
+        """
+        Add one round.
+
+        Args:
+            net (float): Net result of the round.
+            initial_bet (float): Bet placed before the deal.
+            wager (float | None): Total amount wagered, ``initial_bet`` if omitted.
+            outcomes (Iterable[int]): ``Outcome`` of every hand of the round.
+            true_count (float): True count at the deal, NaN if unknown.
+        """
+        self._rounds += 1
+        counts = self._outcomes
+        for outcome in outcomes:
+            counts[outcome] += 1
+            self._hands += 1
+
+        delta = net - self._mean
+        self._mean += delta / self._rounds
+        self._m2 += delta * (net - self._mean)
+        self._initial_bets += initial_bet
+        self._wagered += initial_bet if wager is None else wager
+        self._net += net
+
+        total = self._net
+        if total > self._peak:
+            self._peak = total
+        elif total < self._trough:
+            self._trough = total
+        if self._peak - total > self._max_drawdown:
+            self._max_drawdown = self._peak - total
+
+        if true_count == true_count:  # not NaN
+            low, high = self._count_range
+            bucket = self._buckets[min(max(math.floor(true_count), low), high) - low]
+            bucket[BUCKET_ROUNDS] += 1
+            delta = net - bucket[BUCKET_MEAN]
+            bucket[BUCKET_MEAN] += delta / bucket[BUCKET_ROUNDS]
+            bucket[BUCKET_M2] += delta * (net - bucket[BUCKET_MEAN])
+            bucket[BUCKET_BETS] += initial_bet
+
+        return None
+
+    def add_round(self, result, initial_bet: float, true_count: float = math.nan) -> None:
+        self.add(
+            result.net,
+            initial_bet,
+            result.wager,
+            [hand.outcome for hand in result.hands],
+            true_count,
+        )
+
+        return None
+
+    def add_many(
+        self,
+        net: np.ndarray,
+        initial_bet: np.ndarray | float = 1.0,
+        wager: np.ndarray | float | None = None,
+        outcomes: np.ndarray | None = None,
+        true_count: np.ndarray | None = None,
+    ) -> None:
+        """
+        Add a batch of rounds in order, e.g. from a vectorized simulator.
+
+        Args:
+            net (np.ndarray): Net result of every round.
+            initial_bet (np.ndarray | float): Initial bet of every round.
+            wager (np.ndarray | float | None): Amount wagered, the initial bet
+                if omitted.
+            outcomes (np.ndarray | None): ``Outcome`` of every hand.
+            true_count (np.ndarray | None): True count at every deal.
+        """
+        net = np.asarray(net, dtype=np.float64)
+        if not len(net):
+            return None
+        bets = np.broadcast_to(np.asarray(initial_bet, dtype=np.float64), net.shape)
+        wager = bets if wager is None else np.broadcast_to(wager, net.shape)
+
+        batch = RoundStatistics(self._count_range)
+        batch._rounds = len(net)
+        if outcomes is not None:
+            outcomes = np.asarray(outcomes, dtype=np.intp)
+            batch._hands = len(outcomes)
+            batch._outcomes = np.bincount(outcomes, minlength=len(Outcome)).tolist()
+
+        batch._mean = float(net.mean())
+        batch._m2 = float(np.square(net - batch._mean).sum())
+        batch._initial_bets = float(bets.sum())
+        batch._wagered = float(np.sum(wager))
+        batch._net = float(net.sum())
+
+        total = np.cumsum(net)
+        peak = np.maximum.accumulate(np.maximum(total, 0.0))
+        batch._peak = float(peak[-1])
+        batch._trough = min(float(total.min()), 0.0)
+        batch._max_drawdown = float((peak - total).max())
+
+        if true_count is not None:
+            true_count = np.asarray(true_count, dtype=np.float64)
+            known = ~np.isnan(true_count)
+            low, high = self._count_range
+            index = np.clip(np.floor(true_count[known]), low, high).astype(np.intp) - low
+            size = len(self._buckets)
+            n = np.bincount(index, minlength=size).astype(np.float64)
+            sums = np.bincount(index, weights=net[known], minlength=size)
+            means = np.divide(sums, n, out=np.zeros(size), where=n > 0)
+            buckets = batch._buckets
+            buckets[:, BUCKET_ROUNDS] = n
+            buckets[:, BUCKET_MEAN] = means
+            buckets[:, BUCKET_M2] = np.bincount(
+                index, weights=np.square(net[known] - means[index]), minlength=size
+            )
+            buckets[:, BUCKET_BETS] = np.bincount(index, weights=bets[known], minlength=size)
+
+        self.merge(batch)
+        return None
+
+    def merge(self, other: "RoundStatistics") -> "RoundStatistics":
+        """Add ``other``'s rounds as if they were played after this one's."""
+        if other._count_range != self._count_range:
+            raise ValueError(
+                f"Cannot merge count ranges {other._count_range} and {self._count_range}"
+            )
+
+        _, mean, m2 = _combine(
+            self._rounds, self._mean, self._m2, other._rounds, other._mean, other._m2
+        )
+        self._mean = float(mean)
+        self._m2 = float(m2)
+
+        net = self._net
+        self._max_drawdown = max(
+            self._max_drawdown, other._max_drawdown, self._peak - (net + other._trough)
+        )
+        self._peak = max(self._peak, net + other._peak)
+        self._trough = min(self._trough, net + other._trough)
+
+        self._rounds += other._rounds
+        self._hands += other._hands
+        self._outcomes = [a + b for a, b in zip(self._outcomes, other._outcomes)]
+        self._initial_bets += other._initial_bets
+        self._wagered += other._wagered
+        self._net += other._net
+
+        a, b = self._buckets, other._buckets
+        n, means, m2s = _combine(
+            a[:, BUCKET_ROUNDS], a[:, BUCKET_MEAN], a[:, BUCKET_M2],
+            b[:, BUCKET_ROUNDS], b[:, BUCKET_MEAN], b[:, BUCKET_M2],
+        )
+        a[:, BUCKET_ROUNDS] = n
+        a[:, BUCKET_MEAN] = means
+        a[:, BUCKET_M2] = m2s
+        a[:, BUCKET_BETS] += b[:, BUCKET_BETS]
+
+        return self
+
+    # ----------------------------------------------
+    # Checkpoints
+    # ----------------------------------------------
+    def state(self) -> dict[str, np.ndarray]:
+        """The state as arrays, e.g. for ``np.savez``."""
+        return {
+            "count_range": np.array(self._count_range),
+            "counts": np.array([self._rounds, self._hands, *self._outcomes], dtype=np.int64),
+            "moments": np.array(
+                [self._mean, self._m2, self._initial_bets, self._wagered, self._net]
+            ),
+            "drawdown": np.array([self._peak, self._trough, self._max_drawdown]),
+            "buckets": self._buckets.copy(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, np.ndarray]) -> "RoundStatistics":
+        # Subclasses take other constructor arguments, so restore without __init__.
+        statistics = cls.__new__(cls)
+        statistics._restore(state)
+        return statistics
+
+    def _restore(self, state: dict[str, np.ndarray]) -> None:
+        """Set every field from ``state``; subclasses extend it with their own."""
+        self._count_range = tuple(int(x) for x in state["count_range"])
+        rounds, hands, *outcomes = (int(x) for x in state["counts"])
+        self._rounds = rounds
+        self._hands = hands
+        self._outcomes = outcomes
+        (
+            self._mean,
+            self._m2,
+            self._initial_bets,
+            self._wagered,
+            self._net,
+        ) = (float(x) for x in state["moments"])
+        self._peak, self._trough, self._max_drawdown = (
+            float(x) for x in state["drawdown"]
+        )
+        self._buckets = np.array(state["buckets"], dtype=np.float64)
+
+        return None
+
+    def copy(self) -> "RoundStatistics":
+        return type(self).from_state(self.state())
+
+    def __repr__(self) -> str:
+        return (
+            f"RoundStatistics(rounds={self.rounds}, ev={self.ev:.5f}, "
+            f"std={self.std:.4f}, max_drawdown={self.max_drawdown})"
+        )
@@ -0,0 +1,31 @@
+"""
+strategy.py
+
+This module defines the player decisions and the strategy protocol. A strategy
+is any callable that receives the hand to play, the dealer's upcard and the set
+of actions allowed in the current situation, and returns one of those actions.
+Strategies used with the process-based simulation must be picklable, i.e.
+module-level functions or instances of module-level classes.
+"""
+
+from enum import IntEnum
+from typing import Callable
+
+from .card import Card
+from .hand import Hand
+
+
+class Action(IntEnum):
+    STAND = 0
+    HIT = 1
+    DOUBLE = 2
+    SPLIT = 3
+    SURRENDER = 4
+
+
+Strategy = Callable[[Hand, Card, frozenset[Action]], Action]
+
+
+def mimic_dealer(hand: Hand, upcard: Card, allowed: frozenset[Action]) -> Action:
+    """Hit below 17 and stand otherwise, never double, split or surrender."""
+    return Action.HIT if hand.score < 17 else Action.STAND
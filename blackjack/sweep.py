@@ -0,0 +1,483 @@
+"""
+sweep.py
+
+Rule and strategy sweeps with common random numbers.
+
+A sweep plays a list of ``Configuration`` objects (rules plus strategy) on
+the same sequence of shoes and returns the EV difference of every pair of
+configurations with a confidence interval.
+
+Shoe ``s`` of a chunk is dealt, for every configuration, from the same cards:
+each fresh shoe starts in new-deck order, and its generator is seeded from
+the ``s``-th child of the chunk's ``SeedSequence`` before it is shuffled,
+cut and given its end-of-shoe marker. Configurations that draw the same
+cards (3:2 against 6:5, or two strategies that agree on most hands) play
+nearly the same rounds, and their results are strongly correlated. The
+correlation fades after the first round in which they draw a different
+number of cards, but it never goes negative, so pairing can only help.
+Configurations with different deck counts cannot share cards. They are
+paired all the same, which is still valid but reduces no variance.
+
+A shoe is the unit of pairing. For every shoe the sweep records each
+configuration's net result and initial bets. ``SweepReport`` accumulates the
+mean vector and the co-moment matrix of these per-shoe sums, which it can
+merge exactly. The EV of a configuration is its ratio of net to bets. Its
+covariance with every other EV follows from the co-moments by the delta
+method, so ``EV[a] - EV[b]`` gets a standard error that includes the
+covariance that the shared shoes create.
+
+``sweep_until`` plays chunks until the widest confidence interval of the
+deltas is as narrow as requested (see ``chunking.run_adaptive``).
+
+A shoe that runs dry mid-round is completed from the tray with the shoe's
+own generator, as in ``Game``, and does not use up a seed. The sweep always
+plays whole shoes, so a continuous shuffling machine (``Rules.csm``) cannot
+be swept.
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from .chunking import Progress, chunk_sizes, run_adaptive, z_score
+from .game import Game
+from .player import Player
+from .rules import Rules
+from .shuffles import ShuffleProcedure
+from .statistics import RoundStatistics
+from .strategy import Strategy, mimic_dealer
+
+
+class Configuration(NamedTuple):
+    """A named combination of table rules and playing strategy."""
+
+    name: str
+    rules: Rules
+    strategy: Strategy = mimic_dealer
+
+
+class Delta(NamedTuple):
+    """Difference of two EVs with its standard error and confidence interval."""
+
+    delta: float
+    standard_error: float
+    low: float
+    high: float
+
+
+def grid(
+    strategies: dict[str, Strategy] | None = None,
+    base: Rules | None = None,
+    **options: list,
+) -> list[Configuration]:
+    """
+    Every combination of rule options and strategies.
+
+    Args:
+        strategies (dict[str, Strategy] | None): Strategies by name,
+            ``mimic_dealer`` alone if omitted.
+        base (Rules | None): Rules that the options change, ``Rules()`` if omitted.
+        **options (list): Values of ``Rules`` fields, e.g.
+            ``hit_soft_17=[False, True]``.
+
+    Returns:
+        list[Configuration]: One configuration per combination. Each is named
+        after the values it sets, with the strategy first.
+    """
+    base = base if base is not None else Rules()
+    strategies = strategies if strategies is not None else {"mimic_dealer": mimic_dealer}
+    fields = list(options)
+
+    configurations = []
+    for (label, strategy), *values in itertools.product(
+        strategies.items(), *options.values()
+    ):
+        changes = dict(zip(fields, values))
+        parts = ([label] if len(strategies) > 1 else []) + [
+            f"{field}={value}" for field, value in changes.items()
+        ]
+        configurations.append(
+            Configuration(", ".join(parts) or label, replace(base, **changes), strategy)
+        )
+
+    return configurations
+
+
+class SweepReport:
+    """
+    Paired per-shoe results of a sweep.
+
+    Args:
+        names (list[str]): Name of every configuration, in sweep order.
+        seed (int | None): Master seed of the sweep.
+    """
+
+    __slots__ = ("_names", "_index", "_shoes", "_mean", "_m2", "_statistics", "seed")
+
+    def __init__(self, names: list[str], seed: int | None = None):
+        if len(set(names)) != len(names):
+            raise ValueError(f"Configuration names must be unique, got {names}")
+
+        self._names = list(names)
+        self._index = {name: index for index, name in enumerate(names)}
+        size = 2 * len(names)
+        self._shoes = 0
+        # Per-shoe sums [net of every configuration, bets of every configuration].
+        self._mean = np.zeros(size)
+        self._m2 = np.zeros((size, size))
+        self._statistics = [RoundStatistics() for _ in names]
+        self.seed = seed
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def names(self) -> list[str]:
+        return list(self._names)
+
+    @property
+    def shoes(self) -> int:
+        return self._shoes
+
+    @property
+    def statistics(self) -> dict[str, RoundStatistics]:
+        """Round statistics of every configuration's table."""
+        return dict(zip(self._names, self._statistics))
+
+    @property
+    def ev(self) -> np.ndarray:
+        """EV per initial bet of every configuration."""
+        n = len(self._names)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._mean[:n] / self._mean[n:]
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Covariance matrix of the EV estimates (delta method)."""
+        n = len(self._names)
+        if self._shoes < 2:
+            return np.full((n, n), math.nan)
+
+        ev = self.ev
+        bets = self._mean[n:]
+        # Gradient of every EV with respect to the mean per-shoe sums.
+        gradient = np.zeros((2 * n, n))
+        gradient[np.arange(n), np.arange(n)] = 1.0 / bets
+        gradient[n + np.arange(n), np.arange(n)] = -ev / bets
+        shoe_covariance = self._m2 / (self._shoes - 1)
+        return gradient.T @ shoe_covariance @ gradient / self._shoes
+
+    @property
+    def deltas(self) -> np.ndarray:
+        """``deltas[a, b]`` is ``EV[a] - EV[b]``."""
+        ev = self.ev
+        return ev[:, None] - ev[None, :]
+
+    @property
+    def standard_errors(self) -> np.ndarray:
+        """Standard error of every entry of ``deltas`` on the shared shoes."""
+        covariance = self.covariance
+        variances = np.diag(covariance)
+        paired = variances[:, None] + variances[None, :] - 2 * covariance
+        return np.sqrt(np.maximum(paired, 0.0))
+
+    @property
+    def independent_standard_errors(self) -> np.ndarray:
+        """
+        Standard error of every entry of ``deltas`` had the configurations
+        been played on independent shoes (same number of shoes each).
+        """
+        variances = np.diag(self.covariance)
+        independent = np.sqrt(variances[:, None] + variances[None, :])
+        np.fill_diagonal(independent, 0.0)
+        return independent
+
+    @property
+    def variance_reduction(self) -> np.ndarray:
+        """Independent over paired variance of every delta (NaN on the diagonal)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.square(self.independent_standard_errors / self.standard_errors)
+
+    # -----------------------------------------------
+    # functions
+    # -----------------------------------------------
+    def confidence_intervals(
+        self, confidence: float = 0.95
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Lower and upper bounds of every entry of ``deltas``."""
+        half_width = z_score(confidence) * self.standard_errors
+        deltas = self.deltas
+        return deltas - half_width, deltas + half_width
+
+    def delta(self, a: str, b: str, confidence: float = 0.95) -> Delta:
+        """``EV[a] - EV[b]`` with its confidence interval."""
+        i, j = self._index[a], self._index[b]
+        delta = float(self.deltas[i, j])
+        standard_error = float(self.standard_errors[i, j])
+        half_width = z_score(confidence) * standard_error
+        return Delta(delta, standard_error, delta - half_width, delta + half_width)
+
+    def add_shoes(self, net: np.ndarray, bets: np.ndarray) -> None:
+        """
+        Add a batch of shoes.
+
+        Args:
+            net (np.ndarray): Net result of every shoe (rows) and
+                configuration (columns).
+            bets (np.ndarray): Initial bets of every shoe and configuration.
+        """
+        sums = np.hstack([np.asarray(net, dtype=np.float64), np.asarray(bets, dtype=np.float64)])
+        if sums.shape[1] != len(self._mean):
+            raise ValueError(
+                f"Expected {len(self._names)} configurations, got {sums.shape[1] // 2}"
+            )
+        if not len(sums):
+            return None
+
+        mean = sums.mean(axis=0)
+        centered = sums - mean
+        self._combine(len(sums), mean, centered.T @ centered)
+        return None
+
+    def merge(self, other: "SweepReport") -> "SweepReport":
+        """Add ``other``'s shoes and rounds to this report."""
+        if other._names != self._names:
+            raise ValueError(f"Cannot merge sweeps of {other._names} and {self._names}")
+
+        self._combine(other._shoes, other._mean, other._m2)
+        for statistics, other_statistics in zip(self._statistics, other._statistics):
+            statistics.merge(other_statistics)
+
+        return self
+
+    @property
+    def widest_standard_error(self) -> float:
+        """
+        Largest standard error of a delta, or of the EV of a lone
+        configuration; infinite until two shoes were played.
+        """
+        if self._shoes < 2:
+            return math.inf
+        if len(self._names) == 1:
+            return math.sqrt(self.covariance[0, 0])
+        return float(self.standard_errors.max())
+
+    def _combine(self, shoes: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        # Chan et al. with a co-moment matrix instead of a scalar M2.
+        total = self._shoes + shoes
+        if not shoes:
+            return None
+        delta = mean - self._mean
+        weight = shoes / total
+        self._m2 += m2 + np.outer(delta, delta) * self._shoes * weight
+        self._mean += delta * weight
+        self._shoes = total
+
+        return None
+
+    def __repr__(self) -> str:
+        return f"SweepReport(configurations={len(self._names)}, shoes={self._shoes})"
+
+
+# ---------------------------------------------
+# Shared shoes
+# ---------------------------------------------
+class _SharedShoeGame(Game):
+    """A game that deals its ``s``-th fresh shoe from ``shoe_seeds[s]``."""
+
+    def __init__(
+        self,
+        shoe_seeds: list[np.random.SeedSequence],
+        players: list[Player],
+        rules: Rules,
+        shuffle_procedure: ShuffleProcedure | None,
+    ):
+        self._shoe_seeds = shoe_seeds
+        self.shoe = -1
+        super().__init__(
+            players=players, rules=rules, rng=shoe_seeds[0], shuffle_procedure=shuffle_procedure
+        )
+
+    def _prepare_shoe(self) -> None:
+        deck = self._deck
+        if len(deck) == deck.capacity:
+            # A fresh shoe: the same starting order and generator for every game.
+            self.shoe += 1
+            deck.restore_order(self._shoe_seeds[self.shoe])
+        super()._prepare_shoe()
+
+        return None
+
+
+def _run_chunk(
+    task: tuple[list[Configuration], int, int, np.random.SeedSequence, ShuffleProcedure | None],
+) -> SweepReport:
+    configurations, seats, shoes, seed_sequence, shuffle_procedure = task
+    # One spare seed for the shoe prepared after the last round.
+    shoe_seeds = seed_sequence.spawn(shoes + 1)
+
+    report = SweepReport([configuration.name for configuration in configurations])
+    net = np.zeros((shoes, len(configurations)))
+    bets = np.zeros((shoes, len(configurations)))
+    for column, configuration in enumerate(configurations):
+        players = [
+            Player(name=f"Seat {seat + 1}", strategy=configuration.strategy)
+            for seat in range(seats)
+        ]
+        game = _SharedShoeGame(shoe_seeds, players, configuration.rules, shuffle_procedure)
+        initial_bet = sum(player.bet for player in players)
+        shoe_net, shoe_bets = net[:, column], bets[:, column]
+        while game.shoe < shoes:
+            shoe = game.shoe
+            shoe_net[shoe] += game.play_round().net
+            shoe_bets[shoe] += initial_bet
+        report._statistics[column] = game.statistics
+
+    report.add_shoes(net, bets)
+    return report
+
+
+def _prepare(configurations: list[Configuration]) -> tuple[list[Configuration], SweepReport]:
+    if not configurations:
+        raise ValueError("A sweep needs at least one configuration")
+    for configuration in configurations:
+        if configuration.rules.csm:
+            raise ValueError(
+                f"{configuration.name!r} uses a continuous shuffling machine, "
+                "which deals no shoes to share"
+            )
+
+    configurations = list(configurations)
+    return configurations, SweepReport([configuration.name for configuration in configurations])
+
+
+def sweep(
+    configurations: list[Configuration],
+    shoes: int,
+    seats: int = 1,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_shoes: int = 500,
+    shuffle_procedure: ShuffleProcedure | None = None,
+) -> SweepReport:
+    """
+    Play every configuration on the same ``shoes`` shoes.
+
+    Args:
+        configurations (list[Configuration]): Rules and strategies to compare,
+            with unique names.
+        shoes (int): Number of shoes every configuration plays.
+        seats (int): Number of seats at every table.
+        seed (int | None): Master seed; a fresh one is drawn if omitted and
+            stored on the report.
+        workers (int | None): Worker processes, ``None`` uses every core and
+            ``1`` runs in the calling process.
+        chunk_shoes (int): Shoes per chunk, the unit of work and seeding.
+        shuffle_procedure (ShuffleProcedure | None): Physical shuffle of every
+            shoe, a uniform shuffle if omitted.
+
+    Returns:
+        SweepReport: The paired results of all configurations.
+    """
+    if shoes < 0 or chunk_shoes < 1 or seats < 1:
+        raise ValueError("shoes must be >= 0, chunk_shoes and seats >= 1")
+    configurations, report = _prepare(configurations)
+    seed_sequence = np.random.SeedSequence(seed)
+    sizes = chunk_sizes(shoes, chunk_shoes)
+    tasks = [
+        (configurations, seats, size, child, shuffle_procedure)
+        for size, child in zip(sizes, seed_sequence.spawn(len(sizes)))
+    ]
+
+    if workers == 1 or len(tasks) <= 1:
+        reports = list(map(_run_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            reports = list(pool.map(_run_chunk, tasks))
+
+    report.seed = seed_sequence.entropy
+    for chunk_report in reports:
+        report.merge(chunk_report)
+    return report
+
+
+def sweep_until(
+    configurations: list[Configuration],
+    target: float,
+    confidence: float = 0.95,
+    seats: int = 1,
+    seed: int | None = None,
+    workers: int | None = None,
+    chunk_shoes: int = 500,
+    min_shoes: int = 1_000,
+    max_shoes: int | None = None,
+    shuffle_procedure: ShuffleProcedure | None = None,
+    progress: Callable[[Progress], None] | None = None,
+) -> SweepReport:
+    """
+    Play shared shoes until every EV delta is known to within ``target``.
+
+    Stops once the widest confidence interval of the deltas (of the EV, for
+    a single configuration) has a half-width of at most ``target``. A run
+    that stops after ``k`` chunks equals ``sweep`` of ``k`` chunks with the
+    same seed.
+
+    Args:
+        configurations (list[Configuration]): Rules and strategies to compare,
+            with unique names.
+        target (float): Half-width to reach, e.g. ``0.0001`` for +-0.01%.
+        confidence (float): Confidence level of the intervals.
+        seats (int): Number of seats at every table.
+        seed (int | None): Master seed; a fresh one is drawn if omitted and
+            stored on the report.
+        workers (int | None): Worker processes, ``None`` uses every core and
+            ``1`` runs in the calling process.
+        chunk_shoes (int): Shoes per chunk, the unit of work, seeding and
+            stopping.
+        min_shoes (int): Shoes to play before the variances are trusted.
+        max_shoes (int | None): Stop here even if the target is not reached.
+        shuffle_procedure (ShuffleProcedure | None): Physical shuffle of every
+            shoe, a uniform shuffle if omitted.
+        progress (Callable[[Progress], None] | None): Called after every
+            chunk with the half-width reached so far and the time to target.
+
+    Returns:
+        SweepReport: The paired results of all configurations.
+    """
+    if target <= 0:
+        raise ValueError(f"target must be positive, got {target}")
+    if chunk_shoes < 1 or seats < 1 or (max_shoes is not None and max_shoes < 0):
+        raise ValueError("chunk_shoes and seats must be >= 1, max_shoes >= 0")
+    z = z_score(confidence)
+    configurations, report = _prepare(configurations)
+    seed_sequence = np.random.SeedSequence(seed)
+    report.seed = seed_sequence.entropy
+    sizes = (
+        chunk_sizes(max_shoes, chunk_shoes)
+        if max_shoes is not None
+        else itertools.repeat(chunk_shoes)
+    )
+    # Spawning one child at a time yields the same children as ``sweep``.
+    tasks = (
+        (configurations, seats, size, seed_sequence.spawn(1)[0], shuffle_procedure)
+        for size in sizes
+    )
+
+    def measure(report: SweepReport) -> tuple[int, float]:
+        return report.shoes, z * report.widest_standard_error
+
+    if workers == 1:
+        run_adaptive(tasks, _run_chunk, report, measure, target, min_shoes, None, 1, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            depth = workers or os.cpu_count() or 1
+            run_adaptive(
+                tasks, _run_chunk, report, measure, target, min_shoes, pool, depth, progress
+            )
+
+    return report
@@ -0,0 +1,285 @@
+"""
+vectorized.py
+
+Lockstep simulator that plays many independent shoes at once with NumPy.
+
+``LockstepSimulator`` keeps ``K`` shoes as one ``(K, decks * 52)`` array of
+card codes with a cursor per shoe. Every call to ``play_round`` plays one
+round on every shoe: the cards are dealt, the player's decisions are looked
+up in a ``StrategyTable`` and the dealer draws, all with masked array
+operations over the shoes that are still acting. One Python-level step
+therefore moves every table forward by one round.
+
+The shoes follow the ``Deck`` semantics so the results can be checked
+against ``Game``: a shoe is shuffled (uniformly, or by a ``ShuffleProcedure``
+starting from new-deck order), cut at a uniformly random position and
+gets an end-of-shoe marker from ``rules.end_of_shoe_range``; once the
+remaining cards fall to the marker, the shoe is reshuffled after the round. A shoe
+that runs dry mid-round is refilled like ``Game`` does: the cards of the
+earlier rounds are shuffled, cut and marked again, while the cards of the
+current round stay out until the next full reshuffle. Cards are dealt
+player, dealer, player, dealer, the dealer peeks for naturals, and hands are
+settled like in ``Game``.
+
+The table has one seat and pairs are not split: a pair is played by its
+total. Compare it with ``Game`` using a chart without split decisions.
+"""
+
+import numpy as np
+
+from .card import Card, NUM_CODES
+from .basic_strategy import HARD, SOFT, StrategyTable
+from .deck import RandomSource
+from .game import Outcome
+from .hand_batch import ACE_FLAGS, HARD_VALUES
+from .probability import value_class
+from .rules import Rules
+from .shuffles import ShuffleProcedure, cut
+from .simulation import SimulationReport
+from .strategy import Action
+
+_UPCARD_CLASS = np.array(
+    [value_class(Card.from_code(code)) for code in range(NUM_CODES)], dtype=np.intp
+)
+
+
+class LockstepSimulator:
+    """
+    Plays ``shoes`` independent single-seat tables in lockstep.
+
+    Args:
+        shoes (int): Number of tables (shoes) played at once.
+        strategy (StrategyTable): Compiled chart used for every decision.
+        rules (Rules | None): Table rules, ``Rules()`` if omitted.
+        rng (RandomSource): Generator or seed for shuffles, cuts and markers.
+        shuffle_procedure (ShuffleProcedure | None): Physical shuffle of the
+            shoes, a uniform shuffle if omitted.
+    """
+
+    def __init__(
+        self,
+        shoes: int,
+        strategy: StrategyTable,
+        rules: Rules | None = None,
+        rng: RandomSource = None,
+        shuffle_procedure: ShuffleProcedure | None = None,
+    ):
+        if shoes < 1:
+            raise ValueError(f"At least one shoe is required, got {shoes}")
+        if rules is not None and rules.csm:
+            raise ValueError("The lockstep simulator only plays shoe games, not CSM")
+
+        self._rules = rules if rules is not None else Rules()
+        self._rng = np.random.default_rng(rng)
+        self._shuffle_procedure = shuffle_procedure
+        self._decisions = strategy.decisions
+        self._fallbacks = strategy.fallbacks
+
+        self._n_cards = self._rules.decks * NUM_CODES
+        self._ordered = np.tile(np.arange(NUM_CODES, dtype=np.uint8), self._rules.decks)
+        self._shoes = np.empty((shoes, self._n_cards), dtype=np.uint8)
+        self._cursor = np.zeros(shoes, dtype=np.intp)
+        self._threshold = np.zeros(shoes, dtype=np.intp)
+        # Cursor at the start of the current round: cards before it are discards.
+        self._round_start = np.zeros(shoes, dtype=np.intp)
+        self._rounds_played = 0
+
+        self._prepare_shoes(np.arange(shoes))
+
+    # -----------------------------------------------
+    # properties
+    # -----------------------------------------------
+    @property
+    def shoes(self) -> np.ndarray:
+        return self._shoes
+
+    @property
+    def cursor(self) -> np.ndarray:
+        return self._cursor
+
+    @property
+    def remaining(self) -> np.ndarray:
+        return self._n_cards - self._cursor
+
+    @property
+    def rounds_played(self) -> int:
+        return self._rounds_played
+
+    # -----------------------------------------------
+    # Shoe handling
+    # -----------------------------------------------
+    def _prepare_shoes(self, rows: np.ndarray) -> None:
+        """Shuffle, cut and place the end-of-shoe marker for ``rows``."""
+        n = len(rows)
+        ordered = np.broadcast_to(self._ordered, (n, self._n_cards))
+        if self._shuffle_procedure is None:
+            shuffled = self._rng.permuted(ordered, axis=1)
+        else:
+            shuffled = self._shuffle_procedure(ordered, self._rng)
+        self._shoes[rows] = cut(shuffled, self._rng.integers(self._n_cards, size=n))
+        self._cursor[rows] = 0
+        remaining_min, remaining_max = self._rules.end_of_shoe_range
+        self._threshold[rows] = self._rng.integers(
+            remaining_min, remaining_max, size=n, endpoint=True
+        )
+
+        return None
+
+    def _refill(self, rows: np.ndarray) -> None:
+        """Reshuffle the discards of the dry ``rows`` behind the cards in play."""
+        remaining_min, remaining_max = self._rules.end_of_shoe_range
+        for row in rows:
+            start = self._round_start[row]
+            if not start:
+                raise RuntimeError(f"Shoe {row} ran dry with no discards to reshuffle")
+
+            shoe = self._shoes[row]
+            discards = shoe[None, :start]
+            if self._shuffle_procedure is None:
+                shuffled = self._rng.permuted(discards, axis=1)
+            else:
+                shuffled = self._shuffle_procedure(discards, self._rng)
+            in_play = self._n_cards - start
+            shoe[:in_play] = shoe[start:].copy()
+            shoe[in_play:] = cut(shuffled, self._rng.integers(start))[0]
+            self._cursor[row] = in_play
+            self._round_start[row] = 0
+            self._threshold[row] = self._rng.integers(
+                min(remaining_min, start - 1), min(remaining_max, start - 1), endpoint=True
+            )
+
+        return None
+
+    def _draw(self, rows: np.ndarray) -> np.ndarray:
+        cursor = self._cursor
+        dry = rows[cursor[rows] == self._n_cards]
+        if len(dry):
+            self._refill(dry)
+        codes = self._shoes[rows, cursor[rows]]
+        cursor[rows] += 1
+        return codes
+
+    # -----------------------------------------------
+    # Round flow
+    # -----------------------------------------------
+    def play_round(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Play one round on every shoe.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Net result, wager and
+            ``Outcome`` of every shoe's hand.
+        """
+        rules = self._rules
+        k = len(self._shoes)
+        every = np.arange(k)
+
+        self._round_start[:] = self._cursor
+        p1 = self._draw(every)
+        d1 = self._draw(every)
+        p2 = self._draw(every)
+        d2 = self._draw(every)
+
+        p_hard = HARD_VALUES[p1] + HARD_VALUES[p2]
+        p_ace = ACE_FLAGS[p1] | ACE_FLAGS[p2]
+        n_cards = np.full(k, 2)
+        d_hard = HARD_VALUES[d1] + HARD_VALUES[d2]
+        d_ace = ACE_FLAGS[d1] | ACE_FLAGS[d2]
+        upcard = _UPCARD_CLASS[d1]
+
+        p_natural = p_ace & (p_hard == 11)
+        d_natural = d_ace & (d_hard == 11)
+
+        wager = np.ones(k)
+        surrendered = np.zeros(k, dtype=bool)
+        active = ~(p_natural | d_natural)
+
+        # Player decisions.
+        while True:
+            rows = np.flatnonzero(active)
+            if not len(rows):
+                break
+            hard = p_hard[rows]
+            soft = p_ace[rows] & (hard <= 11)
+            total = np.where(soft, hard + 10, hard)
+            kind = np.where(soft, SOFT, HARD)
+            up = upcard[rows]
+
+            action = self._decisions[kind, total, up]
+            first = n_cards[rows] == 2
+            not_allowed = ((action == Action.DOUBLE) & ~first) | (
+                (action == Action.SURRENDER) & ~(first & rules.surrender)
+            )
+            action = np.where(not_allowed, self._fallbacks[kind, total, up], action)
+
+            drawing = rows[(action == Action.HIT) | (action == Action.DOUBLE)]
+            doubling = rows[action == Action.DOUBLE]
+            surrendering = rows[action == Action.SURRENDER]
+
+            cards = self._draw(drawing)
+            p_hard[drawing] += HARD_VALUES[cards]
+            p_ace[drawing] |= ACE_FLAGS[cards]
+            n_cards[drawing] += 1
+            wager[doubling] = 2.0
+            surrendered[surrendering] = True
+
+            still = np.zeros(k, dtype=bool)
+            still[drawing] = True
+            still[doubling] = False
+            p_soft = p_ace & (p_hard <= 11)
+            active = still & (np.where(p_soft, p_hard + 10, p_hard) < 21)
+
+        p_total = np.where(p_ace & (p_hard <= 11), p_hard + 10, p_hard)
+        p_bust = p_hard > 21
+
+        # Dealer plays if the hand is still live.
+        dealer_stand_soft = 18 if rules.hit_soft_17 else 17
+        playing = ~(p_natural | d_natural | surrendered | p_bust)
+        while True:
+            d_soft = d_ace & (d_hard <= 11)
+            d_total = np.where(d_soft, d_hard + 10, d_hard)
+            hitting = playing & np.where(d_soft, d_total < dealer_stand_soft, d_total < 17)
+            rows = np.flatnonzero(hitting)
+            if not len(rows):
+                break
+            cards = self._draw(rows)
+            d_hard[rows] += HARD_VALUES[cards]
+            d_ace[rows] |= ACE_FLAGS[cards]
+
+        d_bust = d_hard > 21
+
+        # Settlement, in the same order as Game._settle.
+        outcome = np.where(p_total > d_total, Outcome.WIN, Outcome.LOSS)
+        outcome = np.where(p_total == d_total, Outcome.PUSH, outcome)
+        outcome = np.where(d_bust, Outcome.WIN, outcome)
+        outcome = np.where(p_natural, Outcome.BLACKJACK, outcome)
+        outcome = np.where(d_natural, np.where(p_natural, Outcome.PUSH, Outcome.LOSS), outcome)
+        outcome = np.where(p_bust, Outcome.LOSS, outcome)
+        outcome = np.where(surrendered, Outcome.SURRENDER, outcome)
+
+        net = np.select(
+            [
+                outcome == Outcome.WIN,
+                outcome == Outcome.BLACKJACK,
+                outcome == Outcome.LOSS,
+                outcome == Outcome.SURRENDER,
+            ],
+            [wager, wager * rules.blackjack_payout, -wager, -wager / 2],
+            default=0.0,
+        )
+
+        self._rounds_played += 1
+        exhausted = np.flatnonzero(self.remaining <= self._threshold)
+        if len(exhausted):
+            self._prepare_shoes(exhausted)
+
+        return net, wager, outcome
+
+    def run(self, rounds: int) -> SimulationReport:
+        """Play ``rounds`` rounds on every shoe and aggregate the results."""
+        report = SimulationReport()
+        for _ in range(rounds):
+            net, wager, outcome = self.play_round()
+            report.add_many(net, 1.0, wager, outcome)
+
+        return report
@@ -0,0 +1,111 @@
+from blackjack import Card
+from blackjack import Deck
+from blackjack import Hand
+from blackjack.analysis import PlayerAnalyzer, stand_value
+from blackjack.probability import remove_card, value_class, value_composition
+from blackjack.rules import Rules
+from blackjack.strategy import Action
+import pytest
+
+
+def make_hand(*ranks):
+    hand = Hand(role="player", name="Ocean")
+    for rank in ranks:
+        hand.add(Card(suit="Hearts", rank=rank))
+    return hand
+
+
+def unseen(hand, upcard, decks=6):
+    composition = value_composition([4 * decks] * 13)
+    for card in hand:
+        composition = remove_card(composition, value_class(card))
+    return remove_card(composition, upcard - 1)
+
+
+class TestStandValue:
+    def test_values(self):
+        dealer = [0.2, 0.2, 0.2, 0.2, 0.0, 0.2, 0.0]
+
+        assert stand_value(22, dealer) == -1
+        assert stand_value(16, dealer) == pytest.approx(0.2 - 0.8)
+        assert stand_value(19, dealer) == pytest.approx(0.6 - 0.2)
+        assert stand_value(21, dealer) == pytest.approx(1.0)
+
+
+class TestPlayerAnalyzer:
+    @pytest.mark.parametrize(
+        "ranks, upcard, expected",
+        [
+            (("6", "5"), 6, Action.DOUBLE),
+            (("10", "Queen"), 6, Action.STAND),
+            (("8", "8"), 10, Action.SPLIT),
+            (("Ace", "Ace"), 6, Action.SPLIT),
+            (("9", "9"), 7, Action.STAND),
+            (("9", "9"), 9, Action.SPLIT),
+            (("Ace", "7"), 9, Action.HIT),
+            (("10", "3"), 3, Action.STAND),
+            (("10", "2", "3"), 10, Action.HIT),
+        ],
+    )
+    def test_basic_decisions(self, ranks, upcard, expected):
+        hand = make_hand(*ranks)
+        action, _ = PlayerAnalyzer().best_action(hand, upcard, unseen(hand, upcard))
+
+        assert action == expected
+
+    def test_surrender(self):
+        hand = make_hand("10", "6")
+        analyzer = PlayerAnalyzer(Rules(surrender=True))
+        values = analyzer.action_values(hand, 10, unseen(hand, 10))
+
+        assert values[Action.SURRENDER] == -0.5
+        assert analyzer.best_action(hand, 10, unseen(hand, 10))[0] == Action.SURRENDER
+
+    def test_available_actions(self):
+        hand = make_hand("10", "2", "3")
+        values = PlayerAnalyzer().action_values(hand, 5, unseen(hand, 5))
+
+        assert set(values) == {Action.STAND, Action.HIT}
+
+    def test_blackjack(self):
+        hand = make_hand("Ace", "King")
+        values = PlayerAnalyzer(Rules(blackjack_payout=1.2)).action_values(
+            hand, 10, unseen(hand, 10)
+        )
+
+        assert values == {Action.STAND: 1.2}
+
+    def test_double_is_twice_one_card_stand(self):
+        hand = make_hand("6", "5")
+        values = PlayerAnalyzer().action_values(hand, 6, unseen(hand, 6))
+
+        assert values[Action.DOUBLE] <= 2 * values[Action.HIT] + 1e-12
+
+    def test_resplit_approximation(self):
+        hand = make_hand("8", "8")
+        composition = unseen(hand, 6)
+        no_resplit = PlayerAnalyzer(Rules(max_split_hands=2)).action_values(hand, 6, composition)
+        resplit = PlayerAnalyzer(Rules(max_split_hands=4)).action_values(hand, 6, composition)
+
+        assert resplit[Action.SPLIT] > no_resplit[Action.SPLIT]
+
+    def test_depletion_close(self):
+        hand = make_hand("10", "6")
+        composition = unseen(hand, 10)
+        fixed = PlayerAnalyzer().action_values(hand, 10, composition)
+        exact = PlayerAnalyzer(depletion=True).action_values(hand, 10, composition)
+
+        assert exact[Action.HIT] == pytest.approx(fixed[Action.HIT], abs=0.01)
+        assert exact[Action.STAND] == fixed[Action.STAND]
+
+    def test_deck_composition(self):
+        deck = Deck(deck_size=1, rng=2)
+        deck.shuffle()
+        hand = Hand(role="player", name="Ocean")
+        hand.add(deck.draw())
+        hand.add(deck.draw())
+        upcard = deck.draw()
+
+        values = PlayerAnalyzer().action_values(hand, upcard, deck.composition)
+
+        assert Action.STAND in values
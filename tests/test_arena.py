@@ -0,0 +1,91 @@
+from blackjack import Card, DiscardTray, Game, Player
+from blackjack.arena import RoundArena
+from blackjack.dealer import Dealer
+from blackjack.rules import Rules
+from blackjack.strategy import Action
+import pytest
+
+
+def split_everything(hand, upcard, allowed):
+    return Action.SPLIT if Action.SPLIT in allowed else Action.STAND
+
+
+class TestRoundArena:
+    def test_slots_are_reused(self):
+        arena = RoundArena(["Ocean", "Rusty"], max_hands=2)
+        first = arena.take(0, 1.0)
+        first.hand.add(Card("Spades", "9"))
+        first.actions.append(Action.HIT)
+
+        arena.begin_round()
+        again = arena.take(0, 2.0)
+
+        assert again is first
+        assert again.hand.hand == [] and again.actions == []
+        assert again.wager == 2.0
+        assert arena.used(0) == 1 and arena.used(1) == 0
+
+    def test_split(self):
+        arena = RoundArena(["Ocean"], max_hands=2)
+        slot = arena.take(0, 5.0)
+        slot.hand.add(Card("Spades", "Ace"))
+        slot.hand.add(Card("Hearts", "Ace"))
+        slot.actions.append(Action.SPLIT)
+        other = arena.split(0, slot)
+
+        assert other.hand.hand == [Card("Hearts", "Ace")]
+        assert slot.hand.hand == [Card("Spades", "Ace")]
+        assert other.wager == 5.0 and other.actions == [Action.SPLIT]
+        assert slot.split and other.split and slot.split_aces and other.split_aces
+        with pytest.raises(RuntimeError):
+            arena.take(0, 1.0)
+
+    def test_invalid_max_hands(self):
+        with pytest.raises(ValueError):
+            RoundArena(["Ocean"], max_hands=0)
+
+
+class TestRoundLoop:
+    def test_game_reuses_hands(self):
+        hands = set()
+
+        def recording(hand, upcard, allowed):
+            hands.add(id(hand))
+            return split_everything(hand, upcard, allowed)
+
+        game = Game(players=[Player("Splitter", strategy=recording)], rng=1)
+        for _ in game.rounds(300):
+            pass
+
+        # One hand per split slot, however many rounds were played.
+        assert 1 < len(hands) <= Rules().max_split_hands
+
+    def test_new_seats_get_slots(self):
+        game = Game(players=[Player("Ocean")], rng=2)
+        game.play_round()
+        game.players.append(Player("Rusty"))
+        result = game.play_round()
+
+        assert {hand.seat for hand in result.hands} == {0, 1}
+
+    def test_dealer_discard_hides_hole_card(self):
+        dealer = Dealer()
+        dealer.hand.add(Card("Spades", "King"))
+        dealer.hand.add(Card("Hearts", "7"))
+        hand = dealer.hand
+        dealer.play(lambda: None)
+
+        assert len(dealer.discard()) == 2
+        assert dealer.hand is hand and len(hand) == 0
+        hand.add(Card("Spades", "2"))
+        hand.add(Card("Spades", "3"))
+        assert hand.visible_hand == [Card("Spades", "2"), None]
+
+    def test_tray_reset_hands_over_its_list(self):
+        tray = DiscardTray()
+        cards = [Card("Spades", "2"), Card("Hearts", "3")]
+        tray.discard(cards)
+        held = tray._discard_deck
+
+        assert tray.reset() is held
+        assert len(tray) == 0 and tray._discard_deck is not held
@@ -0,0 +1,117 @@
+from blackjack import Card
+from blackjack import Game
+from blackjack import Hand
+from blackjack import Player
+from blackjack import basic_strategy as module
+from blackjack.basic_strategy import HARD, PAIR, SOFT, StrategyTable, basic_strategy, generate
+from blackjack.rules import Rules
+from blackjack.strategy import Action
+import pytest
+
+
+@pytest.fixture(scope="module")
+def chart():
+    return generate(Rules())
+
+
+def make_hand(*ranks):
+    hand = Hand(role="player", name="Ocean")
+    for rank in ranks:
+        hand.add(Card(suit="Hearts", rank=rank))
+    return hand
+
+
+ALL = frozenset(Action) - {Action.SURRENDER}
+
+
+class TestChart:
+    def test_shape(self, chart):
+        assert chart.decisions.shape == (3, 22, 10)
+        assert not chart.decisions.flags.writeable
+
+    @pytest.mark.parametrize(
+        "kind, index, upcard, expected",
+        [
+            (HARD, 11, 6, Action.DOUBLE),
+            (HARD, 16, 10, Action.HIT),
+            (HARD, 13, 2, Action.STAND),
+            (HARD, 12, 2, Action.HIT),
+            (SOFT, 18, 9, Action.HIT),
+            (SOFT, 18, 7, Action.STAND),
+            (PAIR, 0, 10, Action.SPLIT),
+            (PAIR, 7, 10, Action.SPLIT),
+        ],
+    )
+    def test_cells(self, chart, kind, index, upcard, expected):
+        assert chart.decisions[kind, index, upcard - 1] == expected
+
+    def test_tens_not_split(self, chart):
+        action, _ = chart.lookup(total=20, soft=False, pair=9, upcard=5)
+
+        assert action == Action.STAND
+
+
+class TestStrategyCall:
+    def test_split(self, chart):
+        assert chart(make_hand("8", "8"), Card("Spades", "10"), ALL) == Action.SPLIT
+
+    def test_fallback(self, chart):
+        hand = make_hand("6", "5")
+        upcard = Card("Spades", "6")
+
+        assert chart(hand, upcard, ALL) == Action.DOUBLE
+        assert chart(hand, upcard, frozenset({Action.STAND, Action.HIT})) == Action.HIT
+
+    def test_plays_game(self, chart):
+        game = Game(players=[Player(name="Ocean", strategy=chart)], rng=3)
+        for _ in range(200):
+            game.play_round()
+
+        assert game.rounds_played == 200
+
+
+class TestCache:
+    def test_roundtrip(self, chart, tmp_path):
+        path = tmp_path / "chart.npz"
+        chart.save(path, Rules())
+        loaded = StrategyTable.load(path)
+
+        assert (loaded.decisions == chart.decisions).all()
+        assert (loaded.fallbacks == chart.fallbacks).all()
+
+    def test_disk_cache(self, chart, tmp_path, monkeypatch):
+        rules = Rules(decks=2)
+        monkeypatch.setattr(module, "generate", lambda rules: chart)
+        basic_strategy(rules, cache_dir=tmp_path)
+
+        assert module.cache_path(rules, tmp_path).exists()
+
+        def fail(rules):
+            raise AssertionError("chart should come from the cache")
+
+        monkeypatch.setattr(module, "generate", fail)
+        cached = basic_strategy(rules, cache_dir=tmp_path)
+
+        assert (cached.decisions == chart.decisions).all()
+
+    def test_key_depends_on_rules(self, tmp_path):
+        assert module.cache_path(Rules(), tmp_path) != module.cache_path(
+            Rules(hit_soft_17=True), tmp_path
+        )
+        # Shoe handling does not change the chart.
+        assert module.cache_path(Rules(), tmp_path) == module.cache_path(
+            Rules(end_of_shoe=(20, 30), csm=True), tmp_path
+        )
+
+    def test_corrupt_cache_is_regenerated(self, chart, tmp_path, monkeypatch):
+        rules = Rules(decks=3)
+        path = module.cache_path(rules, tmp_path)
+        monkeypatch.setattr(module, "generate", lambda rules: chart)
+        basic_strategy(rules, cache_dir=tmp_path)
+        path.write_bytes(path.read_bytes()[:100])
+
+        table = basic_strategy(rules, cache_dir=tmp_path)
+
+        assert (table.decisions == chart.decisions).all()
+        assert (StrategyTable.load(path).decisions == chart.decisions).all()
+        assert [file.name for file in tmp_path.iterdir()] == [path.name]
@@ -0,0 +1,118 @@
+from benchmarks.runner import (
+    Benchmark,
+    baseline_path,
+    compare,
+    load_results,
+    machine_key,
+    measure,
+    save_baseline,
+    student_t_sf,
+    welch,
+)
+import numpy as np
+import pytest
+
+
+def results(samples: dict[str, list[float]]) -> dict:
+    return {
+        "format": 1,
+        "machine": {
+            "node": "ci box",
+            "machine": "x86_64",
+            "implementation": "cpython",
+            "python": "3.14.0",
+        },
+        "benchmarks": {
+            name: {"group": "micro", "ops": 1, "samples": values}
+            for name, values in samples.items()
+        },
+    }
+
+
+class TestStatistics:
+    @pytest.mark.parametrize(
+        "t, dof, expected",
+        [(0.0, 5, 0.5), (2.0, 10, 0.036694), (-1.5, 20, 0.925382), (3.0, 3, 0.028834)],
+    )
+    def test_student_t(self, t, dof, expected):
+        assert student_t_sf(t, dof) == pytest.approx(expected, abs=1e-5)
+
+    def test_welch_detects_slowdown(self):
+        rng = np.random.default_rng(0)
+        baseline = list(1e-6 * np.exp(rng.normal(0, 0.03, 15)))
+        slower = list(1.1e-6 * np.exp(rng.normal(0, 0.03, 15)))
+
+        ratio, p_slower, p_faster = welch(baseline, slower)
+        assert ratio == pytest.approx(1.1, rel=0.03)
+        assert p_slower < 1e-6
+        assert p_faster > 0.99
+
+    def test_welch_needs_samples(self):
+        with pytest.raises(ValueError):
+            welch([1.0], [1.0, 2.0])
+
+
+class TestCompare:
+    def test_verdicts(self):
+        rng = np.random.default_rng(1)
+        noise = lambda scale: list(scale * np.exp(rng.normal(0, 0.02, 15)))
+        baseline = results({name: noise(1.0) for name in ("same", "slow", "fast", "drift")})
+        current = results(
+            {
+                "same": noise(1.0),
+                "slow": noise(1.3),
+                "fast": noise(0.7),
+                # Significant, but below the threshold.
+                "drift": noise(1.03),
+                "new": noise(1.0),
+            }
+        )
+
+        verdicts = {c.name: c.verdict for c in compare(baseline, current, threshold=0.05)}
+        assert verdicts == {
+            "same": "unchanged",
+            "slow": "regression",
+            "fast": "improvement",
+            "drift": "unchanged",
+        }
+
+    def test_noisy_slowdown_is_not_flagged(self):
+        baseline = results({"noisy": [1.0, 2.0, 1.0, 2.0]})
+        current = results({"noisy": [1.2, 2.2, 1.1, 2.3]})
+
+        assert compare(baseline, current)[0].verdict == "unchanged"
+
+
+class TestFiles:
+    def test_machine_key(self):
+        info = {
+            "node": "ci box/1",
+            "machine": "arm64",
+            "implementation": "cpython",
+            "python": "3.14.1",
+        }
+        key = machine_key(info)
+
+        assert key == "ci_box_1-arm64-cpython314"
+
+    def test_baseline_roundtrip(self, tmp_path):
+        document = results({"a": [1.0, 1.1]})
+        path = save_baseline(document, tmp_path)
+
+        assert path == baseline_path(tmp_path, document["machine"])
+        assert load_results(path) == document
+
+        path.write_text('{"format": 0}')
+        with pytest.raises(ValueError):
+            load_results(path)
+
+    def test_measure(self):
+        calls = []
+        bench = Benchmark("tiny", lambda: lambda: calls.append(1), ops=2)
+        entry = measure(bench, samples=3, min_time=0.001)
+
+        assert len(entry["samples"]) == 3
+        assert all(sample > 0 for sample in entry["samples"])
+        assert entry["ops"] == 2 and entry["number"] >= 1
+        with pytest.raises(ValueError):
+            measure(Benchmark("tiny", lambda: lambda: None), samples=1)
@@ -42,3 +42,46 @@ class TestCardAce:
         assert card.suit == "Hearts"
         assert card.rank == "Ace"
         assert card.value == (1, 11)
+
+
+class TestCardFlyweight:
+    def test_interned(self):
+        assert Card(suit="Spades", rank="Queen") is Card(suit="Spades", rank="Queen")
+
+    def test_codes(self):
+        from blackjack.card import NUM_CODES
+
+        codes = {Card.from_code(code).code for code in range(NUM_CODES)}
+
+        assert codes == set(range(NUM_CODES))
+        assert Card.from_code(0) == Card(suit="Hearts", rank="2")
+        assert Card.from_code(51) == Card(suit="Spades", rank="Ace")
+
+    def test_from_code_error(self):
+        with pytest.raises(ValueError):
+            Card.from_code(52)
+
+    def test_hash(self):
+        cards = {Card(suit="Hearts", rank="Ace"), Card(suit="Hearts", rank="Ace")}
+
+        assert len(cards) == 1
+        assert {Card(suit="Clubs", rank="9"): 9}[Card(suit="Clubs", rank="9")] == 9
+
+    def test_hard_value(self):
+        assert Card(suit="Hearts", rank="Ace").hard_value == 1
+        assert Card(suit="Hearts", rank="Ace").is_ace
+        assert Card(suit="Hearts", rank="King").hard_value == 10
+        assert not Card(suit="Hearts", rank="King").is_ace
+
+    def test_slots(self):
+        card = Card(suit="Diamonds", rank="4")
+
+        with pytest.raises(AttributeError):
+            card.color = "red"
+
+    def test_pickle(self):
+        import pickle
+
+        card = Card(suit="Diamonds", rank="4")
+
+        assert pickle.loads(pickle.dumps(card)) is card
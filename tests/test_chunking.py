@@ -0,0 +1,46 @@
+from blackjack.chunking import chunk_sizes, run_adaptive, z_score
+import pytest
+
+
+class Totals:
+    """A report whose half-width halves with every chunk."""
+
+    def __init__(self):
+        self.done = 0
+
+    def merge(self, chunk):
+        self.done += chunk
+        return self
+
+
+def measure(report):
+    return report.done, 1.0 / report.done
+
+
+class TestChunking:
+    def test_chunk_sizes(self):
+        assert chunk_sizes(10, 4) == [4, 4, 2]
+        assert chunk_sizes(8, 4) == [4, 4]
+        assert chunk_sizes(0, 4) == []
+
+    def test_z_score(self):
+        assert z_score(0.95) == pytest.approx(1.959964)
+        with pytest.raises(ValueError):
+            z_score(1.0)
+
+    def test_stops_at_target(self):
+        report, updates = Totals(), []
+        run_adaptive(iter([1] * 100), lambda n: n, report, measure, 0.1, 0, None, 1, updates.append)
+
+        assert report.done == 10
+        assert [update.done for update in updates] == list(range(1, 11))
+        assert updates[-1].eta == 0.0
+
+    def test_minimum_and_exhaustion(self):
+        report = Totals()
+        run_adaptive(iter([1] * 100), lambda n: n, report, measure, 0.5, 7, None, 1, None)
+        assert report.done == 7
+
+        report = Totals()
+        run_adaptive(iter([1] * 3), lambda n: n, report, measure, 0.01, 0, None, 1, None)
+        assert report.done == 3
@@ -0,0 +1,46 @@
+from blackjack.concurrency import SynchronizedDeck, SynchronizedDiscardTray, gil_enabled
+import threading
+
+
+class TestConcurrency:
+    def test_gil_enabled(self):
+        assert isinstance(gil_enabled(), bool)
+
+    def test_shared_deck(self):
+        deck = SynchronizedDeck(deck_size=2, rng=0)
+        deck.shuffle()
+        tray = SynchronizedDiscardTray()
+
+        def deal():
+            for _ in range(26):
+                tray.discard(deck.draw())
+
+        threads = [threading.Thread(target=deal) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(deck) == 0
+        assert len(tray) == 104
+        assert len({card.code for card in tray.reset()}) == 52
+        assert deck.composition.sum() == 0
+
+    def test_collect(self):
+        deck = SynchronizedDeck(deck_size=1, rng=0)
+        deck.shuffle()
+        cards = [deck.draw() for _ in range(10)]
+        deck.collect_discard_pile(cards)
+
+        assert len(deck) == 52
+        assert len(deck._deck) == 52 and deck.penetration == 0
+
+    def test_composition_snapshots(self):
+        deck = SynchronizedDeck(deck_size=1, rng=0)
+        snapshot = deck.composition
+        deck.draw()
+
+        # A read-only copy: unlike Deck's view, it does not follow the draw.
+        assert not snapshot.flags.writeable
+        assert not deck.suit_composition.flags.writeable
+        assert snapshot.sum() == 52 and deck.composition.sum() == 51
@@ -0,0 +1,103 @@
+from blackjack import Card
+from blackjack import Deck
+from blackjack import DiscardTray
+from blackjack.counting import SYSTEMS, CardCounter, CountingSystem
+from blackjack.card import RANKS
+import pytest
+
+
+class TestCountingSystem:
+    def test_balanced(self):
+        for name in ["Hi-Lo", "Hi-Opt II", "Omega II", "Zen"]:
+            assert SYSTEMS[name].balanced
+
+        assert not SYSTEMS["KO"].balanced
+        assert SYSTEMS["KO"].initial_running_count(decks=6) == 4 - 4 * 6
+
+    def test_missing_rank(self):
+        with pytest.raises(ValueError):
+            CountingSystem("broken", {"2": 1})
+
+
+class TestCardCounter:
+    def test_running_count_on_draw(self):
+        deck = Deck(deck_size=1)
+        counter = CardCounter(deck, systems=("Hi-Lo", "Zen"))
+        # unshuffled deck starts with 2, 3, 4, ... of Hearts
+        for _ in range(5):
+            deck.draw()
+
+        assert counter.running_count("Hi-Lo") == 5
+        assert counter.running_count("Zen") == 1 + 1 + 2 + 2 + 2
+
+    def test_full_shoe_balanced(self):
+        deck = Deck(deck_size=2, rng=4)
+        deck.shuffle()
+        counter = CardCounter(deck)
+        for _ in range(len(deck)):
+            deck.draw()
+
+        running = dict(zip(counter.systems, counter.running))
+        assert running["Hi-Lo"] == 0
+        assert running["Omega II"] == 0
+        assert running["KO"] == 4
+
+    def test_true_count(self):
+        deck = Deck(deck_size=2)
+        counter = CardCounter(deck, systems=("Hi-Lo",))
+        for _ in range(5):
+            deck.draw()
+
+        assert counter.running_count() == 5
+        assert counter.true_count() == pytest.approx(5 / (99 / 52))
+
+    def test_reset_on_collect(self):
+        deck = Deck(deck_size=1)
+        counter = CardCounter(deck, systems=("Hi-Lo",))
+        cards = [deck.draw() for _ in range(3)]
+        deck.collect_discard_pile(cards)
+
+        assert counter.running_count() == 0
+
+    def test_tray_source(self):
+        deck = Deck(deck_size=1)
+        tray = DiscardTray()
+        counter = CardCounter(deck, systems=("Hi-Lo",), tray=tray)
+        cards = [deck.draw() for _ in range(3)]
+
+        assert counter.running_count() == 0
+
+        tray.discard(cards[:2])
+        tray.discard(cards[2])
+
+        assert counter.running_count() == 3
+
+        deck.collect_discard_pile(tray.reset())
+
+        assert counter.running_count() == 0
+
+    def test_detach(self):
+        deck = Deck(deck_size=1)
+        counter = CardCounter(deck, systems=("Hi-Lo",))
+        counter.detach()
+        deck.draw()
+
+        assert counter.running_count() == 0
+
+    def test_custom_counter(self):
+        class Recorder:
+            def __init__(self):
+                self.codes = []
+
+            def add(self, code):
+                self.codes.append(code)
+
+        deck = Deck(deck_size=2)
+        recorder = Recorder()
+        deck.add_counter(recorder)
+        drawn = deck.draw()
+        deck.remove_counter(recorder)
+        deck.draw()
+
+        assert deck.deck_size == 2
+        assert recorder.codes == [drawn.code]
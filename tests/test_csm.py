@@ -0,0 +1,82 @@
+from blackjack import Game
+from blackjack.counting import CardCounter
+from blackjack.csm import ContinuousShuffler
+from blackjack.rules import Rules
+import numpy as np
+import pytest
+
+
+class TestContinuousShuffler:
+    def test_draw_and_reinsert(self):
+        machine = ContinuousShuffler(deck_size=1, rng=0)
+        cards = [machine.draw() for _ in range(20)]
+
+        assert len(machine) == 32
+        assert len({card.code for card in cards}) == 20
+        assert machine.composition.sum() == 32
+
+        machine.collect_discard_pile(cards)
+
+        assert len(machine) == 52
+        assert sorted(machine.live_codes().tolist()) == list(range(52))
+        assert machine.shuffled
+        assert not machine.end_game
+
+    def test_uniform_draws(self):
+        machine = ContinuousShuffler(deck_size=1, rng=1)
+        first = np.zeros(52, dtype=np.int64)
+        for _ in range(26_000):
+            card = machine.draw()
+            first[card.code] += 1
+            machine.collect_discard_pile([card])
+
+        # Every card is equally likely: chi-square with 51 degrees of freedom.
+        chi_square = ((first - 500) ** 2 / 500).sum()
+        assert chi_square < 90
+
+    def test_reproducible(self):
+        first = ContinuousShuffler(rng=7)
+        second = ContinuousShuffler(rng=7)
+
+        assert [first.draw().code for _ in range(50)] == [second.draw().code for _ in range(50)]
+
+    def test_restored_state_replays_draws(self):
+        machines = []
+        for seed in (3, 4):
+            machine = ContinuousShuffler(deck_size=1, rng=seed)
+            cards = [machine.draw() for _ in range(52)]
+            machine.collect_discard_pile(sorted(cards, key=lambda card: card.code))
+            machines.append(machine)
+        first, second = machines
+
+        state = first.rng_state
+        dealt = [first.draw().code for _ in range(5)]
+        second.rng_state = state
+
+        assert [second.draw().code for _ in range(5)] == dealt
+
+    def test_no_cut_or_marker(self):
+        machine = ContinuousShuffler()
+        with pytest.raises(ValueError):
+            machine.set_cutcard(10)
+        with pytest.raises(ValueError):
+            machine.set_end_of_shoe()
+
+    def test_empty(self):
+        machine = ContinuousShuffler(deck_size=1)
+        for _ in range(52):
+            machine.draw()
+        with pytest.raises(RuntimeError):
+            machine.draw()
+
+
+class TestCsmGame:
+    def test_cards_return_after_every_round(self):
+        game = Game(rules=Rules(decks=2, csm=True), rng=3)
+        counter = CardCounter(game.deck, systems=("Hi-Lo",))
+        for _ in game.rounds(100):
+            assert len(game.deck) == 104
+            assert len(game.discard_tray) == 0
+            assert counter.running_count() == 0
+
+        assert isinstance(game.deck, ContinuousShuffler)
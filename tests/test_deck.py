@@ -1,3 +1,4 @@
+import pytest
 from blackjack import Deck
 from blackjack import Card
 
@@ -23,7 +24,7 @@ class TestDeckBasic:
         assert len(shoe) == (6 * 52) - 1
 
     def test_shuffle(self):
-        shoe = Deck(deck_size=6)
+        shoe = Deck(deck_size=6, rng=0)
         shoe.shuffle()
         card = shoe.draw()
 
@@ -52,3 +53,159 @@ class TestDeckBasic:
             shoe.draw()
 
         assert shoe.end_game == True
+
+
+class TestDeckBuffer:
+    def test_codes_buffer(self):
+        shoe = Deck(deck_size=2)
+
+        assert shoe._buffer.dtype.name == "uint8"
+        assert len(shoe._buffer) == 2 * 52
+
+    def test_cut_after_draw(self):
+        shoe = Deck(deck_size=1)
+        shoe.shuffle()
+        drawn = [shoe.draw() for _ in range(10)]
+        cards = shoe._deck
+        shoe.set_cutcard(pos=5)
+
+        assert shoe._deck == cards[5:] + cards[:5]
+
+        shoe.set_cutcard(pos=30)
+
+        cards = cards[5:] + cards[:5]
+        assert shoe._deck == cards[30:] + cards[:30]
+        assert len(shoe) == 52 - len(drawn)
+
+    def test_collect_wraps_buffer(self):
+        shoe = Deck(deck_size=1)
+        shoe.shuffle()
+        drawn = [shoe.draw() for _ in range(40)]
+        remaining = shoe._deck
+        shoe.collect_discard_pile(drawn)
+
+        assert len(shoe) == 52
+        assert shoe._deck == remaining + drawn
+        assert not shoe.shuffled
+
+    def test_live_codes(self):
+        shoe = Deck(deck_size=1, rng=0)
+        shoe.shuffle()
+        shoe.draw()
+        codes = shoe.live_codes()
+        codes[:] = 0
+
+        assert shoe.capacity == 52
+        assert shoe.live_codes().tolist() == [card.code for card in shoe._deck]
+        assert sorted(shoe.live_codes().tolist()) != [0] * 51
+
+    def test_restore_order(self):
+        shoe = Deck(deck_size=1, rng=0)
+        shoe.shuffle()
+        shoe.set_end_of_shoe(10, 20)
+        shoe.restore_order(rng=5)
+
+        assert shoe.live_codes().tolist() == list(range(52))
+        assert not shoe.shuffled and not shoe.end_game
+        shoe.shuffle()
+        again = Deck(deck_size=1, rng=5)
+        again.shuffle()
+        assert shoe._deck == again._deck
+
+        shoe.draw()
+        with pytest.raises(ValueError):
+            shoe.restore_order()
+
+    def test_collect_over_capacity(self):
+        shoe = Deck(deck_size=1)
+
+        with pytest.raises(ValueError):
+            shoe.collect_discard_pile([Card("Hearts", "2")])
+
+
+class TestDeckRandom:
+    def test_seed_reproducible(self):
+        first = Deck(deck_size=2, rng=11)
+        second = Deck(deck_size=2, rng=11)
+        first.shuffle()
+        second.shuffle()
+        first.set_end_of_shoe()
+        second.set_end_of_shoe()
+
+        assert first._deck == second._deck
+        assert first._end_of_shoe_threshold == second._end_of_shoe_threshold
+
+    def test_generator(self):
+        import numpy as np
+
+        rng = np.random.default_rng(5)
+        shoe = Deck(deck_size=1, rng=rng)
+
+        assert shoe.rng is rng
+
+    def test_state_restore(self):
+        shoe = Deck(deck_size=2, rng=3)
+        state = shoe.rng_state
+        shoe.shuffle()
+        cards = shoe._deck
+
+        replay = Deck(deck_size=2)
+        replay.rng_state = state
+        replay.shuffle()
+
+        assert replay._deck == cards
+
+    def test_end_of_shoe_range(self):
+        shoe = Deck(deck_size=1, rng=1)
+        for _ in range(50):
+            shoe.set_end_of_shoe(remaining_min=10, remaining_max=12)
+            assert 10 <= shoe._end_of_shoe_threshold <= 12
+
+    def test_jump(self):
+        shoe = Deck(deck_size=2, rng=8)
+        jumped = Deck(deck_size=2, rng=8)
+        jumped.jump()
+        shoe.shuffle()
+        jumped.shuffle()
+
+        assert shoe._deck != jumped._deck
+
+
+class TestDeckComposition:
+    def test_full_shoe(self):
+        shoe = Deck(deck_size=6)
+
+        assert shoe.composition.tolist() == [24] * 13
+        assert shoe.suit_composition.tolist() == [78] * 4
+        assert shoe.penetration == 0
+
+    def test_draw_and_collect(self):
+        import numpy as np
+
+        shoe = Deck(deck_size=2, rng=9)
+        shoe.shuffle()
+        drawn = [shoe.draw() for _ in range(30)]
+        remaining = shoe._deck
+
+        ranks = [card.rank_index for card in remaining]
+        assert shoe.composition.tolist() == np.bincount(ranks, minlength=13).tolist()
+        assert shoe.penetration == pytest.approx(30 / 104)
+        assert shoe.rank_probabilities.sum() == pytest.approx(1)
+
+        shoe.collect_discard_pile(drawn)
+
+        assert shoe.composition.tolist() == [8] * 13
+        assert shoe.suit_composition.tolist() == [26] * 4
+
+    def test_read_only(self):
+        shoe = Deck(deck_size=1)
+
+        with pytest.raises(ValueError):
+            shoe.composition[0] = 0
+
+    def test_view_tracks_draws(self):
+        shoe = Deck(deck_size=1)
+        composition = shoe.composition
+        shoe.draw()
+
+        assert composition[0] == 3
@@ -0,0 +1,138 @@
+import logging
+
+from blackjack import Game, Player
+from blackjack.csm import ContinuousShuffler
+from blackjack.deck import Deck
+from blackjack.events import EventBus, EventCounter, EventType, Phase, PhaseTimer
+from blackjack.logger import enable_console_logging, logger
+from blackjack.rules import Rules
+from blackjack.shuffles import UNIFORM
+from blackjack.strategy import Action
+import pytest
+
+
+def split_everything(hand, upcard, allowed):
+    return Action.SPLIT if Action.SPLIT in allowed else Action.STAND
+
+
+class TestEventBus:
+    def test_no_subscribers_no_bus(self):
+        game = Game(rng=0)
+        bus = game.events
+
+        assert game.events is bus
+        assert game._bus is game.deck._bus is game.discard_tray._bus is None
+
+        counter = bus.subscribe(EventCounter())
+        assert game._bus is game.deck._bus is game.discard_tray._bus is bus
+
+        bus.unsubscribe(counter)
+        assert game._bus is game.deck._bus is game.discard_tray._bus is None
+        with pytest.raises(ValueError):
+            bus.unsubscribe(counter)
+
+    def test_batches(self):
+        deck = Deck(deck_size=1, rng=1)
+        bus = EventBus(batch_size=10)
+        batches = []
+        bus.subscribe(batches.append)
+        bus.attach(deck)
+
+        for _ in range(25):
+            deck.draw()
+        assert [len(batch) for batch in batches] == [10, 10]
+        assert bus.pending == 5
+
+        bus.flush()
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert all(event.type is EventType.DRAW for batch in batches for event in batch)
+        assert all(type(event.payload) is int for batch in batches for event in batch)
+
+        bus.detach(deck)
+        deck.draw()
+        assert deck._bus is None and bus.pending == 0
+
+    def test_csm_draw_payload(self):
+        machine = ContinuousShuffler(deck_size=1, rng=1)
+        bus = EventBus()
+        events = []
+        bus.subscribe(events.extend)
+        bus.attach(machine)
+
+        cards = [machine.draw() for _ in range(5)]
+        bus.flush()
+        assert [event.payload for event in events] == [card.code for card in cards]
+        assert all(type(event.payload) is int for event in events)
+
+    def test_type_filter(self):
+        game = Game(players=[Player("Splitter", strategy=split_everything)], rng=2)
+        splits = game.events.subscribe(lambda events: seen.extend(events), [EventType.SPLIT])
+        seen = []
+        for _ in game.rounds(300):
+            pass
+        game.events.flush()
+
+        assert seen
+        assert {event.type for event in seen} == {EventType.SPLIT}
+        assert {event.payload for event in seen} == {0}
+        assert game.events.subscribers == [splits]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            EventBus(batch_size=0)
+
+
+class TestSubscribers:
+    def test_game_events(self):
+        rules = Rules(decks=1, end_of_shoe=(15, 15))
+        game = Game(rules=rules, rng=3, shuffle_procedure=UNIFORM)
+        counter = game.events.subscribe(EventCounter())
+        timer = game.events.subscribe(PhaseTimer())
+        results = list(game.rounds(100))
+        game.events.flush()
+
+        cards = sum(len(result.dealer_cards) for result in results) + sum(
+            len(hand.cards) for result in results for hand in result.hands
+        )
+        assert counter[EventType.DRAW] == cards
+        assert counter.drawn_ranks.sum() == cards
+        assert counter[EventType.ROUND_RESOLVED] == 100
+        assert counter[EventType.DISCARD] == 200
+        assert counter[EventType.RESHUFFLE] > 0
+        assert counter[EventType.END_OF_SHOE] == counter[EventType.RESHUFFLE]
+        assert counter[EventType.SHUFFLE] == counter[EventType.CUT] == counter[EventType.RESHUFFLE]
+
+        summary = timer.summary()
+        assert summary["deal"]["count"] == summary["settlement"]["count"] == 100
+        assert summary["dealer"]["count"] <= 100
+        assert timer.total(Phase.DEAL) > 0
+        assert timer.mean(Phase.SETTLEMENT) > 0
+
+    def test_round_resolved_payload(self):
+        game = Game(rng=4)
+        results = []
+        game.events.subscribe(
+            lambda events: results.extend(event.payload for event in events),
+            [EventType.ROUND_RESOLVED],
+        )
+        played = list(game.rounds(5))
+        game.events.flush()
+
+        assert results == played
+
+
+class TestLogging:
+    def test_silent_by_default(self):
+        assert any(isinstance(handler, logging.NullHandler) for handler in logger.handlers)
+        assert not any(
+            isinstance(handler, logging.StreamHandler) for handler in logger.handlers
+        )
+
+    def test_console_helper(self):
+        handler = enable_console_logging(logging.DEBUG)
+        try:
+            assert enable_console_logging(logging.WARNING) is handler
+            assert handler.level == logger.level == logging.WARNING
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(logging.NOTSET)
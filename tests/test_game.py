@@ -0,0 +1,158 @@
+from blackjack import Card
+from blackjack import Dealer
+from blackjack import Game
+from blackjack import Hand
+from blackjack import Player
+from blackjack.game import Outcome
+from blackjack.rules import Rules
+from blackjack.strategy import Action
+import numpy as np
+import pytest
+
+
+def stack(game, ranks):
+    """Put cards of the given ranks on top of the game's shoe."""
+    codes = np.array([Card(suit="Clubs", rank=rank).code for rank in ranks])
+    game.deck._write(0, codes.astype(np.uint8))
+
+
+def scripted(*actions):
+    queue = list(actions)
+
+    def strategy(hand, upcard, allowed):
+        return queue.pop(0)
+
+    return strategy
+
+
+class TestDealer:
+    def test_stands_on_soft_17(self):
+        dealer = Dealer(hit_soft_17=False)
+        dealer.hand.add(Card(suit="Hearts", rank="Ace"))
+        dealer.hand.add(Card(suit="Hearts", rank="6"))
+
+        assert not dealer.must_hit()
+
+    def test_hits_soft_17(self):
+        dealer = Dealer(hit_soft_17=True)
+        dealer.hand.add(Card(suit="Hearts", rank="Ace"))
+        dealer.hand.add(Card(suit="Hearts", rank="6"))
+        cards = iter([Card(suit="Hearts", rank="3")])
+        hand = dealer.play(lambda: next(cards))
+
+        assert hand.score == 20
+
+
+class TestPlayer:
+    def test_bet(self):
+        with pytest.raises(ValueError):
+            Player(name="Ocean", bet=0)
+
+    def test_settle(self):
+        player = Player(name="Ocean", initial_bankroll=100)
+        player.settle(-10)
+
+        assert player.bankroll == 90
+
+
+class TestGameRound:
+    def test_win(self):
+        game = Game(players=[Player(name="Ocean", strategy=scripted(Action.STAND))])
+        # player 10, dealer 9, player 10, dealer 8
+        stack(game, ["10", "9", "King", "8"])
+        result = game.play_round()
+
+        assert result.hands[0].outcome == Outcome.WIN
+        assert result.net == 1
+        assert game.players[0].bankroll == 1
+
+    def test_blackjack(self):
+        game = Game(players=[Player(name="Ocean")])
+        stack(game, ["Ace", "9", "King", "8"])
+        result = game.play_round()
+
+        assert result.hands[0].outcome == Outcome.BLACKJACK
+        assert result.net == 1.5
+
+    def test_dealer_blackjack(self):
+        game = Game(players=[Player(name="Ocean", strategy=scripted())])
+        stack(game, ["10", "Ace", "King", "Queen"])
+        result = game.play_round()
+
+        assert result.hands[0].outcome == Outcome.LOSS
+        assert result.hands[0].actions == ()
+        assert len(result.dealer_cards) == 2
+
+    def test_double(self):
+        game = Game(players=[Player(name="Ocean", strategy=scripted(Action.DOUBLE))])
+        stack(game, ["6", "9", "5", "8", "King"])
+        result = game.play_round()
+
+        assert result.hands[0].wager == 2
+        assert result.hands[0].net == 2
+        assert result.hands[0].actions == (Action.DOUBLE,)
+
+    def test_split(self):
+        strategy = scripted(Action.SPLIT, Action.STAND, Action.STAND)
+        game = Game(players=[Player(name="Ocean", strategy=strategy)])
+        # pair of 8s against 10+7, split hands receive 10 and 9
+        stack(game, ["8", "10", "8", "7", "10", "9"])
+        result = game.play_round()
+
+        assert [hand.cards for hand in result.hands] == [
+            (Card(suit="Clubs", rank="8").code, Card(suit="Clubs", rank="10").code),
+            (Card(suit="Clubs", rank="8").code, Card(suit="Clubs", rank="9").code),
+        ]
+        assert [hand.outcome for hand in result.hands] == [Outcome.WIN, Outcome.PUSH]
+        assert result.hands[0].actions == (Action.SPLIT, Action.STAND)
+        assert result.net == 1
+
+    def test_surrender(self):
+        rules = Rules(surrender=True)
+        game = Game(players=[Player(name="Ocean", strategy=scripted(Action.SURRENDER))], rules=rules)
+        stack(game, ["10", "10", "6", "7"])
+        result = game.play_round()
+
+        assert result.hands[0].outcome == Outcome.SURRENDER
+        assert result.net == -0.5
+
+    def test_illegal_action(self):
+        game = Game(players=[Player(name="Ocean", strategy=scripted(Action.SURRENDER))])
+        stack(game, ["10", "10", "6", "7"])
+
+        with pytest.raises(ValueError):
+            game.play_round()
+
+    def test_cards_return_to_tray(self):
+        game = Game(players=[Player(name="Ocean"), Player(name="Batman")])
+        total = len(game.deck)
+        for _ in range(5):
+            game.play_round()
+
+        assert len(game.deck) + len(game.discard_tray) == total
+
+    def test_reshuffle_at_end_of_shoe(self):
+        game = Game(rules=Rules(decks=1, end_of_shoe=(15, 20)))
+        for _ in range(50):
+            game.play_round()
+
+        assert game.deck.shuffled
+        assert len(game.deck) + len(game.discard_tray) == 52
+
+    def test_single_deck_default_rules(self):
+        game = Game(rules=Rules(decks=1), rng=7)
+        for _ in range(50):
+            game.play_round()
+
+        assert len(game.deck) + len(game.discard_tray) == 52
+        assert game.rules.end_of_shoe_range == (8, 13)
+
+
+class TestGameSeed:
+    def test_seeded_games_match(self):
+        results = []
+        for _ in range(2):
+            game = Game(rng=21)
+            results.append([game.play_round().net for _ in range(100)])
+
+        assert results[0] == results[1]
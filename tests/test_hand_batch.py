@@ -0,0 +1,75 @@
+from blackjack import Card
+from blackjack import Hand
+from blackjack.hand_batch import (
+    PAD_CODE,
+    dealer_final_totals,
+    draw_to_policy,
+    evaluate_hands,
+)
+import numpy as np
+import pytest
+
+
+def codes_of(*cards):
+    return [Card(suit=suit, rank=rank).code for suit, rank in cards]
+
+
+class TestEvaluateHands:
+    def test_scores(self):
+        codes = np.full((3, 4), PAD_CODE, dtype=np.uint8)
+        codes[0, :2] = codes_of(("Spades", "Ace"), ("Hearts", "King"))
+        codes[1, :3] = codes_of(("Spades", "Ace"), ("Hearts", "7"), ("Clubs", "9"))
+        codes[2, :3] = codes_of(("Spades", "Jack"), ("Hearts", "9"), ("Clubs", "3"))
+
+        batch = evaluate_hands(codes)
+
+        assert batch.totals.tolist() == [21, 17, 22]
+        assert batch.soft.tolist() == [True, False, False]
+        assert batch.bust.tolist() == [False, False, True]
+        assert batch.blackjack.tolist() == [True, False, False]
+
+    def test_matches_hand(self):
+        rng = np.random.default_rng(7)
+        codes = rng.integers(0, 52, size=(500, 6)).astype(np.int16)
+        codes[rng.random((500, 6)) < 0.3] = -1
+        codes[:, :2] = rng.integers(0, 52, size=(500, 2))
+        codes = np.sort(codes, axis=1)[:, ::-1]
+
+        batch = evaluate_hands(codes)
+
+        for row, total, bust in zip(codes, batch.totals, batch.bust):
+            hand = Hand(role="player", name="Ocean")
+            for code in row[row >= 0]:
+                hand.add(Card.from_code(int(code)))
+            assert hand.score == total
+            assert hand.bust == bust
+
+    def test_shape_error(self):
+        with pytest.raises(ValueError):
+            evaluate_hands(np.zeros(4, dtype=np.uint8))
+
+
+class TestDrawToPolicy:
+    def test_dealer_soft_17(self):
+        codes = np.array(
+            [codes_of(("Spades", "Ace"), ("Hearts", "6"), ("Clubs", "4"), ("Clubs", "2"))]
+        )
+
+        stand, n_stand = dealer_final_totals(codes, hit_soft_17=False)
+        hit, n_hit = dealer_final_totals(codes, hit_soft_17=True)
+
+        assert stand.totals[0] == 17 and n_stand[0] == 2
+        assert hit.totals[0] == 21 and n_hit[0] == 3
+
+    def test_bust_and_padding(self):
+        codes = np.full((2, 5), PAD_CODE, dtype=np.uint8)
+        codes[0] = codes_of(
+            ("Spades", "10"), ("Hearts", "6"), ("Clubs", "King"), ("Clubs", "2"), ("Clubs", "3")
+        )
+        codes[1, :3] = codes_of(("Spades", "2"), ("Hearts", "3"), ("Clubs", "4"))
+
+        batch, n_cards = draw_to_policy(codes)
+
+        assert batch.bust.tolist() == [True, False]
+        assert batch.totals.tolist() == [26, 9]
+        assert n_cards.tolist() == [3, 3]
@@ -143,6 +143,31 @@ class TestHandPlayer:
         assert Card(suit="Hearts", rank="Jack") in hand_2.hand
         assert hand_player.hand == []
 
+    def test_split_into(self):
+        hand_player = Hand(role="player", name="Ocean")
+        other = Hand(role="player", name="Ocean")
+        other.add(Card(suit="Clubs", rank="5"))
+        hand_player.add(Card(suit="Spades", rank="Ace"))
+        hand_player.add(Card(suit="Hearts", rank="Ace"))
+
+        assert hand_player.split_into(other) is other
+        assert hand_player.hand == [Card(suit="Spades", rank="Ace")]
+        assert other.hand == [Card(suit="Hearts", rank="Ace")]
+        assert hand_player.score == other.score == 11
+        with pytest.raises(ValueError):
+            hand_player.split_into(other)
+
+    def test_clear(self):
+        hand_player = Hand(role="player", name="Ocean")
+        hand_player.add(Card(suit="Spades", rank="6"))
+        hand_player.add(Card(suit="Hearts", rank="5"))
+        hand_player.double(Card(suit="Hearts", rank="Ace"))
+        hand_player.clear()
+
+        assert hand_player.hand == []
+        assert hand_player.score == 0
+        assert not hand_player.doubled
+
 
 class TestHandDealer:
     def test_hand(self):
@@ -169,3 +194,76 @@ class TestHandDealer:
         hand_dealer.reveal()
 
         assert hand_dealer.hand == cards
+
+    def test_clear_hides_hole_card_again(self):
+        reused, fresh = Hand(role="dealer"), Hand(role="dealer")
+        reused.add(Card(suit="Hearts", rank="9"))
+        reused.add(Card(suit="Hearts", rank="7"))
+        reused.reveal()
+        reused.clear()
+        cards = [Card(suit="Spades", rank="Jack"), Card(suit="Spades", rank="Ace")]
+        for card in cards:
+            reused.add(card)
+            fresh.add(card)
+
+        assert reused.hand == cards
+        assert reused.visible_hand == fresh.visible_hand == [cards[0], None]
+        assert reused.visible_score == fresh.visible_score == 10
+        reused.reveal()
+        assert reused.visible_hand == cards
+
+
+class TestHandScore:
+    def test_soft(self):
+        hand_player = Hand(role="player", name="Ocean")
+        hand_player.add(Card(suit="Spades", rank="Ace"))
+        hand_player.add(Card(suit="Hearts", rank="6"))
+
+        assert hand_player.soft
+        assert hand_player.score == 17
+
+        hand_player.add(Card(suit="Hearts", rank="9"))
+
+        assert not hand_player.soft
+        assert hand_player.score == 16
+
+    def test_multiple_aces(self):
+        hand_player = Hand(role="player", name="Ocean")
+        for suit in ["Spades", "Hearts", "Clubs", "Diamonds"]:
+            hand_player.add(Card(suit=suit, rank="Ace"))
+
+        assert hand_player.score == 14
+        assert hand_player.soft
+        assert not hand_player.blackjack
+
+    def test_split_resets_score(self):
+        hand_player = Hand(role="player", name="Ocean")
+        hand_player.add(Card(suit="Spades", rank="Ace"))
+        hand_player.add(Card(suit="Hearts", rank="Ace"))
+        hand_1, hand_2 = hand_player.split()
+
+        assert hand_player.score == 0
+        assert hand_1.score == 11
+        assert hand_2.soft
+
+
+class TestHandDouble:
+    def test_double(self):
+        hand_player = Hand(role="player", name="Ocean")
+        hand_player.add(Card(suit="Spades", rank="6"))
+        hand_player.add(Card(suit="Hearts", rank="5"))
+
+        assert hand_player.doubling_possible
+
+        hand_player.double(Card(suit="Hearts", rank="King"))
+
+        assert hand_player.doubled
+        assert hand_player.score == 21
+        assert not hand_player.doubling_possible
+
+    def test_double_not_possible(self):
+        hand_player = Hand(role="player", name="Ocean")
+        hand_player.add(Card(suit="Spades", rank="6"))
+
+        with pytest.raises(ValueError):
+            hand_player.double(Card(suit="Hearts", rank="King"))
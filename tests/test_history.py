@@ -0,0 +1,92 @@
+from blackjack import Game
+from blackjack.game import Outcome
+from blackjack.hand_batch import PAD_CODE
+from blackjack.history import (
+    RECORD_DTYPE,
+    HistoryReader,
+    HistoryWriter,
+    open_parts,
+)
+from blackjack.rules import Rules
+from blackjack.simulation import simulate
+import numpy as np
+import pytest
+
+
+def record_rounds(path, rounds, chunk_rows=16, **kwargs):
+    game = Game(rng=5)
+    results = []
+    with HistoryWriter(path, rules=game.rules, chunk_rows=chunk_rows, **kwargs) as writer:
+        for _ in range(rounds):
+            result = game.play_round()
+            writer.append_round(result, true_count=1.5)
+            results.append(result)
+    return results
+
+
+class TestHistory:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "hands.bjh"
+        results = record_rounds(path, 100, metadata={"run": "test"})
+        reader = HistoryReader(path)
+        hands = [hand for result in results for hand in result.hands]
+
+        assert len(reader) == len(hands)
+        assert reader.rules == repr(Rules())
+        assert reader.metadata == {"run": "test"}
+        assert reader["net"].sum() == pytest.approx(sum(hand.net for hand in hands))
+        assert reader["true_count"][0] == 1.5
+
+        first = reader.records[0]
+        assert tuple(first["cards"][: first["n_cards"]]) == hands[0].cards
+        assert first["cards"][first["n_cards"]] == PAD_CODE
+        dealer = results[0].dealer_cards
+        assert tuple(first["dealer_cards"][: len(dealer)]) == dealer
+
+    def test_columns_are_views(self, tmp_path):
+        path = tmp_path / "hands.bjh"
+        record_rounds(path, 20)
+        reader = HistoryReader(path)
+        net = reader.column("net")
+
+        assert isinstance(reader.records, np.memmap)
+        assert np.shares_memory(net, reader.records)
+        with pytest.raises(ValueError):
+            reader.column("missing")
+
+    def test_append_and_partial_record(self, tmp_path):
+        path = tmp_path / "hands.bjh"
+        record_rounds(path, 10)
+        rows = len(HistoryReader(path))
+        with open(path, "ab") as file:
+            file.write(b"\x00" * 7)
+
+        assert len(HistoryReader(path)) == rows
+
+        with HistoryWriter(path, append=True) as writer:
+            writer.append_records(np.zeros(3, dtype=RECORD_DTYPE))
+
+        assert len(HistoryReader(path)) == rows + 3
+
+    def test_not_a_history(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"nothing to see here")
+
+        with pytest.raises(ValueError):
+            HistoryReader(path)
+
+
+class TestSimulationHistory:
+    def test_parts(self, tmp_path):
+        report = simulate(
+            rounds=250, seed=9, workers=1, chunk_rounds=100, history_dir=tmp_path
+        )
+        parts = open_parts(tmp_path)
+
+        assert len(parts) == 3
+        assert sum(len(part) for part in parts) == report.hands
+        assert sum(part["net"].sum() for part in parts) == pytest.approx(report.net)
+        rounds = np.concatenate([part["round"] for part in parts])
+        assert rounds.min() == 1 and rounds.max() == 250
+        outcomes = np.concatenate([part["outcome"] for part in parts])
+        assert np.bincount(outcomes, minlength=len(Outcome)).tolist() == report.outcomes
@@ -0,0 +1,96 @@
+from blackjack import Game
+from blackjack.counting import CardCounter
+from blackjack.history import HistoryReader, HistoryWriter
+from blackjack.pipeline import counted, every, pipe, record, take, tap, throttle
+from functools import partial
+import itertools
+import pytest
+
+
+class TestRounds:
+    def test_lazy(self):
+        game = Game(rng=1)
+        stream = game.rounds()
+
+        assert game.rounds_played == 0
+        next(stream)
+        assert game.rounds_played == 1
+
+    def test_limit(self):
+        game = Game(rng=1)
+        results = list(game.rounds(5))
+
+        assert [result.number for result in results] == [1, 2, 3, 4, 5]
+        with pytest.raises(ValueError):
+            next(game.rounds(-1))
+
+    def test_same_as_play_round(self):
+        streamed = [result.net for result in Game(rng=2).rounds(50)]
+        game = Game(rng=2)
+        played = [game.play_round().net for _ in range(50)]
+
+        assert streamed == played
+
+
+class TestStages:
+    def test_take_stops_source(self):
+        game = Game(rng=3)
+        results = list(take(game.rounds(), 7))
+
+        assert len(results) == 7
+        assert game.rounds_played == 7
+
+    def test_tap_and_pipe(self):
+        game = Game(rng=3)
+        seen = []
+        stream = pipe(game.rounds(), partial(tap, callback=seen.append), partial(every, n=2))
+        results = list(take(stream, 3))
+
+        assert [result.number for result in results] == [2, 4, 6]
+        assert len(seen) == 6
+
+    def test_tee(self):
+        first, second = itertools.tee(Game(rng=4).rounds(10))
+
+        assert [r.net for r in first] == [r.net for r in second]
+
+    def test_throttle(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        items = list(throttle(range(5), rate=2, clock=lambda: now[0], sleep=sleep))
+
+        assert items == [0, 1, 2, 3, 4]
+        assert sum(sleeps) == pytest.approx(2.0)
+
+    def test_record(self, tmp_path):
+        game = Game(rng=5)
+        counter = CardCounter(game.deck, systems=("Hi-Lo",))
+        counts = []
+        path = tmp_path / "hands.bjh"
+        with HistoryWriter(path) as writer:
+            stream = record(game.rounds(20), writer, counter)
+            for _ in stream:
+                counts.append(counter.true_count())
+        reader = HistoryReader(path)
+        first_hands = reader["hand"] == 0
+
+        # The count before round n + 1 is the count after round n.
+        recorded = reader["true_count"][first_hands & (reader["seat"] == 0)]
+        assert recorded[0] == 0
+        assert recorded[1:] == pytest.approx(counts[:-1], abs=1e-6)
+
+    def test_counted(self):
+        game = Game(rng=5)
+        counter = CardCounter(game.deck, systems=("Hi-Lo",))
+        pairs = []
+        for _, true_count in counted(game.rounds(10), counter):
+            pairs.append((true_count, counter.true_count()))
+
+        # Each round carries the count left by the round before it.
+        assert pairs[0][0] == 0
+        assert [before for before, _ in pairs[1:]] == [after for _, after in pairs[:-1]]
@@ -0,0 +1,106 @@
+from blackjack import Card
+from blackjack import Deck
+from blackjack.probability import (
+    BLACKJACK,
+    BUST,
+    DealerProbabilities,
+    TranspositionTable,
+    remove_card,
+    value_composition,
+)
+from blackjack.rules import Rules
+from itertools import permutations
+import numpy as np
+import pytest
+
+
+def brute_force(up, cards, hit_soft_17):
+    """Average the dealer outcome over every ordering of a small set of cards."""
+    result = np.zeros(7)
+    orders = list(permutations(range(len(cards))))
+    for order in orders:
+        drawn = [up] + [cards[i] for i in order]
+        hard, ace, n = 0, False, 0
+        for value in drawn:
+            hard += value
+            ace = ace or value == 1
+            n += 1
+            soft = ace and hard <= 11
+            score = hard + 10 if soft else hard
+            if n >= 2 and (score > 17 or (score == 17 and not (soft and hit_soft_17))):
+                break
+        if hard > 21:
+            result[5] += 1
+        elif n == 2 and score == 21:
+            result[6] += 1
+        else:
+            result[score - 17] += 1
+    return result / len(orders)
+
+
+class TestTranspositionTable:
+    def test_lru(self):
+        table = TranspositionTable(maxsize=2)
+        table.put("a", 1)
+        table.put("b", 2)
+        table.get("a")
+        table.put("c", 3)
+
+        assert "a" in table
+        assert "b" not in table
+        assert len(table) == 2
+        assert table.hits == 1
+
+
+class TestDealerProbabilities:
+    @pytest.mark.parametrize("hit_soft_17", [False, True])
+    def test_brute_force(self, hit_soft_17):
+        cards = [1, 6, 10, 2, 5, 10, 4]
+        composition = [0] * 10
+        for value in cards:
+            composition[value - 1] += 1
+
+        engine = DealerProbabilities()
+        probabilities = engine.outcome_probabilities(
+            upcard=1, composition=composition, rules=Rules(hit_soft_17=hit_soft_17), peek=False
+        )
+
+        assert probabilities == pytest.approx(brute_force(1, cards, hit_soft_17))
+
+    def test_full_shoe(self):
+        composition = remove_card(value_composition([24] * 13), 5)
+        probabilities = DealerProbabilities().outcome_probabilities(6, composition)
+
+        assert probabilities.sum() == pytest.approx(1)
+        assert probabilities[BUST] == pytest.approx(0.4228, abs=1e-4)
+
+    def test_peek(self):
+        composition = remove_card(value_composition([24] * 13), 0)
+        engine = DealerProbabilities()
+        no_peek = engine.outcome_probabilities(1, composition, peek=False)
+        peek = engine.outcome_probabilities(1, composition, peek=True)
+
+        assert no_peek[BLACKJACK] == pytest.approx(96 / 311)
+        assert peek[BLACKJACK] == 0
+        assert peek[:BLACKJACK] == pytest.approx(no_peek[:BLACKJACK] / (1 - no_peek[BLACKJACK]))
+
+    def test_deck_composition(self):
+        deck = Deck(deck_size=1)
+        upcard = deck.draw()
+        engine = DealerProbabilities()
+
+        assert engine.outcome_probabilities(upcard, deck.composition).sum() == pytest.approx(1)
+
+    def test_shared_table(self):
+        table = TranspositionTable()
+        composition = value_composition([4] * 13)
+        DealerProbabilities(table).outcome_probabilities(Card("Hearts", "7"), composition)
+        size = len(table)
+        DealerProbabilities(table).outcome_probabilities(Card("Spades", "7"), composition)
+
+        assert len(table) == size
+        assert table.hits > 0
+
+    def test_invalid_composition(self):
+        with pytest.raises(ValueError):
+            value_composition([1, 2, 3])
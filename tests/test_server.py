@@ -0,0 +1,100 @@
+from blackjack.basic_strategy import generate
+from blackjack.rules import Rules
+from blackjack.server import BotClient, LatencyHistogram, TableServer, run_bots
+from blackjack.strategy import Action
+import asyncio
+import pytest
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestLatencyHistogram:
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for latency in [1e-4] * 99 + [1e-2]:
+            histogram.add(latency)
+
+        assert histogram.count == 100
+        assert 0.99e-4 <= histogram.quantile(0.5) <= 1.2e-4
+        assert histogram.quantile(1.0) == pytest.approx(1e-2)
+        assert histogram.mean == pytest.approx((99 * 1e-4 + 1e-2) / 100)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.add(1e-3)
+        second.add(2e-3)
+
+        assert first.merge(second).count == 2
+        with pytest.raises(ValueError):
+            first.merge(LatencyHistogram(per_decade=4))
+
+
+class TestTableServer:
+    def test_bots(self):
+        async def scenario():
+            async with TableServer(seed=1) as server:
+                await server.start()
+                port = server.sockets[0].getsockname()[1]
+                results = await run_bots(tables=20, rounds=10, port=port)
+                return server, results
+
+        server, results = run(scenario())
+
+        assert len(results) == 20
+        assert all(len(nets) == 10 for nets in results)
+        assert server.rounds == 200
+        assert server.tables == 0
+        assert server.timeouts == 0
+        assert server.latency[Action.STAND].count > 0
+        assert server.total_latency().quantile(0.99) < 1.0
+
+    def test_unix_socket_with_chart(self, tmp_path):
+        chart = generate(Rules())
+        path = str(tmp_path / "tables.sock")
+
+        async def scenario():
+            async with TableServer(seed=2) as server:
+                await server.start_unix(path)
+                return await run_bots(tables=3, rounds=20, path=path, strategy=chart)
+
+        results = run(scenario())
+
+        assert sum(len(nets) for nets in results) == 60
+
+    def test_deadline_stands(self):
+        async def scenario():
+            async with TableServer(deadline=0.01, seed=3) as server:
+                await server.start()
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                assert (await reader.readline()).startswith(b"HELLO")
+
+                # Never answer: every decision times out and stands.
+                for _ in range(5):
+                    writer.write(b"ROUND\n")
+                    while not (line := await reader.readline()).startswith(b"RESULT"):
+                        assert line.startswith(b"DECIDE")
+                writer.write(b"QUIT\n")
+                assert await reader.readline() == b"BYE\n"
+                writer.close()
+                return server
+
+        server = run(scenario())
+
+        assert server.rounds == 5
+        assert server.timeouts >= 1
+
+    def test_illegal_action(self):
+        async def scenario():
+            async with TableServer(seed=4) as server:
+                await server.start()
+                port = server.sockets[0].getsockname()[1]
+                client = await BotClient.connect("127.0.0.1", port)
+                client._writer.write(b"DANCE\n")
+                reply = await client._reader.readline()
+                await client.close()
+                return reply
+
+        assert run(scenario()) == b"ERROR unknown command\n"
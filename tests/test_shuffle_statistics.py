@@ -0,0 +1,107 @@
+from blackjack import Game
+from blackjack.deck import Deck
+from blackjack.rules import Rules
+from blackjack.shuffle_statistics import (
+    ShuffleStatistics,
+    chi_square_sf,
+    deck_shoes,
+    game_penetrations,
+    procedure_shoes,
+)
+from blackjack.shuffles import UNIFORM, new_shoes, riffle
+import numpy as np
+import pytest
+
+
+class TestChiSquare:
+    @pytest.mark.parametrize("statistic, dof", [(18.307, 10), (124.342, 100), (3876.0, 3732)])
+    def test_critical_values(self, statistic, dof):
+        # 95% quantiles; the last one from the normal approximation.
+        assert chi_square_sf(statistic, dof) == pytest.approx(0.05, abs=0.002)
+
+    def test_invalid_dof(self):
+        with pytest.raises(ValueError):
+            chi_square_sf(1.0, 0)
+
+
+class TestShuffleStatistics:
+    def test_uniform_passes(self):
+        statistics = ShuffleStatistics(decks=1)
+        statistics.add_stream(procedure_shoes(UNIFORM, 20_000, decks=1, batch=6000, rng=0))
+
+        assert statistics.shoes == statistics.tracked_shoes == 20_000
+        assert statistics.position_rank.sum(axis=1).tolist() == [20_000] * 52
+        assert statistics.position_chi_square().p_value > 0.001
+        assert statistics.adjacency_chi_square().p_value > 0.001
+        assert statistics.mean_rising_sequences == pytest.approx(26.5, abs=0.1)
+        assert statistics.mean_successors == pytest.approx(51 / 52, abs=0.05)
+
+    def test_riffle_fails(self):
+        statistics = ShuffleStatistics(decks=1)
+        identities = riffle(np.tile(np.arange(52), (5000, 1)), np.random.default_rng(1))
+        statistics.add(new_shoes(1, 1)[0][identities], identities)
+
+        assert statistics.position_chi_square().p_value < 1e-6
+        assert statistics.adjacency_chi_square().p_value < 1e-6
+        assert statistics.rising_sequences[3:].sum() == 0
+        assert statistics.mean_successors > 20
+
+    def test_merge(self):
+        batches = list(procedure_shoes(UNIFORM, 300, decks=2, batch=100, rng=2))
+        whole, first, second = (ShuffleStatistics(decks=2) for _ in range(3))
+        whole.add_stream(batches)
+        first.add_stream(batches[:1])
+        second.add_stream(batches[1:])
+        first.merge(second)
+
+        assert first.shoes == whole.shoes == 300
+        assert (first.position_rank == whole.position_rank).all()
+        assert (first.adjacency == whole.adjacency).all()
+        assert (first.rising_sequences == whole.rising_sequences).all()
+        with pytest.raises(ValueError):
+            first.merge(ShuffleStatistics(decks=1))
+
+    def test_invalid_input(self):
+        statistics = ShuffleStatistics(decks=1)
+
+        with pytest.raises(ValueError):
+            statistics.position_chi_square()
+        with pytest.raises(ValueError):
+            statistics.add(new_shoes(3, 2))
+        with pytest.raises(ValueError):
+            statistics.add_penetrations([53])
+
+
+class TestSources:
+    def test_deck_shoes(self):
+        batches = list(deck_shoes(Deck(deck_size=1, rng=3), 250, batch=100))
+
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        assert all((np.sort(batch, axis=1) == np.arange(52)).all() for batch in batches)
+
+        statistics = ShuffleStatistics(decks=1)
+        statistics.add_stream(batches)
+        assert statistics.shoes == 250
+        assert np.isnan(statistics.mean_rising_sequences)
+
+    def test_deck_must_be_full(self):
+        deck = Deck(deck_size=1, rng=4)
+        deck.draw()
+
+        with pytest.raises(ValueError):
+            next(deck_shoes(deck, 1))
+
+    def test_game_penetrations(self):
+        rules = Rules(decks=2, end_of_shoe=(30, 40))
+        dealt = game_penetrations(Game(rules=rules, rng=5), 20)
+
+        assert len(dealt) == 20
+        # The shoe is cut after the round that passes the marker.
+        assert ((dealt >= 104 - 40) & (dealt <= 104)).all()
+
+        statistics = ShuffleStatistics(decks=2)
+        statistics.add_penetrations(dealt)
+        assert statistics.penetration.sum() == 20
+        assert statistics.mean_penetration == pytest.approx(dealt.mean() / 104)
+        with pytest.raises(ValueError):
+            game_penetrations(Game(rules=Rules(csm=True)), 1)
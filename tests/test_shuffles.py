@@ -0,0 +1,162 @@
+from functools import partial
+
+from blackjack import Game
+from blackjack.deck import Deck
+from blackjack.rules import Rules
+from blackjack.shuffles import (
+    UNIFORM,
+    ShuffleProcedure,
+    box,
+    casino_procedure,
+    cut,
+    grab_riffle,
+    new_shoes,
+    riffle,
+    strip,
+    wash,
+    _random_interleaving,
+)
+import numpy as np
+import pytest
+
+
+def ordered(n: int, cards: int = 52) -> np.ndarray:
+    return np.tile(np.arange(cards, dtype=np.uint8), (n, 1))
+
+
+def rising_sequences(row: np.ndarray) -> int:
+    # Card ``v + 1`` lying above card ``v`` starts a new rising sequence.
+    position = np.argsort(row)
+    return 1 + int((position[1:] < position[:-1]).sum())
+
+
+class TestShuffles:
+    @pytest.mark.parametrize(
+        "shuffle",
+        [riffle, grab_riffle, partial(grab_riffle, grab=20), strip, box, wash],
+    )
+    def test_permutations(self, shuffle):
+        shoes = new_shoes(50, decks=6)
+        shuffled = shuffle(shoes, np.random.default_rng(0))
+
+        assert shuffled.shape == shoes.shape
+        assert shuffled.dtype == np.uint8
+        assert (np.sort(shuffled, axis=1) == np.sort(shoes, axis=1)).all()
+        assert not (shuffled == shoes).all()
+
+    def test_riffle_is_gsr(self):
+        shoes = riffle(ordered(4000), np.random.default_rng(1))
+
+        # One riffle leaves at most two rising sequences: the two packets.
+        assert max(rising_sequences(row) for row in shoes) <= 2
+        # The top packet holds the cards 0..k-1 with k ~ Binomial(52, 1/2).
+        packets = np.array([np.argmax(np.diff(np.argsort(row)) < 0) + 1 for row in shoes])
+        assert abs(packets.mean() - 26) < 0.5
+        assert abs(packets.var() - 13) < 2
+
+    def test_riffles_approach_uniform(self):
+        rng = np.random.default_rng(2)
+        shoes = riffle(ordered(20_000), rng, passes=7)
+        counts = np.bincount(shoes[:, 0], minlength=52)
+
+        expected = len(shoes) / 52
+        chi_square = ((counts - expected) ** 2 / expected).sum()
+        assert chi_square < 90
+
+    def test_grab_riffle_keeps_grabs_together(self):
+        shoes = grab_riffle(ordered(100, 312), np.random.default_rng(3), grab=52)
+
+        # The first pile holds the top grab of both halves.
+        first = np.sort(shoes[:, :104], axis=1)
+        expected = np.concatenate((np.arange(52), np.arange(156, 208)))
+        assert (first == expected).all()
+
+    def test_interleavings_uniform(self):
+        sides = _random_interleaving(np.random.default_rng(4), 60_000, 2, 3)
+        _, counts = np.unique(sides, axis=0, return_counts=True)
+
+        # All 10 interleavings of two and three cards are equally likely.
+        assert len(counts) == 10
+        assert ((counts - 6000) ** 2 / 6000).sum() < 25
+
+    def test_strip_single_cards_reverses(self):
+        shoes = strip(ordered(3), np.random.default_rng(4), packet=1)
+
+        assert (shoes == np.arange(51, -1, -1)).all()
+
+    def test_strip_keeps_packets_in_order(self):
+        shoes = strip(ordered(500), np.random.default_rng(5), packet=8)
+        steps = np.diff(shoes.astype(np.int64), axis=1)
+
+        # Inside a packet the cards keep their order, between packets they fall.
+        assert set(np.unique(steps[steps > 0])) == {1}
+        assert abs((steps < 0).sum(axis=1).mean() - 51 / 8) < 0.5
+
+    def test_box(self):
+        rng = np.random.default_rng(6)
+
+        assert (box(ordered(2), rng, packets=1) == np.arange(52)).all()
+        shoes = box(ordered(2), rng, packets=4, jitter=0)
+        expected = np.concatenate(
+            [np.arange(39, 52), np.arange(26, 39), np.arange(13, 26), np.arange(13)]
+        )
+        assert (shoes == expected).all()
+
+    def test_cut_matches_deck(self):
+        deck = Deck(deck_size=1, rng=7)
+        deck.shuffle()
+        before = deck.live_codes()[None, :]
+        deck.set_cutcard(pos=17)
+
+        assert (cut(before, 17)[0] == deck.live_codes()).all()
+        assert (cut(np.vstack([before, before]), [0, 51])[1, 0] == before[0, 51])
+        with pytest.raises(ValueError):
+            cut(before, 52)
+
+    def test_bad_input(self):
+        rng = np.random.default_rng(8)
+
+        with pytest.raises(ValueError):
+            riffle(np.arange(52), rng)
+        with pytest.raises(ValueError):
+            strip(ordered(1), rng, packet=0.5)
+        with pytest.raises(ValueError):
+            ShuffleProcedure([])
+
+
+class TestShuffleProcedure:
+    def test_batches(self):
+        procedure = casino_procedure()
+        batches = list(procedure.batches(250, decks=2, batch=100, rng=9))
+
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+        assert all(batch.shape[1] == 104 for batch in batches)
+        again = np.vstack(list(procedure.batches(250, decks=2, batch=100, rng=9)))
+        assert (np.vstack(batches) == again).all()
+
+    def test_batches_start_and_cut(self):
+        start = np.arange(52, dtype=np.uint8)[::-1]
+        shoes = next(UNIFORM.batches(10, decks=1, rng=10, start=start, cut_cards=False))
+
+        assert (np.sort(shoes, axis=1) == np.arange(52)).all()
+        with pytest.raises(ValueError):
+            next(UNIFORM.batches(1, decks=2, start=start))
+
+    def test_deck_shuffle(self):
+        deck = Deck(deck_size=1, rng=11)
+        before = deck.live_codes()
+        deck.shuffle(ShuffleProcedure([riffle]))
+        after = deck.live_codes()
+
+        assert deck.shuffled
+        assert sorted(after.tolist()) == sorted(before.tolist())
+        assert rising_sequences(np.argsort(before)[after]) <= 2
+
+    def test_game(self):
+        game = Game(rules=Rules(decks=2), rng=12, shuffle_procedure=casino_procedure())
+        for _ in game.rounds(200):
+            pass
+
+        assert game.rounds_played == 200
+        with pytest.raises(ValueError):
+            Game(rules=Rules(csm=True), shuffle_procedure=UNIFORM)
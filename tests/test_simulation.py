@@ -0,0 +1,100 @@
+from blackjack.rules import Rules
+from blackjack.simulation import SimulationReport, simulate, simulate_threaded, simulate_until
+import pytest
+
+
+class TestSimulation:
+    def test_rounds(self):
+        report = simulate(rounds=1_000, seed=1, workers=1, chunk_rounds=300)
+
+        assert report.rounds == 1_000
+        assert report.hands >= 1_000
+        assert sum(report.outcomes) == report.hands
+
+    def test_reproducible_across_workers(self):
+        single = simulate(rounds=2_000, seed=42, workers=1, chunk_rounds=500)
+        pooled = simulate(rounds=2_000, seed=42, workers=2, chunk_rounds=500)
+
+        assert single.net == pooled.net
+        assert single.outcomes == pooled.outcomes
+
+    def test_seed_changes_result(self):
+        first = simulate(rounds=1_000, seed=1, workers=1)
+        second = simulate(rounds=1_000, seed=2, workers=1)
+
+        assert first.net != second.net
+
+    def test_seed_recorded(self):
+        report = simulate(rounds=10, workers=1)
+        again = simulate(rounds=10, seed=report.seed, workers=1)
+
+        assert report.net == again.net
+
+    def test_merge(self):
+        first = simulate(rounds=200, seed=3, workers=1, rules=Rules(decks=2))
+        second = simulate(rounds=300, seed=4, workers=1, rules=Rules(decks=2))
+        merged = SimulationReport().merge(first).merge(second)
+
+        assert merged.rounds == 500
+        assert merged.net == pytest.approx(first.net + second.net)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            simulate(rounds=10, seats=0)
+
+    def test_threaded_matches_processes(self):
+        single = simulate(rounds=2_000, seed=42, workers=1, chunk_rounds=500)
+        threaded = simulate_threaded(rounds=2_000, seed=42, threads=3, chunk_rounds=500)
+
+        assert threaded.net == single.net
+        assert threaded.outcomes == single.outcomes
+        assert threaded.seed == single.seed
+
+
+class TestSimulateUntil:
+    def test_stops_at_target(self):
+        updates = []
+        report = simulate_until(
+            0.05, seed=5, workers=1, chunk_rounds=500, min_rounds=0, progress=updates.append
+        )
+
+        assert updates[-1].done == report.rounds
+        assert updates[-1].half_width <= 0.05 < updates[-2].half_width
+        assert updates[-1].eta == 0.0 and updates[-2].eta > 0
+        assert 1.96 * report.ev_standard_error == pytest.approx(updates[-1].half_width, rel=1e-3)
+
+    def test_matches_fixed_run(self):
+        report = simulate_until(0.05, seed=5, workers=1, chunk_rounds=500, min_rounds=0)
+        fixed = simulate(report.rounds, seed=5, workers=1, chunk_rounds=500)
+        pooled = simulate_until(0.05, seed=5, workers=2, chunk_rounds=500, min_rounds=0)
+
+        assert report.seed == 5
+        assert report.net == fixed.net == pooled.net
+        assert report.rounds == pooled.rounds
+
+    def test_limits(self):
+        report = simulate_until(1e-6, seed=1, workers=1, chunk_rounds=300, max_rounds=1_000)
+        assert report.rounds == 1_000
+
+        report = simulate_until(10.0, seed=1, workers=1, chunk_rounds=300, min_rounds=900)
+        assert report.rounds == 900
+
+        with pytest.raises(ValueError):
+            simulate_until(0.0)
+        with pytest.raises(ValueError):
+            simulate_until(0.01, confidence=1.0)
+
+
+class TestReportState:
+    def test_round_trip(self):
+        report = simulate(rounds=300, seed=2**70 + 1, workers=1)
+        restored = SimulationReport.from_state(report.state())
+
+        assert isinstance(restored, SimulationReport)
+        assert restored.seed == 2**70 + 1
+        assert restored.count_range == report.count_range
+        assert restored.net == report.net and restored.std == report.std
+
+        copied = report.copy()
+        assert type(copied) is SimulationReport and copied.seed == report.seed
+        assert SimulationReport.from_state(SimulationReport().state()).seed is None
@@ -0,0 +1,146 @@
+from blackjack import Game
+from blackjack import Player
+from blackjack.game import Outcome
+from blackjack.simulation import simulate
+from blackjack.statistics import RoundStatistics
+from blackjack.strategy import Action, mimic_dealer
+import numpy as np
+import pytest
+
+
+def reference(nets):
+    total = np.concatenate([[0.0], np.cumsum(nets)])
+    peak = np.maximum.accumulate(total)
+    return np.var(nets, ddof=1), (peak - total).max(), total.max(), total.min()
+
+
+@pytest.fixture
+def nets():
+    return np.random.default_rng(0).choice([-2.0, -1.0, 0.0, 1.0, 1.5, 2.0], size=500)
+
+
+class TestRoundStatistics:
+    def test_add(self, nets):
+        statistics = RoundStatistics()
+        for net in nets:
+            statistics.add(net, outcomes=[Outcome.WIN])
+        variance, drawdown, peak, trough = reference(nets)
+
+        assert statistics.rounds == 500
+        assert statistics.wins == 500
+        assert statistics.mean == pytest.approx(nets.mean())
+        assert statistics.ev == pytest.approx(nets.mean())
+        assert statistics.variance == pytest.approx(variance)
+        assert statistics.max_drawdown == pytest.approx(drawdown)
+        assert statistics.peak == pytest.approx(peak)
+        assert statistics.trough == pytest.approx(trough)
+
+    def test_ev_standard_error(self, nets):
+        statistics = RoundStatistics()
+        statistics.add_many(2 * nets, initial_bet=2.0)
+
+        assert statistics.ev == pytest.approx(nets.mean())
+        assert statistics.ev_standard_error == pytest.approx(nets.std(ddof=1) / np.sqrt(500))
+        assert RoundStatistics().ev_standard_error == 0.0
+
+    def test_merge_is_exact(self, nets):
+        whole = RoundStatistics()
+        parts = [RoundStatistics() for _ in range(4)]
+        counts = np.linspace(-12, 12, len(nets))
+        for i, (net, count) in enumerate(zip(nets, counts)):
+            whole.add(net, true_count=count)
+            parts[i * 4 // len(nets)].add(net, true_count=count)
+
+        merged = RoundStatistics()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.rounds == whole.rounds
+        assert merged.variance == pytest.approx(whole.variance)
+        assert merged.max_drawdown == pytest.approx(whole.max_drawdown)
+        assert merged.trough == pytest.approx(whole.trough)
+        np.testing.assert_allclose(merged.bucket_ev, whole.bucket_ev)
+        np.testing.assert_allclose(merged.bucket_std, whole.bucket_std)
+
+    def test_add_many(self, nets):
+        counts = np.random.default_rng(1).normal(0, 3, len(nets))
+        one_by_one = RoundStatistics()
+        for net, count in zip(nets[:100], counts[:100]):
+            one_by_one.add(net, true_count=count)
+        batched = RoundStatistics()
+        batched.add(nets[0], true_count=counts[0])
+        batched.add_many(nets[1:100], true_count=counts[1:100])
+
+        assert batched.variance == pytest.approx(one_by_one.variance)
+        assert batched.max_drawdown == pytest.approx(one_by_one.max_drawdown)
+        np.testing.assert_array_equal(batched.bucket_rounds, one_by_one.bucket_rounds)
+        np.testing.assert_allclose(batched.bucket_ev, one_by_one.bucket_ev, atol=1e-12)
+
+    def test_count_buckets(self):
+        statistics = RoundStatistics(count_range=(-1, 1))
+        statistics.add(1.0, true_count=-5.0)
+        statistics.add(-1.0, true_count=0.5)
+        statistics.add(2.0, true_count=0.9)
+
+        assert statistics.true_counts.tolist() == [-1, 0, 1]
+        assert statistics.bucket_rounds.tolist() == [1, 2, 0]
+        assert statistics.bucket_ev[1] == pytest.approx(0.5)
+        assert np.isnan(statistics.bucket_ev[2])
+
+    def test_state_round_trip(self, nets):
+        statistics = RoundStatistics()
+        statistics.add_many(nets, true_count=np.zeros(len(nets)))
+        restored = RoundStatistics.from_state(statistics.state())
+
+        assert restored.state().keys() == statistics.state().keys()
+        for key, value in statistics.state().items():
+            np.testing.assert_array_equal(restored.state()[key], value)
+
+    def test_merge_range_mismatch(self):
+        with pytest.raises(ValueError):
+            RoundStatistics((-5, 5)).merge(RoundStatistics())
+
+
+class TestTracking:
+    def test_game_and_players(self):
+        game = Game(players=[Player(name="Ocean"), Player(name="Sky", bet=2.0)], rng=4)
+        nets = [result.net for result in game.rounds(200)]
+
+        assert game.statistics.rounds == 200
+        assert game.statistics.net == pytest.approx(sum(nets))
+        assert game.statistics.initial_bets == 600
+        for player in game.players:
+            assert player.statistics.rounds == 200
+            assert player.statistics.net == pytest.approx(player.bankroll)
+        assert sum(game.statistics.outcomes) == game.statistics.hands
+
+    def test_split_hands_per_seat(self):
+        def split(hand, upcard, allowed):
+            return Action.SPLIT if Action.SPLIT in allowed else mimic_dealer(hand, upcard, allowed)
+
+        game = Game(players=[Player(name=f"Seat {i}", strategy=split) for i in range(3)], rng=9)
+        hands = [0, 0, 0]
+        for result in game.rounds(300):
+            for hand in result.hands:
+                hands[hand.seat] += 1
+
+        assert sum(hands) > 900
+        assert [player.statistics.hands for player in game.players] == hands
+        for player in game.players:
+            assert player.statistics.net == pytest.approx(player.bankroll)
+
+    def test_recording_off(self):
+        game = Game(rng=4, record_statistics=False)
+        for _ in game.rounds(50):
+            pass
+
+        assert game.statistics.rounds == 0
+        assert game.players[0].statistics.rounds == 0
+
+    def test_simulation_count_buckets(self):
+        report = simulate(rounds=500, seed=1, workers=1, track_count=True)
+        plain = simulate(rounds=500, seed=1, workers=1)
+
+        assert report.bucket_rounds.sum() == 500
+        assert plain.bucket_rounds.sum() == 0
+        assert report.net == plain.net
@@ -0,0 +1,123 @@
+from blackjack.rules import Rules
+from blackjack.strategy import mimic_dealer
+from blackjack.sweep import Configuration, SweepReport, grid, sweep, sweep_until
+import numpy as np
+import pytest
+
+
+class TestGrid:
+    def test_combinations(self):
+        configurations = grid(hit_soft_17=[False, True], decks=[2, 6])
+
+        assert [c.name for c in configurations] == [
+            "hit_soft_17=False, decks=2",
+            "hit_soft_17=False, decks=6",
+            "hit_soft_17=True, decks=2",
+            "hit_soft_17=True, decks=6",
+        ]
+        assert configurations[2].rules == Rules(hit_soft_17=True, decks=2)
+
+    def test_single_deck(self):
+        configurations = grid(decks=[1, 2, 6])
+
+        assert [c.rules.end_of_shoe_range for c in configurations] == [
+            (8, 13),
+            (50, 80),
+            (50, 80),
+        ]
+
+    def test_strategies(self):
+        stand = lambda hand, upcard, allowed: min(allowed)
+        configurations = grid({"mimic": mimic_dealer, "stand": stand})
+
+        assert [c.name for c in configurations] == ["mimic", "stand"]
+        assert configurations[1].strategy is stand
+
+
+class TestSweepReport:
+    def test_equal_bets(self):
+        rng = np.random.default_rng(0)
+        net = rng.normal(0, 5, (1_000, 2))
+        net[:, 1] += net[:, 0]
+        bets = np.full((1_000, 2), 60.0)
+        report = SweepReport(["a", "b"])
+        report.add_shoes(net[:400], bets[:400])
+        report.add_shoes(net[400:], bets[400:])
+
+        # With constant bets the EVs are plain means.
+        assert report.ev == pytest.approx(net.mean(axis=0) / 60)
+        assert report.covariance == pytest.approx(np.cov(net.T) / 1_000 / 60**2)
+        difference = (net[:, 0] - net[:, 1]) / 60
+        delta = report.delta("a", "b")
+        assert delta.delta == pytest.approx(difference.mean())
+        assert delta.standard_error == pytest.approx(difference.std(ddof=1) / np.sqrt(1_000))
+        assert delta.low < delta.delta < delta.high
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            SweepReport(["a", "a"])
+        with pytest.raises(ValueError):
+            SweepReport(["a"]).add_shoes(np.zeros((3, 2)), np.ones((3, 2)))
+        with pytest.raises(ValueError):
+            SweepReport(["a"]).merge(SweepReport(["b"]))
+
+
+class TestSweep:
+    configurations = grid(hit_soft_17=[False, True], blackjack_payout=[1.5, 1.2], decks=[2])
+
+    def test_common_shoes(self):
+        report = sweep(self.configurations, shoes=200, seed=7, workers=1, chunk_shoes=64)
+        names = report.names
+        statistics = report.statistics
+
+        assert report.shoes == 200
+        # The payout does not change which cards are drawn.
+        assert statistics[names[0]].rounds == statistics[names[1]].rounds
+        assert statistics[names[0]].hands == statistics[names[1]].hands
+        assert report.ev == pytest.approx([s.ev for s in statistics.values()])
+        assert report.deltas[0, 1] > 0
+        assert report.delta(names[0], names[1]).low > 0
+        assert report.variance_reduction[0, 1] > 10
+        assert report.variance_reduction[0, 2] > 1
+
+    def test_reproducible_across_workers(self):
+        single = sweep(self.configurations, shoes=60, seed=3, workers=1, chunk_shoes=20)
+        pooled = sweep(self.configurations, shoes=60, seed=3, workers=2, chunk_shoes=20)
+
+        assert single.seed == pooled.seed == 3
+        assert np.array_equal(single.ev, pooled.ev)
+        assert np.array_equal(single.standard_errors, pooled.standard_errors)
+
+    def test_identical_configurations(self):
+        twins = [Configuration("a", Rules(decks=2)), Configuration("b", Rules(decks=2))]
+        report = sweep(twins, shoes=50, seed=1, workers=1)
+
+        assert report.deltas[0, 1] == 0
+        assert report.standard_errors[0, 1] == pytest.approx(0, abs=1e-12)
+
+    def test_until(self):
+        updates = []
+        report = sweep_until(
+            self.configurations[:2],
+            0.002,
+            seed=2,
+            workers=1,
+            chunk_shoes=20,
+            min_shoes=0,
+            progress=updates.append,
+        )
+        fixed = sweep(
+            self.configurations[:2], shoes=report.shoes, seed=2, workers=1, chunk_shoes=20
+        )
+
+        assert updates[-1].done == report.shoes
+        assert updates[-1].half_width <= 0.002 < updates[-2].half_width
+        assert np.array_equal(report.ev, fixed.ev)
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            sweep([], shoes=10)
+        with pytest.raises(ValueError):
+            sweep([Configuration("csm", Rules(csm=True))], shoes=10)
+        with pytest.raises(ValueError):
+            sweep(self.configurations[:1] * 2, shoes=10)
@@ -0,0 +1,102 @@
+from blackjack import Game
+from blackjack import Player
+from blackjack.basic_strategy import NO_DECISION, PAIR, StrategyTable, generate
+from blackjack.rules import Rules
+from blackjack.shuffles import casino_procedure
+from blackjack.vectorized import LockstepSimulator
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def chart():
+    # The lockstep simulator plays pairs by their total.
+    table = generate(Rules(surrender=True))
+    decisions = table.decisions.copy()
+    decisions[PAIR] = NO_DECISION
+    return StrategyTable(decisions, table.fallbacks)
+
+
+class TestShoes:
+    def test_every_shoe_is_complete(self, chart):
+        simulator = LockstepSimulator(shoes=8, strategy=chart, rng=0)
+
+        assert simulator.shoes.shape == (8, 6 * 52)
+        counts = np.apply_along_axis(np.bincount, 1, simulator.shoes, minlength=52)
+        assert (counts == 6).all()
+        assert (simulator.cursor == 0).all()
+
+    def test_reshuffle_at_end_of_shoe(self, chart):
+        rules = Rules(decks=1, end_of_shoe=(20, 20))
+        simulator = LockstepSimulator(shoes=4, strategy=chart, rules=rules, rng=1)
+        for _ in range(50):
+            simulator.play_round()
+            assert (simulator.remaining > 20).all()
+
+    def test_dry_shoe_is_refilled_from_discards(self, chart):
+        rules = Rules(decks=1, end_of_shoe=(0, 0))
+        simulator = LockstepSimulator(shoes=20, strategy=chart, rules=rules, rng=4)
+        refills = 0
+        for _ in range(200):
+            before = simulator.cursor.copy()
+            simulator.play_round()
+            refills += (simulator.cursor < before).sum()
+            counts = np.apply_along_axis(np.bincount, 1, simulator.shoes, minlength=52)
+            assert (counts == 1).all()
+        assert refills > 0
+
+    def test_cards_in_play_stay_out(self, chart):
+        rules = Rules(decks=1, end_of_shoe=(0, 0))
+        simulator = LockstepSimulator(shoes=1, strategy=chart, rules=rules, rng=5)
+        simulator.cursor[0] = 50
+        in_play = simulator.shoes[0, 50:].copy()
+        simulator.play_round()
+
+        # The two cards left were dealt first; the refill comes after them.
+        assert (simulator.shoes[0, :2] == in_play).all()
+        assert sorted(simulator.shoes[0]) == list(range(52))
+
+    def test_shuffle_procedure(self, chart):
+        simulator = LockstepSimulator(
+            shoes=50,
+            strategy=chart,
+            rules=Rules(decks=2),
+            rng=2,
+            shuffle_procedure=casino_procedure(),
+        )
+        counts = np.apply_along_axis(np.bincount, 1, simulator.shoes, minlength=52)
+
+        assert (counts == 2).all()
+        assert simulator.run(100).rounds == 5000
+
+    def test_invalid_shoes(self, chart):
+        with pytest.raises(ValueError):
+            LockstepSimulator(shoes=0, strategy=chart)
+
+
+class TestAgainstGame:
+    def test_same_cards_same_results(self, chart):
+        rules = Rules(surrender=True)
+        rng = np.random.default_rng(7)
+        simulator = LockstepSimulator(shoes=1, strategy=chart, rules=rules, rng=0)
+
+        for _ in range(300):
+            codes = rng.permutation(np.tile(np.arange(52, dtype=np.uint8), 6))
+            simulator.shoes[0] = codes
+            simulator.cursor[0] = 0
+            net, _, outcome = simulator.play_round()
+
+            game = Game(players=[Player(name="Ocean", strategy=chart)], rules=rules, rng=0)
+            game.deck._write(0, codes[:30])
+            result = game.play_round()
+
+            assert net[0] == result.net
+            assert outcome[0] == result.hands[0].outcome
+
+    def test_run_report(self, chart):
+        simulator = LockstepSimulator(shoes=200, strategy=chart, rng=3)
+        report = simulator.run(rounds=50)
+
+        assert report.rounds == 10_000
+        assert sum(report.outcomes) == 10_000
+        assert -0.1 < report.ev < 0.05